@@ -17,6 +17,9 @@ from app.common.database.base import Base
 
 # Import all models so Alembic can detect them
 from app.features.appointments.models.appointment import Appointment
+from app.features.appointments.models.appointment_listing import AppointmentListing  # noqa: F401
+from app.features.doctors.models.doctor import Doctor  # noqa: F401
+from app.features.patients.models.patient import Patient  # noqa: F401
 
 # this is the Alembic Config object
 config = context.config
@@ -31,6 +34,20 @@ if config.config_file_name is not None:
 # add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
 
+# appointment_date is indexed either by the btree or by the BRIN + partial
+# "recent" pair (d7e2f4a9c3b6, chosen per deployment); autogenerate must not
+# recreate or drop whichever variant is in place
+APPOINTMENT_DATE_INDEXES = {
+    "ix_appointments_appointment_date",
+    "ix_appointments_appointment_date_brin",
+    "ix_appointments_appointment_date_recent",
+}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Exclude the deployment-specific appointment_date indexes from autogenerate."""
+    return not (type_ == "index" and name in APPOINTMENT_DATE_INDEXES)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -50,6 +67,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -72,7 +90,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,64 @@
+"""Add keyset indexes for patient and doctor history
+
+Revision ID: 7c3e91b2a4d5
+Revises: d2ef17712140
+Create Date: 2026-10-18 10:12:44.518302
+
+Composite (patient_email | doctor_name, appointment_date, id) indexes serve
+the cursor-paginated history queries with one range scan per page.
+ix_appointments_doctor_name is a prefix of the new doctor index and is
+dropped. Indexes are built CONCURRENTLY so the table stays writable.
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91b2a4d5'
+down_revision: str | None = 'd2ef17712140'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_patient_email_date_id',
+            'appointments',
+            ['patient_email', 'appointment_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_appointments_doctor_name_date_id',
+            'appointments',
+            ['doctor_name', 'appointment_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_doctor_name',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_doctor_name',
+            'appointments',
+            ['doctor_name'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_doctor_name_date_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_patient_email_date_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,105 @@
+"""Add doctors table and appointment doctor/patient foreign keys
+
+Revision ID: b8f4d1c6e2a7
+Revises: 7c3e91b2a4d5
+Create Date: 2026-10-18 14:37:05.204119
+
+Online migration: the new columns are nullable (no table rewrite), foreign
+keys are added NOT VALID and validated separately (no long exclusive lock),
+and indexes are built CONCURRENTLY. Existing rows are linked afterwards by
+the backfill_appointment_foreign_keys Celery task.
+
+The patients table predates this migration history (it was created from the
+models), so it is created here when missing.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8f4d1c6e2a7'
+down_revision: str | None = '7c3e91b2a4d5'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table('doctors',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('specialty', sa.String(length=100), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_doctors_id'), 'doctors', ['id'], unique=False)
+    op.create_index(op.f('ix_doctors_name'), 'doctors', ['name'], unique=True)
+
+    if not sa.inspect(op.get_bind()).has_table('patients'):
+        op.create_table('patients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('date_of_birth', sa.Date(), nullable=True),
+        sa.Column('gender', sa.Enum('MALE', 'FEMALE', 'OTHER', name='gender'), nullable=True),
+        sa.Column('address', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_patients_id'), 'patients', ['id'], unique=False)
+        op.create_index(op.f('ix_patients_email'), 'patients', ['email'], unique=True)
+
+    op.add_column('appointments', sa.Column('patient_id', sa.Integer(), nullable=True))
+    op.add_column('appointments', sa.Column('doctor_id', sa.Integer(), nullable=True))
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_patient_id_fkey "
+        "FOREIGN KEY (patient_id) REFERENCES patients (id) ON DELETE SET NULL NOT VALID"
+    )
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT appointments_doctor_id_fkey "
+        "FOREIGN KEY (doctor_id) REFERENCES doctors (id) NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE appointments VALIDATE CONSTRAINT appointments_patient_id_fkey")
+        op.execute("ALTER TABLE appointments VALIDATE CONSTRAINT appointments_doctor_id_fkey")
+        op.create_index(
+            'ix_appointments_patient_id_date_id',
+            'appointments',
+            ['patient_id', 'appointment_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_appointments_doctor_id_date_id',
+            'appointments',
+            ['doctor_id', 'appointment_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_appointments_doctor_id_date_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_patient_id_date_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+    op.drop_constraint('appointments_doctor_id_fkey', 'appointments', type_='foreignkey')
+    op.drop_constraint('appointments_patient_id_fkey', 'appointments', type_='foreignkey')
+    op.drop_column('appointments', 'doctor_id')
+    op.drop_column('appointments', 'patient_id')
+    op.drop_index(op.f('ix_doctors_name'), table_name='doctors')
+    op.drop_index(op.f('ix_doctors_id'), table_name='doctors')
+    op.drop_table('doctors')
@@ -0,0 +1,67 @@
+"""Add covering index for patient email lookups
+
+Revision ID: c5a9e0f3b1d8
+Revises: b8f4d1c6e2a7
+Create Date: 2026-10-18 17:02:51.730416
+
+(patient_email, appointment_date DESC, id DESC) INCLUDE (status,
+doctor_name, specialty) serves patient history pages in key order and lets
+the patient summary query run as an index-only scan. It supersedes
+ix_appointments_patient_email_date_id.
+
+Index-only scans skip the heap only for pages marked all-visible, so
+autovacuum is made to visit this insert-heavy table more often.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a9e0f3b1d8'
+down_revision: str | None = 'b8f4d1c6e2a7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_patient_email_summary',
+            'appointments',
+            ['patient_email', sa.text('appointment_date DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_include=['status', 'doctor_name', 'specialty'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_patient_email_date_id',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+    op.execute(
+        "ALTER TABLE appointments SET ("
+        "autovacuum_vacuum_scale_factor = 0.05, "
+        "autovacuum_vacuum_insert_scale_factor = 0.05)"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE appointments RESET ("
+        "autovacuum_vacuum_scale_factor, autovacuum_vacuum_insert_scale_factor)"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_patient_email_date_id',
+            'appointments',
+            ['patient_email', 'appointment_date', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_appointments_patient_email_summary',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,109 @@
+"""Optional BRIN index on appointments.appointment_date
+
+Revision ID: d7e2f4a9c3b6
+Revises: c5a9e0f3b1d8
+Create Date: 2026-10-19 09:14:27.661093
+
+Opt-in, for large append-mostly tables:
+
+    alembic -x appointment_date_index=brin upgrade head
+
+replaces the full btree ix_appointments_appointment_date with
+
+- ix_appointments_appointment_date_brin: BRIN over appointment_date, a few
+  pages for the whole table, cheap to maintain on INSERT, used for
+  historical date ranges;
+- ix_appointments_appointment_date_recent: btree limited to appointments
+  from APPOINTMENT_DATE_RECENT_INDEX_DAYS before the migration on, serving
+  the hot upcoming / recent range queries.
+
+The partial index is usable when the query's lower date bound provably
+falls after its cutoff, i.e. for custom plans with literal or bound values.
+Roll the cutoff forward periodically with the
+roll_recent_appointment_date_index Celery task. Without the option this
+revision changes nothing; downgrade restores the full btree either way.
+
+BRIN relies on appointment_date following physical row order. Appointments
+are booked up to 90 days ahead, so each block range spans roughly that
+window; benchmarks/appointment_date_index.py measures the effect.
+"""
+from collections.abc import Sequence
+from datetime import date, timedelta
+
+import sqlalchemy as sa
+
+from alembic import context, op
+from app.core.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e2f4a9c3b6'
+down_revision: str | None = 'c5a9e0f3b1d8'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+PAGES_PER_RANGE = 32
+
+
+def _indexes() -> set[str]:
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('appointments')}
+
+
+def upgrade() -> None:
+    option = context.get_x_argument(as_dictionary=True).get('appointment_date_index', 'btree')
+    if option not in ('btree', 'brin'):
+        raise ValueError(f"appointment_date_index must be 'btree' or 'brin', got {option!r}")
+    if option == 'btree':
+        return
+
+    # Same window as the roll_recent_appointment_date_index task
+    cutoff = date.today() - timedelta(days=settings.APPOINTMENT_DATE_RECENT_INDEX_DAYS)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_appointments_appointment_date_brin',
+            'appointments',
+            ['appointment_date'],
+            unique=False,
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': PAGES_PER_RANGE},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_appointments_appointment_date_recent',
+            'appointments',
+            ['appointment_date'],
+            unique=False,
+            postgresql_where=sa.text(f"appointment_date >= '{cutoff.isoformat()}'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f('ix_appointments_appointment_date'),
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    existing = _indexes()
+    if 'ix_appointments_appointment_date_brin' not in existing:
+        return
+
+    with op.get_context().autocommit_block():
+        if op.f('ix_appointments_appointment_date') not in existing:
+            op.create_index(
+                op.f('ix_appointments_appointment_date'),
+                'appointments',
+                ['appointment_date'],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+        op.drop_index(
+            'ix_appointments_appointment_date_recent',
+            table_name='appointments',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_appointments_appointment_date_brin',
+            table_name='appointments',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,79 @@
+"""Add appointment_listings read model
+
+Revision ID: e3b8c1f5a2d9
+Revises: d7e2f4a9c3b6
+Create Date: 2026-10-19 16:02:48.517340
+
+Denormalized projection of appointments for ListAppointmentsQuery:
+lower-cased search columns (trigram-indexed for LIKE '%term%'), a status
+bucket, and doctor/day keys. The table is new, so it is filled with one
+INSERT ... SELECT and indexed afterwards; appointments is only read.
+Rows written by the previous release while this runs, or after it by any
+path other than the commands, are picked up by the
+rebuild_appointment_listings Celery task.
+
+Rollout (required order):
+1. Run this migration; lists keep reading appointments because
+   APPOINTMENT_LISTING_READ_MODEL_ENABLED defaults to False.
+2. Deploy the release whose commands project into appointment_listings.
+3. Start rebuild_appointment_listings.delay() and wait for the
+   "Appointment listing rebuild complete" log line.
+4. Set APPOINTMENT_LISTING_READ_MODEL_ENABLED=True.
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b8c1f5a2d9'
+down_revision: str | None = 'd7e2f4a9c3b6'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Trusted extension since PostgreSQL 13: the database owner can create it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table('appointment_listings',
+    sa.Column('appointment_id', sa.Integer(), nullable=False),
+    sa.Column('patient_name_lower', sa.String(length=200), nullable=False),
+    sa.Column('doctor_name_lower', sa.String(length=200), nullable=False),
+    sa.Column('status', postgresql.ENUM('SCHEDULED', 'CONFIRMED', 'CANCELLED', 'COMPLETED', 'NO_SHOW', name='appointmentstatus', create_type=False), nullable=False),
+    sa.Column('status_bucket', sa.Enum('ACTIVE', 'CLOSED', name='statusbucket'), nullable=False),
+    sa.Column('appointment_date', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('appointment_day', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('appointment_id')
+    )
+
+    op.execute(
+        """
+        INSERT INTO appointment_listings
+        SELECT id,
+               lower(patient_name),
+               lower(doctor_name),
+               status,
+               CASE WHEN status IN ('SCHEDULED', 'CONFIRMED')
+                    THEN 'ACTIVE' ELSE 'CLOSED' END::statusbucket,
+               appointment_date,
+               (appointment_date AT TIME ZONE 'UTC')::date
+        FROM appointments
+        """
+    )
+
+    op.create_index('ix_appointment_listings_date_id', 'appointment_listings', ['appointment_date', 'appointment_id'], unique=False)
+    op.create_index('ix_appointment_listings_status_date', 'appointment_listings', ['status', 'appointment_date'], unique=False)
+    op.create_index('ix_appointment_listings_bucket_date', 'appointment_listings', ['status_bucket', 'appointment_date'], unique=False)
+    op.create_index('ix_appointment_listings_doctor_day', 'appointment_listings', ['doctor_name_lower', 'appointment_day'], unique=False)
+    op.create_index('ix_appointment_listings_patient_name_trgm', 'appointment_listings', ['patient_name_lower'], unique=False, postgresql_using='gin', postgresql_ops={'patient_name_lower': 'gin_trgm_ops'})
+    op.create_index('ix_appointment_listings_doctor_name_trgm', 'appointment_listings', ['doctor_name_lower'], unique=False, postgresql_using='gin', postgresql_ops={'doctor_name_lower': 'gin_trgm_ops'})
+    op.execute("ANALYZE appointment_listings")
+
+
+def downgrade() -> None:
+    op.drop_table('appointment_listings')
+    sa.Enum(name='statusbucket').drop(op.get_bind(), checkfirst=True)
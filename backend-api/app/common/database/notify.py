@@ -0,0 +1,133 @@
+"""
+Cross-Pod Cache Invalidation (PostgreSQL LISTEN/NOTIFY)
+
+Commands call ``notify_invalidation`` inside their transaction. PostgreSQL
+delivers the NOTIFY only if the transaction commits, so other workers never
+evict for a write that was rolled back and never miss one that committed.
+Every worker runs an ``InvalidationListener`` on a dedicated connection,
+which evicts the named key from its local caches (app/common/local_cache.py).
+
+LISTEN needs a session-level connection: point DATABASE_URL at PostgreSQL
+or a session-mode pooler, not a transaction-mode one.
+"""
+import asyncio
+import contextlib
+import logging
+from typing import Any, Optional
+
+import asyncpg
+import orjson
+from prometheus_client import Counter
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.common import local_cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+INVALIDATIONS_RECEIVED = Counter(
+    "cache_invalidations_received_total",
+    "Local cache evictions received over LISTEN/NOTIFY",
+    ["namespace"],
+)
+
+
+def notify_invalidation(db: Session, namespace: str, key: Optional[str] = None) -> None:
+    """
+    Evict ``key`` (or the whole namespace) from the local caches of every worker.
+
+    This worker evicts immediately. Other workers, and this one again, evict
+    when the NOTIFY is delivered after ``db`` commits, which covers reads that
+    ran between the eviction and the commit.
+    """
+    local_cache.evict(namespace, key)
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    payload = orjson.dumps({"namespace": namespace, "key": key}).decode()
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": payload},
+    )
+
+
+def _listen_dsn() -> str:
+    # asyncpg takes plain postgresql:// DSNs, without a SQLAlchemy driver suffix
+    scheme, rest = settings.DATABASE_URL.split("://", 1)
+    return f"{scheme.split('+', 1)[0]}://{rest}"
+
+
+class InvalidationListener:
+    """
+    Background task that LISTENs for cache invalidations on one connection.
+
+    Local caches serve only while the listener is connected: on disconnect
+    they are cleared and bypassed, and the listener reconnects every
+    ``reconnect_interval`` seconds. The connection is probed every
+    ``keepalive_interval`` seconds so a silently dropped one is noticed.
+    """
+
+    def __init__(
+        self,
+        channel: str = settings.CACHE_INVALIDATION_CHANNEL,
+        reconnect_interval: float = settings.CACHE_INVALIDATION_RECONNECT_SECONDS,
+        keepalive_interval: float = settings.CACHE_INVALIDATION_KEEPALIVE_SECONDS,
+    ) -> None:
+        self.channel = channel
+        self.reconnect_interval = reconnect_interval
+        self.keepalive_interval = keepalive_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_notification(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+            namespace, key = message["namespace"], message["key"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation: payload=%r", payload)
+            return
+        INVALIDATIONS_RECEIVED.labels(namespace=namespace).inc()
+        local_cache.evict(namespace, key)
+
+    async def _listen(self) -> None:
+        conn = await asyncpg.connect(_listen_dsn())
+        try:
+            await conn.add_listener(self.channel, self._on_notification)
+            local_cache.set_active(True)
+            logger.info("Listening for cache invalidations: channel=%s", self.channel)
+            while True:
+                await asyncio.sleep(self.keepalive_interval)
+                await asyncio.wait_for(conn.execute("SELECT 1"), timeout=self.keepalive_interval)
+        finally:
+            local_cache.set_active(False)
+            conn.terminate()
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "Cache invalidation listener disconnected; local caches bypassed: error=%s",
+                    exc,
+                )
+            await asyncio.sleep(self.reconnect_interval)
+
+    def start(self) -> None:
+        """Start the listener on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever(), name="cache-invalidation")
+
+    async def stop(self) -> None:
+        """Cancel the listener and stop serving from local caches."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        local_cache.set_active(False)
+
+
+# Process-wide listener started by the app lifespan
+invalidation_listener = InvalidationListener()
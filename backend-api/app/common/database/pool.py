@@ -0,0 +1,114 @@
+"""
+Connection Pool Instrumentation
+Prometheus metrics for SQLAlchemy pool saturation and checkout wait time
+"""
+import time
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond pool_size (max_overflow in use)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CAPACITY = Gauge(
+    "db_pool_capacity_connections",
+    "Maximum connections the pool may hold (pool_size + max_overflow)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the pool (queueing plus connect)",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout seconds",
+    ["pool"],
+)
+
+# Connection info key holding the wait time of the current checkout
+CHECKOUT_WAIT_INFO_KEY = "checkout_wait_seconds"
+
+
+def _pool_name(pool: Pool) -> str:
+    return pool.logging_name or "default"
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waited.
+
+    SQLAlchemy has no "checkout started" event, so wait time is measured
+    around ``_do_get``. The pool label comes from ``pool_logging_name``.
+    """
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=_pool_name(self)).inc()
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            POOL_CHECKOUT_WAIT.labels(pool=_pool_name(self)).observe(wait)
+        # Read (and cleared) by the SQL tracing listener on the next statement
+        record.info[CHECKOUT_WAIT_INFO_KEY] = wait
+        return record
+
+
+def pool_capacity(pool: Pool) -> int:
+    """Return pool_size + max_overflow for queue pools, 0 for unbounded pools."""
+    if not hasattr(pool, "checkedout"):
+        return 0
+    return pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Return checked-out connections versus capacity for an engine's pool."""
+    pool = engine.pool
+    capacity = pool_capacity(pool)
+    if capacity == 0:
+        return {"checked_out": 0, "capacity": 0, "saturation": 0.0}
+
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3),
+    }
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Attach checkout/checkin hooks that publish pool gauges for ``engine``."""
+    pool = engine.pool
+    name = _pool_name(pool)
+    POOL_CAPACITY.labels(pool=name).set(pool_capacity(pool))
+
+    def _publish(returning: int) -> None:
+        if hasattr(pool, "checkedout"):
+            POOL_CHECKED_OUT.labels(pool=name).set(max(pool.checkedout() - returning, 0))
+            POOL_OVERFLOW.labels(pool=name).set(max(pool.overflow(), 0))
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(*_: Any) -> None:
+        _publish(returning=0)
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(*_: Any) -> None:
+        # checkin fires before the connection is back in the queue
+        _publish(returning=1)
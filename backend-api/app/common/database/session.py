@@ -1,23 +1,82 @@
 """
 Database Session Management
+
+CQRS split: Commands use the primary engine, Queries use read replicas
+(round-robin) when DATABASE_READ_URL is configured.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import itertools
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
+from app.common.database.pool import InstrumentedAsyncQueuePool, instrument_pool
 from app.core.config import settings
 
 # Build async database URL (postgresql+asyncpg://)
 DATABASE_URL = settings.ASYNC_DATABASE_URL
 
-# Create async database engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
+
+def _create_engine(url: str, pool_name: str) -> AsyncEngine:
+    """Create an instrumented async engine with the configured pool settings."""
+    # Pre-ping costs a round-trip per checkout; DB_POOL_RECYCLE retires idle
+    # connections before server/proxy timeouts instead (see docs/performance).
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=pool_name,
+    )
+    instrument_pool(new_engine)
+    return new_engine
+
+
+def _create_sessionmaker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+# Primary (read-write) engine
+engine = _create_engine(DATABASE_URL, "primary")
 
 # Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+AsyncSessionLocal = _create_sessionmaker(engine)
+
+# Read-only replica engines (empty when no DATABASE_READ_URL is configured)
+read_engines: list[AsyncEngine] = [
+    _create_engine(url, f"replica-{index}")
+    for index, url in enumerate(settings.ASYNC_DATABASE_READ_URLS)
+]
+ReadSessionLocals: list[async_sessionmaker[AsyncSession]] = [
+    _create_sessionmaker(read_engine) for read_engine in read_engines
+]
+_replica_cycle = itertools.cycle(ReadSessionLocals)
+
+
+def next_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Return the next replica session factory, or the primary one without replicas."""
+    if not ReadSessionLocals:
+        return AsyncSessionLocal
+    return next(_replica_cycle)
+
+
+def dispose_engines_after_fork() -> None:
+    """
+    Give a forked child fresh, empty connection pools.
+
+    ``close=False`` drops pooled connections inherited from the parent without
+    closing them, so the parent's sockets are left untouched.
+    """
+    for db_engine in (engine, *read_engines):
+        db_engine.sync_engine.dispose(close=False)
@@ -6,7 +6,7 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
-from app.common.dependencies.database import get_db
+from app.common.dependencies.database import get_read_db
 from app.core.security import verify_token
 from app.features.auth.models.user import User
 from app.features.auth.queries.get_current_user import GetCurrentUserQuery
@@ -16,7 +16,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> User:
     """
     FastAPI dependency that extracts and validates the JWT from the
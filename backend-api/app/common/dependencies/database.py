@@ -1,23 +1,183 @@
 """
 Database Dependencies for FastAPI
+
+- get_db: primary session, used by Commands (writes)
+- get_read_db: replica session, used by Queries (reads)
+- get_read_session_factory: opens that read session on demand, for
+  streaming responses whose body outlives the request's dependencies
+
+After a request commits a write the client receives a short-lived cookie;
+while it is valid its reads are routed to the primary so it sees its own
+writes despite replication lag. Clients that do not keep cookies get no such
+guarantee (see get_read_db). ``session_role`` tells handlers which of these a session
+reads from (e.g. caches must not be filled from replicas).
+
+Each engine has a circuit breaker: while it is open the dependency raises
+503 immediately instead of waiting on connection timeouts.
 """
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncGenerator, AsyncIterator, Callable
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.common.database.session import (
+    AsyncSessionLocal,
+    ReadSessionLocals,
+    next_read_sessionmaker,
+)
+from app.core.circuit_breaker import database_breaker
+from app.core.config import settings
+
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+# Where a session reads from, kept in ``session.info`` (see session_role)
+PRIMARY = "primary"
+REPLICA = "replica"
+# The primary, for a client inside its read-your-writes window
+PINNED = "pinned"
+_ROLE_KEY = "db_role"
+_WROTE_KEY = "wrote"
+
+
+def session_role(db) -> str:
+    """Return PRIMARY, REPLICA or PINNED for a session opened by these dependencies."""
+    return db.info.get(_ROLE_KEY, PRIMARY)
+
+
+@asynccontextmanager
+async def _session(
+    factory: async_sessionmaker[AsyncSession], role: str = PRIMARY
+) -> AsyncIterator[AsyncSession]:
+    """Open a session after checking the engine's breaker; record driver connect errors."""
+    breaker = database_breaker(factory.kw["bind"])
+    breaker.before_call()
+    async with factory() as session:
+        session.info[_ROLE_KEY] = role
+        try:
+            yield session
+        except OSError:
+            breaker.record_failure()
+            raise
+
 
-from app.common.database.session import AsyncSessionLocal
+def _read_sessionmaker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Pick the primary for clients inside their read-your-writes window, else a replica."""
+    if not ReadSessionLocals:
+        return AsyncSessionLocal
 
+    primary_until = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    if primary_until is not None:
+        try:
+            if float(primary_until) > time.time():
+                return AsyncSessionLocal
+        except ValueError:
+            pass
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    return next_read_sessionmaker()
+
+
+def _read_session(request: Request) -> AsyncContextManager[AsyncSession]:
+    factory = _read_sessionmaker(request)
+    if not ReadSessionLocals:
+        role = PRIMARY
+    else:
+        role = PINNED if factory is AsyncSessionLocal else REPLICA
+    return _session(factory, role)
+
+
+def _set_primary_cookie(response: Response) -> None:
+    window = settings.READ_YOUR_WRITES_SECONDS
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=max(int(window), 1),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def pin_reads_after_commit(session: Session, response: Response) -> None:
     """
-    Dependency function to get async database session
+    Set the read-your-writes cookie on ``response`` once ``session`` commits a write.
+
+    Requests that only read, and writes that are rolled back, leave the
+    client on the replicas. Commands commit inside the endpoint, before
+    FastAPI copies the cookie onto the response.
+    """
+
+    def wrote(*_) -> None:
+        session.info[_WROTE_KEY] = True
+
+    def on_execute(state) -> None:
+        if state.is_insert or state.is_update or state.is_delete:
+            wrote()
+
+    def after_commit(_) -> None:
+        if session.info.pop(_WROTE_KEY, False):
+            _set_primary_cookie(response)
+
+    def after_rollback(_) -> None:
+        session.info.pop(_WROTE_KEY, None)
+
+    event.listen(session, "after_flush", wrote)
+    event.listen(session, "do_orm_execute", on_execute)
+    event.listen(session, "after_commit", after_commit)
+    event.listen(session, "after_rollback", after_rollback)
+
+
+async def get_db(response: Response) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get async database session (primary)
+
+    Usage in endpoints:
+        @router.post("/items")
+        async def create_item(db: AsyncSession = Depends(get_db)):
+            ...
+
+    Yields:
+        Async database session bound to the primary
+    """
+    async with _session(AsyncSessionLocal) as session:
+        if ReadSessionLocals:
+            pin_reads_after_commit(session.sync_session, response)
+        yield session
+
+
+def get_read_session_factory(
+    request: Request,
+) -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """
+    Dependency returning a factory of read sessions for ``request``.
+
+    Dependency sessions are closed before a StreamingResponse body is sent, so
+    streaming routes open their session inside the body generator instead:
+
+        async def body():
+            async with open_session() as db:
+                ...
+    """
+    return lambda: _read_session(request)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get a read-only async database session
 
     Usage in endpoints:
         @router.get("/items")
-        async def get_items(db: AsyncSession = Depends(get_db)):
+        async def get_items(db: AsyncSession = Depends(get_read_db)):
             ...
 
+    Read-your-writes relies on the db_primary_until cookie set after a
+    committed write: API clients must keep cookies between requests, or
+    their reads may not see their own writes for the replication lag.
+
     Yields:
-        Async database session
+        Async database session bound to a replica (or the primary, see module doc)
     """
-    async with AsyncSessionLocal() as session:
+    async with _read_session(request) as session:
         yield session
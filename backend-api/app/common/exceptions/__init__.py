@@ -74,6 +74,43 @@ class ConflictException(AppException):
         super().__init__(status_code=409, message=message, detail=detail)
 
 
+class TooManyRequestsException(AppException):
+    """Rate limit exceeded - HTTP 429."""
+
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded",
+        detail: str | None = None,
+        retry_after: int | None = None,
+    ) -> None:
+        super().__init__(status_code=429, message=message, detail=detail)
+        self.headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+
+
+class ServiceUnavailableException(AppException):
+    """Service temporarily unavailable - HTTP 503."""
+
+    def __init__(
+        self,
+        message: str = "Service Unavailable",
+        detail: str | None = None,
+        retry_after: int | None = None,
+    ) -> None:
+        super().__init__(status_code=503, message=message, detail=detail)
+        self.headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+
+
+class GatewayTimeoutException(AppException):
+    """Request deadline exceeded - HTTP 504."""
+
+    def __init__(
+        self,
+        message: str = "Gateway Timeout",
+        detail: str | None = None,
+    ) -> None:
+        super().__init__(status_code=504, message=message, detail=detail)
+
+
 class InternalServerException(AppException):
     """Internal server error - HTTP 500."""
 
@@ -21,6 +21,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
     return JSONResponse(
         status_code=exc.status_code,
         content=error.model_dump(),
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -0,0 +1,205 @@
+"""
+CQRS Handler Instrumentation
+
+Prometheus histograms per Command/Query handler and per SQL statement
+fingerprint, so handler time can be split into its statements (e.g. the
+COUNT and the page fetch of ListAppointmentsQuery) and rows returned, plus
+the time FastAPI spends serializing the handler's result into the response
+model.
+
+Usage:
+    class ListAppointmentsQuery:
+        @instrument_handler
+        async def execute(self, ...):
+            ...
+
+Disabled by default (HANDLER_METRICS_ENABLED=false): the decorator then costs
+one flag check per call and no SQLAlchemy listeners are registered.
+"""
+import functools
+import hashlib
+import re
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+import fastapi.routing
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+HandlerFn = TypeVar("HandlerFn", bound=Callable[..., Awaitable[Any]])
+
+HANDLER_DURATION = Histogram(
+    "cqrs_handler_duration_seconds",
+    "Execution time of CQRS Command/Query handlers",
+    ["handler", "kind"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+HANDLER_ROWS = Histogram(
+    "cqrs_handler_rows",
+    "Rows/items returned by CQRS handlers",
+    ["handler"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 250, 500, 1000, 5000),
+)
+STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time by handler and statement fingerprint",
+    ["handler", "operation", "fingerprint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+STATEMENT_ROWS = Histogram(
+    "db_statement_rows",
+    "Rows returned or affected per SQL statement",
+    ["handler", "operation", "fingerprint"],
+    buckets=(0, 1, 5, 10, 20, 50, 100, 250, 500, 1000, 5000),
+)
+SERIALIZATION_DURATION = Histogram(
+    "cqrs_handler_serialization_duration_seconds",
+    "Time to validate and encode a handler's result into the response model",
+    ["handler"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+STATEMENT_INFO = Gauge(
+    "db_statement_fingerprint_info",
+    "Maps a statement fingerprint to its normalized SQL text",
+    ["fingerprint", "statement"],
+    multiprocess_mode="max",
+)
+
+_current_handler: ContextVar[str] = ContextVar("cqrs_handler", default="-")
+# Last handler run by the request; still set when FastAPI serializes its result
+_last_handler: ContextVar[str] = ContextVar("cqrs_last_handler", default="-")
+
+_LITERALS_RE = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+_PARAM_LIST_RE = re.compile(r"\((?:\s*(?:\?|\$\d+|%\(\w+\)s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+_fingerprints: dict[str, tuple[str, str]] = {}
+_known_fingerprints: set[str] = set()
+# Distinct fingerprints labelled before new ones collapse into "other"
+_MAX_FINGERPRINTS = 2000
+OTHER_FINGERPRINT = "other"
+
+
+class _State:
+    enabled: bool = False
+    serialize_response: Any = None
+
+
+def normalize_statement(statement: str) -> str:
+    """Strip literals, collapse parameter lists and whitespace."""
+    normalized = _LITERALS_RE.sub("?", statement)
+    normalized = _PARAM_LIST_RE.sub("(?)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """Return ``(operation, fingerprint)`` for a SQL statement (cached)."""
+    cached = _fingerprints.get(statement)
+    if cached is not None:
+        return cached
+
+    normalized = normalize_statement(statement)
+    operation = normalized.split(" ", 1)[0].upper() if normalized else "UNKNOWN"
+    fingerprint = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    if fingerprint not in _known_fingerprints:
+        if len(_known_fingerprints) >= _MAX_FINGERPRINTS:
+            # Bound label cardinality: unseen statements share one series
+            return operation, OTHER_FINGERPRINT
+        _known_fingerprints.add(fingerprint)
+        STATEMENT_INFO.labels(fingerprint=fingerprint, statement=normalized[:300]).set(1)
+
+    if len(_fingerprints) < _MAX_FINGERPRINTS:
+        _fingerprints[statement] = (operation, fingerprint)
+    return operation, fingerprint
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("_statement_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("_statement_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    operation, fingerprint = fingerprint_statement(statement)
+    labels = {"handler": _current_handler.get(), "operation": operation, "fingerprint": fingerprint}
+    STATEMENT_DURATION.labels(**labels).observe(elapsed)
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        STATEMENT_ROWS.labels(**labels).observe(rowcount)
+
+
+def _timed_serialize_response(serialize_response: Callable[..., Awaitable[Any]]):
+    @functools.wraps(serialize_response)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await serialize_response(*args, **kwargs)
+        finally:
+            SERIALIZATION_DURATION.labels(handler=_last_handler.get()).observe(
+                time.perf_counter() - start
+            )
+
+    return wrapper
+
+
+def enable_handler_metrics() -> None:
+    """
+    Turn on handler timing, register statement listeners on all engines and
+    time FastAPI's response serialization (``fastapi.routing.serialize_response``).
+    """
+    if _State.enabled:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    _State.serialize_response = fastapi.routing.serialize_response
+    fastapi.routing.serialize_response = _timed_serialize_response(_State.serialize_response)
+    _State.enabled = True
+
+
+def disable_handler_metrics() -> None:
+    """Turn off handler timing and remove the statement listeners."""
+    if not _State.enabled:
+        return
+    event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+    fastapi.routing.serialize_response = _State.serialize_response
+    _State.enabled = False
+
+
+def _result_size(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, dict) and "items" in result:
+        return len(result["items"])
+    if isinstance(result, list | tuple):
+        return len(result)
+    return 1
+
+
+def instrument_handler(execute: HandlerFn) -> HandlerFn:
+    """Decorate a handler's async ``execute`` to record duration, rows and SQL per handler."""
+
+    @functools.wraps(execute)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        if not _State.enabled:
+            return await execute(self, *args, **kwargs)
+
+        handler = type(self).__name__
+        kind = "command" if handler.endswith("Command") else "query"
+        token = _current_handler.set(handler)
+        _last_handler.set(handler)
+        start = time.perf_counter()
+        try:
+            result = await execute(self, *args, **kwargs)
+        finally:
+            HANDLER_DURATION.labels(handler=handler, kind=kind).observe(time.perf_counter() - start)
+            _current_handler.reset(token)
+        HANDLER_ROWS.labels(handler=handler).observe(_result_size(result))
+        return result
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,137 @@
+"""
+In-Process Cache
+
+Per-worker LRU cache with a TTL for hot reads that do not need a Redis round
+trip (e.g. an appointment by id). Entries are evicted on every pod through
+PostgreSQL LISTEN/NOTIFY: commands call ``notify_invalidation`` inside their
+transaction, and each worker's ``InvalidationListener`` evicts the key once
+that transaction commits (app/common/database/notify.py).
+
+Local caches only serve while this worker's listener is connected.
+Notifications sent while it is disconnected are lost, so caches are cleared
+and bypassed until it is back. The TTL bounds any remaining staleness, e.g. a
+read replica that lags behind the notification.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from prometheus_client import Counter
+
+LOCAL_CACHE_REQUESTS = Counter(
+    "local_cache_requests_total",
+    "In-process cache lookups by result (hit, miss, bypass)",
+    ["namespace", "result"],
+)
+
+# Caches by namespace, for evictions received from other pods
+_registry: dict[str, "LocalCache"] = {}
+_active = False
+
+
+class LocalCache:
+    """
+    LRU cache of at most ``max_entries`` values, each kept for ``ttl`` seconds.
+
+    Usage:
+        cache = LocalCache("appointments:by_id", ttl=30, max_entries=10_000)
+        value = await cache.get_or_load(str(appointment_id), load)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        max_entries: int,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Bumped by every eviction so a load that raced with one is not stored
+        self._version = 0
+        _registry[namespace] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def serving(self) -> bool:
+        return self.enabled and _active
+
+    def _get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _set(self, key: str, value: Any) -> None:
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(
+        self, key: str, load: Callable[[], Awaitable[Any]], fill: bool = True
+    ) -> Any:
+        """
+        Return the cached value for ``key``, loading and caching it on a miss.
+
+        With ``fill=False`` a miss is loaded but not cached, e.g. when ``load``
+        reads a replica that may still return a row evicted by a later write.
+        ``None`` results are not cached. The loaded value is shared by later
+        callers, so it must not be mutated.
+        """
+        if not self.serving:
+            LOCAL_CACHE_REQUESTS.labels(namespace=self.namespace, result="bypass").inc()
+            return await load()
+
+        found, value = self._get(key)
+        if found:
+            LOCAL_CACHE_REQUESTS.labels(namespace=self.namespace, result="hit").inc()
+            return value
+
+        LOCAL_CACHE_REQUESTS.labels(namespace=self.namespace, result="miss").inc()
+        version = self._version
+        value = await load()
+        if fill and value is not None and version == self._version and self.serving:
+            self._set(key, value)
+        return value
+
+    def evict(self, key: Optional[str] = None) -> None:
+        """Drop ``key``, or every entry when ``key`` is None."""
+        self._version += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+def evict(namespace: str, key: Optional[str] = None) -> None:
+    """Evict ``key`` (or everything) from the local cache of ``namespace``, if any."""
+    cache = _registry.get(namespace)
+    if cache is not None:
+        cache.evict(key)
+
+
+def set_active(active: bool) -> None:
+    """
+    Start or stop serving from every local cache.
+
+    Called by the invalidation listener when it connects or disconnects.
+    Caches are cleared either way: entries cached before a disconnect may
+    have missed their eviction.
+    """
+    global _active
+    _active = active
+    for cache in _registry.values():
+        cache.evict()
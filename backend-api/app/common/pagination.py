@@ -0,0 +1,128 @@
+"""
+Keyset (Cursor) Pagination
+
+Pages are selected with a row comparison on the sort columns, e.g.
+``(appointment_date, id) > (:date, :id)``, instead of OFFSET, so each page
+costs one index range scan no matter how deep the client has paged, and rows
+inserted between requests do not shift pages.
+
+The cursor is an opaque URL-safe token holding the sort values of the last
+row of a page. Sort columns must end with a unique column (the primary key)
+so the order is total.
+"""
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, Iterator, Optional, Sequence, TypeVar
+
+import orjson
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.common.exceptions import BadRequestException
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CursorPage(Generic[T]):
+    """One page of rows plus the cursor of the next page (None on the last page)."""
+
+    items: list[T]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort values of a row as an opaque cursor."""
+    payload = orjson.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    """
+    Decode a cursor produced by ``encode_cursor`` for the given sort columns.
+
+    Raises:
+        BadRequestException: If the cursor is malformed or does not match the columns.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = orjson.loads(payload)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("wrong number of values")
+        return [
+            datetime.fromisoformat(value) if _is_datetime(column) else value
+            for column, value in zip(columns, values, strict=True)
+        ]
+    except (ValueError, TypeError) as exc:
+        raise BadRequestException(message="Invalid cursor", detail=str(exc)) from exc
+
+
+def _is_datetime(column: Any) -> bool:
+    try:
+        return column.type.python_type is datetime
+    except NotImplementedError:
+        return False
+
+
+def _sort_values(row: Any, columns: Sequence[Any]) -> list[Any]:
+    return [getattr(row, column.key) for column in columns]
+
+
+def _ordered(query: Query, columns: Sequence[Any], descending: bool) -> Query:
+    return query.order_by(*(column.desc() if descending else column.asc() for column in columns))
+
+
+def _after(query: Query, columns: Sequence[Any], values: Sequence[Any], descending: bool) -> Query:
+    position, bound = tuple_(*columns), tuple_(*values)
+    return query.filter(position < bound if descending else position > bound)
+
+
+def keyset_page(
+    query: Query,
+    columns: Sequence[Any],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> CursorPage:
+    """
+    Fetch one page of ``query`` ordered by ``columns``, starting after ``cursor``.
+
+    One extra row is fetched to know whether a next page exists.
+    """
+    if cursor is not None:
+        query = _after(query, columns, decode_cursor(cursor, columns), descending)
+    rows = _ordered(query, columns, descending).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(_sort_values(rows[-1], columns))
+    return CursorPage(items=rows, next_cursor=next_cursor)
+
+
+def iter_keyset_batches(
+    query: Query,
+    columns: Sequence[Any],
+    batch_size: int,
+    max_rows: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+) -> Iterator[CursorPage]:
+    """
+    Walk ``query`` in keyset batches of ``batch_size`` rows, up to ``max_rows``.
+
+    Each batch is a page whose ``next_cursor`` resumes after it; the last
+    batch has ``next_cursor=None`` unless ``max_rows`` cut the walk short.
+    Rows of a batch are expunged from the session before the next one is
+    read, so memory stays bounded by the batch size.
+    """
+    remaining = max_rows
+    while remaining > 0:
+        page = keyset_page(query, columns, min(batch_size, remaining), cursor, descending)
+        remaining -= len(page.items)
+        yield page
+        query.session.expunge_all()
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
@@ -0,0 +1,210 @@
+"""
+Stampede-Safe Redis Cache
+
+Read-through cache for hot query results, shared by every worker and pod.
+
+- Probabilistic early refresh (XFetch): each reader recomputes before expiry
+  with a probability that grows as expiry approaches and with the time the
+  last recompute took (``delta``), so a hot key is refreshed by one early
+  reader instead of by every reader at the moment it expires.
+- A Redis lock (``SET NX PX``) per key lets one process recompute; the others
+  keep serving the current entry, or wait briefly for the lock holder when
+  there is none.
+- Invalidation bumps a namespace generation counter (one ``INCR`` for all
+  keys). Entries carry the generation they were computed under and are
+  ignored once it changes, so a recompute racing with a write cannot
+  re-publish the old result.
+
+Redis is an optimization only: when it is unavailable (error, timeout, open
+circuit) readers compute from the database directly.
+"""
+import asyncio
+import contextlib
+import logging
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from prometheus_client import Counter
+from redis.exceptions import RedisError
+
+from app.common.redis.client import get_redis_client
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenException, redis_breaker
+from app.core.deadline import redis_timeout
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit, early_refresh, miss, stale, wait_hit, bypass)",
+    ["namespace", "result"],
+)
+
+# Delete the lock only if we still own it (it may have expired and been re-taken)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_UNAVAILABLE = (RedisError, OSError, CircuitOpenException)
+
+
+class XFetchCache:
+    """
+    Cache of JSON-serializable values under ``<namespace>:<key>``.
+
+    Usage:
+        cache = XFetchCache("appointments:upcoming", ttl=30)
+        rows = await cache.get_or_compute("7", lambda: load_rows(7))
+        await cache.invalidate()
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        beta: float = 1.0,
+        lock_timeout: float = 5.0,
+        enabled: bool = True,
+        redis_factory: Callable[[], Any] = get_redis_client,
+        breaker: CircuitBreaker = redis_breaker,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self.enabled = enabled
+        self.poll_interval = 0.05
+        self._redis_factory = redis_factory
+        self._breaker = breaker
+        self._rand = rand
+
+    @property
+    def generation_key(self) -> str:
+        return f"cache:{self.namespace}:generation"
+
+    def _entry_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    async def _command(self, call: Callable[[Any], Awaitable[Any]]) -> Any:
+        """Run one Redis command through the breaker, bounded by the request deadline."""
+        async with self._breaker:
+            return await asyncio.wait_for(call(self._redis_factory()), timeout=redis_timeout())
+
+    def _should_refresh(self, entry: dict, now: float) -> bool:
+        # XFetch: now - delta * beta * ln(U) >= expiry, with U in (0, 1]
+        gap = -entry["delta"] * self.beta * math.log(1.0 - self._rand())
+        return now + gap >= entry["expiry"]
+
+    async def _read(self, key: str) -> tuple[Optional[dict], int]:
+        """Return ``(entry, generation)``; entry is None if missing or from an older generation."""
+        raw, generation = await self._command(
+            lambda client: client.mget(self._entry_key(key), self.generation_key)
+        )
+        generation = int(generation or 0)
+        if raw is None:
+            return None, generation
+        entry = orjson.loads(raw)
+        if entry["generation"] != generation:
+            return None, generation
+        return entry, generation
+
+    async def _compute_and_store(
+        self, key: str, generation: int, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        started = time.monotonic()
+        value = await compute()
+        delta = time.monotonic() - started
+        entry = {
+            "generation": generation,
+            "delta": delta,
+            "expiry": time.time() + self.ttl,
+            "value": value,
+        }
+        # Keep the key past its logical expiry so lock losers can serve it during a refresh
+        px = int((self.ttl + self.lock_timeout) * 1000)
+        try:
+            await self._command(
+                lambda client: client.set(self._entry_key(key), orjson.dumps(entry), px=px)
+            )
+        except _UNAVAILABLE as exc:
+            logger.warning("Cache store failed: namespace=%s error=%s", self.namespace, exc)
+        return value
+
+    async def _wait_for_entry(self, key: str) -> Optional[dict]:
+        """Poll for the entry another process is computing, up to the lock timeout."""
+        give_up_at = time.monotonic() + self.lock_timeout
+        while time.monotonic() < give_up_at:
+            await asyncio.sleep(self.poll_interval)
+            entry, _ = await self._read(key)
+            if entry is not None:
+                return entry
+        return None
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for ``key``, computing and storing it when needed.
+
+        ``compute`` must return a JSON-serializable value; the caller gets the
+        same shape from the cache (e.g. ISO strings, not datetimes).
+        """
+        if not self.enabled:
+            return await compute()
+
+        try:
+            entry, generation = await self._read(key)
+            if entry is not None and not self._should_refresh(entry, time.time()):
+                CACHE_REQUESTS.labels(namespace=self.namespace, result="hit").inc()
+                return entry["value"]
+
+            token = uuid.uuid4().hex
+            lock_key = f"{self._entry_key(key)}:lock"
+            locked = await self._command(
+                lambda client: client.set(
+                    lock_key, token, nx=True, px=int(self.lock_timeout * 1000)
+                )
+            )
+            if not locked:
+                if entry is not None:
+                    # Someone else is refreshing; the current entry is still usable
+                    CACHE_REQUESTS.labels(namespace=self.namespace, result="stale").inc()
+                    return entry["value"]
+                entry = await self._wait_for_entry(key)
+                if entry is not None:
+                    CACHE_REQUESTS.labels(namespace=self.namespace, result="wait_hit").inc()
+                    return entry["value"]
+        except _UNAVAILABLE as exc:
+            if not isinstance(exc, CircuitOpenException):
+                logger.warning("Cache unavailable: namespace=%s error=%s", self.namespace, exc)
+            locked = False
+
+        if not locked:
+            # Redis unavailable, or the lock holder did not publish in time
+            CACHE_REQUESTS.labels(namespace=self.namespace, result="bypass").inc()
+            return await compute()
+
+        result = "early_refresh" if entry is not None else "miss"
+        CACHE_REQUESTS.labels(namespace=self.namespace, result=result).inc()
+        try:
+            return await self._compute_and_store(key, generation, compute)
+        finally:
+            # The lock expires on its own if Redis is unavailable
+            with contextlib.suppress(*_UNAVAILABLE):
+                await self._command(
+                    lambda client: client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                )
+
+    async def invalidate(self) -> None:
+        """Invalidate every key of the namespace. Never raises; entries expire after ``ttl``."""
+        if not self.enabled:
+            return
+        try:
+            await self._command(lambda client: client.incr(self.generation_key))
+        except _UNAVAILABLE as exc:
+            logger.warning("Cache invalidation failed: namespace=%s error=%s", self.namespace, exc)
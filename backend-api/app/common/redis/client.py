@@ -0,0 +1,49 @@
+"""
+Redis Client Management
+Shared asyncio Redis client (one connection pool per worker process)
+"""
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_client: Optional[aioredis.Redis] = None
+
+
+def get_redis_client() -> aioredis.Redis:
+    """
+    Return the process-wide async Redis client, creating it on first use.
+
+    Reusing one client keeps a warm connection pool instead of opening a new
+    TCP connection for every health check or cache lookup.
+    """
+    global _client
+    if _client is None:
+        _client = aioredis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        )
+    return _client
+
+
+async def close_redis_client() -> None:
+    """Close the shared Redis client and its connection pool."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def reset_redis_client_after_fork() -> None:
+    """
+    Drop the inherited client in a forked child without closing it.
+
+    Its connections belong to the parent; the child creates its own pool on
+    next use.
+    """
+    global _client
+    _client = None
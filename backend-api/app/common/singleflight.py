@@ -0,0 +1,122 @@
+"""
+Singleflight Request Coalescing for Query Handlers
+
+Concurrent identical reads within a worker share one execution: the first
+caller (leader) runs the handler, callers arriving while it is in flight
+await the leader's result instead of issuing the same statements again.
+Nothing is cached; the key is dropped as soon as the leader finishes.
+
+Usage:
+    class GetUpcomingAppointmentsQuery:
+        @instrument_handler
+        @singleflight
+        async def execute(self, days_ahead: int = 7):
+            ...
+
+The key is the handler class, the bound arguments (defaults applied, so
+``execute()`` and ``execute(days_ahead=7)`` coalesce) and the engine the
+handler's session is bound to, so a read routed to the primary for
+read-your-writes never receives a replica result. Coalesced callers share
+the returned objects and must treat them as read-only.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HandlerFn = TypeVar("HandlerFn", bound=Callable[..., Awaitable[Any]])
+
+SINGLEFLIGHT_CALLS = Counter(
+    "cqrs_singleflight_calls_total",
+    "Query handler calls by singleflight role (leader executed, coalesced shared a result)",
+    ["handler", "role"],
+)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn argument values into a hashable, order-insensitive form."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+class SingleFlight:
+    """Group of in-flight calls keyed by an arbitrary hashable key."""
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """
+        Run ``fn`` unless a call with ``key`` is in flight, then share its result.
+
+        Returns:
+            ``(result, shared)``; ``shared`` is True for coalesced callers.
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled (e.g. its deadline passed); run our own call
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a leader-only failure is not logged as "never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+_group = SingleFlight()
+
+
+def singleflight(execute: HandlerFn) -> HandlerFn:
+    """Coalesce concurrent identical calls of a Query handler's async ``execute``."""
+    signature = inspect.signature(execute)
+
+    @functools.wraps(execute)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        if not settings.SINGLEFLIGHT_ENABLED:
+            return await execute(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        handler = type(self).__name__
+        arguments = tuple((name, _freeze(value)) for name, value in bound.arguments.items())[1:]
+        bind = getattr(self.db, "bind", None)
+        key = (handler, id(bind), arguments)
+
+        result, shared = await _group.do(key, lambda: execute(self, *args, **kwargs))
+        SINGLEFLIGHT_CALLS.labels(handler=handler, role="coalesced" if shared else "leader").inc()
+        return result
+
+    return wrapper  # type: ignore[return-value]
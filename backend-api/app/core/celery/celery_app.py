@@ -12,6 +12,7 @@ celery_app = Celery(
     include=[
         "app.tasks.email_tasks",
         "app.tasks.notification_tasks",
+        "app.tasks.maintenance_tasks",
     ]
 )
 
@@ -0,0 +1,32 @@
+"""
+Best-effort Celery task dispatch from request handlers.
+
+Publishing goes through the broker circuit breaker: while the broker is
+known to be down the task is skipped immediately instead of every request
+blocking on kombu's connection retries. Use it for side effects that must
+not fail a request whose main work is already committed (notifications).
+"""
+import logging
+from typing import Any
+
+from app.core.circuit_breaker import CircuitOpenException, celery_breaker
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch(task: Any, **kwargs: Any) -> bool:
+    """
+    Queue ``task`` with ``kwargs``; never raises.
+
+    Returns:
+        True when the task was published, False when it was skipped or failed.
+    """
+    try:
+        with celery_breaker:
+            task.delay(**kwargs)
+        return True
+    except CircuitOpenException:
+        logger.warning("Task not queued, broker circuit open: task=%r", task)
+    except Exception as exc:
+        logger.error("Task dispatch failed: task=%r error=%s", task, exc)
+    return False
@@ -0,0 +1,63 @@
+"""
+Lazy Celery task references for the API process.
+
+Importing a task module imports Celery and builds the app (~70 ms, plus
+kombu/redis transport setup), which the API only needs when a command
+actually dispatches a task. ``LazyTask`` stands in for the task object and
+imports it on first attribute access (``.delay``, ``.apply_async``, ...).
+Startup warm-up calls ``resolve_all`` from a worker thread so the import is
+usually done before the first request needs it.
+"""
+import importlib
+import threading
+import weakref
+from typing import Any, Optional
+
+_lazy_tasks: "weakref.WeakSet[LazyTask]" = weakref.WeakSet()
+
+
+class LazyTask:
+    """
+    Proxy for ``module:attribute`` that resolves on first use.
+
+    Module-level ``LazyTask`` attributes can still be replaced with
+    ``unittest.mock.patch`` like the task object itself.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._task: Optional[Any] = None
+        self._lock = threading.Lock()
+        _lazy_tasks.add(self)
+
+    @property
+    def resolved(self) -> bool:
+        return self._task is not None
+
+    def resolve(self) -> Any:
+        """Import and return the task; safe to call from any thread."""
+        if self._task is None:
+            with self._lock:
+                if self._task is None:
+                    module_name, _, attribute = self._path.partition(":")
+                    self._task = getattr(importlib.import_module(module_name), attribute)
+        return self._task
+
+    def __getattr__(self, name: str) -> Any:
+        # Private names (copy/pickle probes before __init__) never trigger the import
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "resolved" if self.resolved else "unresolved"
+        return f"<LazyTask {self._path} ({state})>"
+
+
+def resolve_all() -> None:
+    """Resolve every ``LazyTask`` defined so far."""
+    for task in list(_lazy_tasks):
+        task.resolve()
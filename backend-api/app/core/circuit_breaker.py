@@ -0,0 +1,223 @@
+"""
+Circuit Breakers for PostgreSQL, Redis and the Celery broker
+
+After CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failures a breaker opens
+and callers fail fast with 503 instead of each waiting on connection
+timeouts. After CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS it half-opens: a
+single trial call is let through; success closes the breaker, failure opens
+it again. A trial that never reports back (e.g. the request did not use the
+dependency after all) is replaced by a new one after another reset timeout.
+
+State is per process and exported as ``circuit_breaker_state`` (0 closed,
+1 open, 2 half-open). Readiness checks do not go through the breakers, so
+they keep detecting recovery on their own schedule.
+"""
+import enum
+import logging
+import threading
+import time
+import weakref
+from typing import Callable, Optional, Union
+
+from prometheus_client import Counter, Gauge
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.common.exceptions import ServiceUnavailableException
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 open, 2 half-open",
+    ["name"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes",
+    ["name", "state"],
+)
+CIRCUIT_REJECTIONS = Counter(
+    "circuit_breaker_rejections_total",
+    "Calls rejected without trying because the circuit was open",
+    ["name"],
+)
+
+
+class CircuitState(enum.IntEnum):
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
+
+class CircuitOpenException(ServiceUnavailableException):
+    """Dependency circuit is open - HTTP 503 with Retry-After."""
+
+    def __init__(self, name: str, retry_after: int) -> None:
+        super().__init__(
+            message="Dependency unavailable",
+            detail=f"{name} is unavailable, retry later",
+            retry_after=retry_after,
+        )
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Use ``before_call()`` / ``record_success()`` / ``record_failure()``
+    directly when outcomes are observed elsewhere (engine events), or wrap a
+    call with ``with breaker:`` / ``async with breaker:``; only exceptions in
+    ``failure_exceptions`` count as failures.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = settings.CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS,
+        failure_exceptions: tuple[type[BaseException], ...] = (Exception,),
+        enabled: bool = settings.CIRCUIT_BREAKER_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_exceptions = failure_exceptions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        CIRCUIT_STATE.labels(name=name).set(CircuitState.CLOSED)
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            elapsed = self._clock() - self._opened_at
+            if self._state is CircuitState.OPEN and elapsed >= self.reset_timeout:
+                self._transition(CircuitState.HALF_OPEN)
+            return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        self._trial_started_at = None
+        if state is CircuitState.OPEN:
+            self._opened_at = self._clock()
+        CIRCUIT_STATE.labels(name=self.name).set(state)
+        CIRCUIT_TRANSITIONS.labels(name=self.name, state=state.name.lower()).inc()
+        log = logger.warning if state is CircuitState.OPEN else logger.info
+        log("Circuit breaker %s: name=%s", state.name.lower(), self.name)
+
+    def _retry_after(self) -> int:
+        return max(1, int(self.reset_timeout - (self._clock() - self._opened_at) + 0.999))
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenException unless a call may go through now."""
+        if not self.enabled:
+            return
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return
+        with self._lock:
+            now = self._clock()
+            trial = self._trial_started_at
+            if state is CircuitState.HALF_OPEN and (
+                trial is None or now - trial >= self.reset_timeout
+            ):
+                self._trial_started_at = now
+                return
+            retry_after = self._retry_after() if state is CircuitState.OPEN else 1
+        CIRCUIT_REJECTIONS.labels(name=self.name).inc()
+        raise CircuitOpenException(self.name, retry_after)
+
+    def record_success(self) -> None:
+        if self._state is CircuitState.CLOSED and self._failures == 0:
+            return
+        with self._lock:
+            self._failures = 0
+            if self._state is not CircuitState.CLOSED:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state is CircuitState.HALF_OPEN or (
+                self._state is CircuitState.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._transition(CircuitState.OPEN)
+
+    def _after_call(self, exc: Optional[BaseException]) -> None:
+        if exc is None:
+            self.record_success()
+        elif isinstance(exc, self.failure_exceptions):
+            self.record_failure()
+
+    def __enter__(self) -> "CircuitBreaker":
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._after_call(exc)
+
+    async def __aenter__(self) -> "CircuitBreaker":
+        self.before_call()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._after_call(exc)
+
+
+redis_breaker = CircuitBreaker(
+    "redis", failure_exceptions=(RedisConnectionError, RedisTimeoutError, OSError)
+)
+# Any dispatch error counts: kombu (and its OperationalError) is imported lazily with Celery
+celery_breaker = CircuitBreaker("celery_broker", failure_exceptions=(Exception,))
+
+_database_breakers: "weakref.WeakKeyDictionary[Engine, CircuitBreaker]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def database_breaker(target: Union[AsyncEngine, Engine]) -> CircuitBreaker:
+    """
+    Return the breaker of an engine, creating it and its event listeners on first use.
+
+    Connection failures and disconnects reported by the engine count as
+    failures, any completed statement as a success. Statement errors
+    (constraint violations, statement_timeout) say nothing about
+    availability and are ignored. Connect errors the driver raises as plain
+    OSError never reach the engine events; the session dependencies record
+    those.
+    """
+    sync_engine = target.sync_engine if isinstance(target, AsyncEngine) else target
+    breaker = _database_breakers.get(sync_engine)
+    if breaker is not None:
+        return breaker
+
+    breaker = CircuitBreaker(
+        f"database:{sync_engine.pool.logging_name or 'default'}",
+        failure_exceptions=(OperationalError, InterfaceError, OSError),
+    )
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        breaker.record_success()
+
+    def handle_error(exception_context) -> None:
+        # Errors while connecting have no Connection yet
+        if exception_context.is_disconnect or exception_context.connection is None:
+            breaker.record_failure()
+
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(sync_engine, "handle_error", handle_error)
+    _database_breakers[sync_engine] = breaker
+    return breaker
@@ -0,0 +1,163 @@
+"""
+Adaptive Concurrency Limiting (load shedding)
+
+Caps the requests a worker processes at once. Above the cap a request is
+rejected immediately with 503 and ``Retry-After`` instead of queueing for the
+small database pool, where it would push every in-flight request past the
+latency SLO.
+
+The cap adapts with AIMD on observed latency:
+- a request slower than CONCURRENCY_LIMIT_TARGET_LATENCY_MS multiplies the
+  limit by CONCURRENCY_LIMIT_BACKOFF_RATIO;
+- a fast request while at least half the limit is in use adds
+  1 / limit, i.e. about +1 per limit's worth of completions.
+
+A request holds its slot until the last body chunk is sent, so streaming
+responses count for as long as they stream. Routes with their own
+``route_timeout`` (streams, profiling) are long-running by design: they are
+counted and shed like any other request but their latency does not move
+the limit.
+
+Paths in CONCURRENCY_LIMIT_EXEMPT_PATHS (probes, metrics) form a separate
+lane that is never counted or shed. State is per worker and only touched
+from the event loop thread.
+"""
+import logging
+import time
+from typing import Sequence
+
+from prometheus_client import Counter, Gauge
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.exceptions import ServiceUnavailableException
+from app.common.exceptions.handlers import app_exception_handler
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CONCURRENCY_LIMIT = Gauge(
+    "http_concurrency_limit",
+    "Current adaptive in-flight request limit",
+    multiprocess_mode="livesum",
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "http_concurrency_in_flight",
+    "Requests currently counted against the concurrency limit",
+    multiprocess_mode="livesum",
+)
+REQUESTS_SHED = Counter(
+    "http_requests_shed_total",
+    "Requests rejected with 503 because the concurrency limit was reached",
+)
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease in-flight limit."""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_latency: float,
+        backoff_ratio: float,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        CONCURRENCY_LIMIT.set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Count a request in, or return False when the limit is reached."""
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+        return True
+
+    def release(self, latency: float | None) -> None:
+        """Count a request out and adjust the limit from its latency (None: no signal)."""
+        in_flight = self.in_flight
+        self.in_flight -= 1
+        CONCURRENCY_IN_FLIGHT.set(self.in_flight)
+
+        if latency is None:
+            return
+        if latency > self.target_latency:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif in_flight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        CONCURRENCY_LIMIT.set(self.limit)
+
+
+class ConcurrencyLimitMiddleware:
+    """Shed requests above the adaptive limit with 503 + Retry-After."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: AIMDLimiter | None = None,
+        exempt_paths: Sequence[str] | None = None,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter or AIMDLimiter(
+            initial_limit=settings.CONCURRENCY_LIMIT_INITIAL,
+            min_limit=settings.CONCURRENCY_LIMIT_MIN,
+            max_limit=settings.CONCURRENCY_LIMIT_MAX,
+            target_latency=settings.CONCURRENCY_LIMIT_TARGET_LATENCY_MS / 1000,
+            backoff_ratio=settings.CONCURRENCY_LIMIT_BACKOFF_RATIO,
+        )
+        self.exempt_paths = frozenset(
+            settings.CONCURRENCY_LIMIT_EXEMPT_PATHS if exempt_paths is None else exempt_paths
+        )
+
+    async def _shed(self, scope: Scope, receive: Receive, send: Send) -> None:
+        REQUESTS_SHED.inc()
+        logger.warning("Request shed: limit=%d path=%s", self.limiter.limit, scope["path"])
+        response = await app_exception_handler(
+            Request(scope),
+            ServiceUnavailableException(
+                message="Server overloaded",
+                detail="Too many concurrent requests, retry later",
+                retry_after=settings.CONCURRENCY_LIMIT_RETRY_AFTER_SECONDS,
+            ),
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.limiter.try_acquire():
+            await self._shed(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            long_running = scope.get("state", {}).get("route_timeout") is not None
+            self.limiter.release(None if long_running else time.perf_counter() - start)
+
+        async def send_wrapper(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            release()
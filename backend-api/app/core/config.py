@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
+    # Records buffered for the background log writer; beyond this they are dropped
+    LOG_QUEUE_MAX_SIZE: int = 10000
     API_V1_PREFIX: str = "/api/v1"
 
     # Database
@@ -31,10 +33,50 @@ class Settings(BaseSettings):
             return url.replace("postgresql://", "postgresql+asyncpg://", 1)
         return url
 
+    # Read replicas for CQRS queries: comma-separated URLs, empty = use primary
+    DATABASE_READ_URL: str = ""
+    # Seconds a client's reads stay on the primary after it committed a write
+    # (db_primary_until cookie; clients must keep cookies)
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    @property
+    def ASYNC_DATABASE_READ_URLS(self) -> List[str]:  # noqa: N802 - named like ASYNC_DATABASE_URL
+        """Replica URLs from DATABASE_READ_URL converted to the asyncpg driver."""
+        urls = [u.strip() for u in self.DATABASE_READ_URL.split(",") if u.strip()]
+        return [
+            u.replace("postgresql://", "postgresql+asyncpg://", 1)
+            if u.startswith("postgresql://") else u
+            for u in urls
+        ]
+
+    # Database connection pool (per worker process)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+
     # Redis
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    # Upper bound for one Redis command (request calls are also bounded by the deadline)
+    REDIS_SOCKET_TIMEOUT: float = 1.0
+
+    # Readiness probe (background dependency checks)
+    READINESS_CHECK_INTERVAL_SECONDS: float = 5.0
+    READINESS_CHECK_TIMEOUT_SECONDS: float = 2.0
+    READINESS_MAX_STALENESS_SECONDS: float = 30.0
+    READINESS_POOL_SATURATION_THRESHOLD: float = 0.9
+
+    # Startup warm-up (readiness stays pending until it finishes)
+    WARMUP_ENABLED: bool = True
+    WARMUP_DB_CONNECTIONS: int = 2
+    WARMUP_TIMEOUT_SECONDS: float = 30.0
+    # Import Celery and the lazily referenced tasks during warm-up. Off by
+    # default: it undoes the lazy import for API workers that never dispatch
+    WARMUP_CELERY_ENABLED: bool = False
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -44,8 +86,15 @@ class Settings(BaseSettings):
     # CORS - environment-specific (no wildcards in production)
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
 
-    # Rate Limiting
+    # Rate Limiting (Redis token bucket shared by all workers and pods)
+    RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_AUTH: str = "5/minute"
+    # Admit locally while more than this fraction of the bucket would remain
+    RATE_LIMIT_FAST_PATH_RATIO: float = 0.5
+    RATE_LIMIT_LOCAL_LEASE_SECONDS: float = 1.0
+    # API worker processes across all pods. Each leases independently, so
+    # limits below 2 tokens per worker (e.g. auth) always go to Redis
+    RATE_LIMIT_WORKERS: int = 8
 
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
@@ -55,6 +104,116 @@ class Settings(BaseSettings):
     OTEL_EXPORTER_OTLP_ENDPOINT: str = "http://localhost:4317"
     OTEL_SERVICE_NAME: str = "backend-api"
     OTEL_TRACING_ENABLED: bool = True
+    # always_on | parentbased_traceidratio | parentbased_ratelimited
+    OTEL_SAMPLER: str = "parentbased_traceidratio"
+    OTEL_SAMPLER_RATIO: float = 1.0
+    OTEL_SAMPLER_MAX_TRACES_PER_SECOND: float = 10.0
+    # Comma-separated URL regexes that never create spans
+    OTEL_EXCLUDED_URLS: str = "health,ready,metrics"
+    # BatchSpanProcessor: spans beyond the queue are dropped instead of blocking requests
+    OTEL_BSP_MAX_QUEUE_SIZE: int = 2048
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE: int = 512
+    OTEL_BSP_SCHEDULE_DELAY_MILLIS: int = 5000
+    OTEL_BSP_EXPORT_TIMEOUT_MILLIS: int = 30000
+    # SQL spans: full statement text is opt-in, fingerprint is always recorded
+    OTEL_SQLALCHEMY_CAPTURE_STATEMENT: bool = False
+    OTEL_SQLALCHEMY_RECORD_ROWS: bool = True
+    OTEL_SQLALCHEMY_RECORD_POOL_WAIT: bool = True
+
+    # On-demand CPU profiling (/admin/profile and X-Profile header)
+    PROFILING_ENABLED: bool = False
+    PROFILING_ALLOWED_EMAILS: List[str] = []
+    PROFILING_MAX_SECONDS: float = 60.0
+    PROFILING_INTERVAL_MS: float = 5.0
+
+    # Per-handler / per-statement latency histograms (adds SQL event listeners)
+    HANDLER_METRICS_ENABLED: bool = False
+
+    # Adaptive concurrency limit per worker (load shedding with 503 + Retry-After)
+    CONCURRENCY_LIMIT_ENABLED: bool = True
+    CONCURRENCY_LIMIT_INITIAL: int = 20
+    CONCURRENCY_LIMIT_MIN: int = 4
+    CONCURRENCY_LIMIT_MAX: int = 200
+    # Responses slower than this shrink the limit (the latency SLO)
+    CONCURRENCY_LIMIT_TARGET_LATENCY_MS: float = 500.0
+    CONCURRENCY_LIMIT_BACKOFF_RATIO: float = 0.9
+    CONCURRENCY_LIMIT_RETRY_AFTER_SECONDS: int = 1
+    # Never counted or shed (probes must answer even when overloaded)
+    CONCURRENCY_LIMIT_EXEMPT_PATHS: List[str] = ["/health", "/ready", "/metrics"]
+
+    # Per-request deadline (X-Request-Timeout-Ms header or this default); also
+    # applied to PostgreSQL transactions as SET LOCAL statement_timeout
+    REQUEST_TIMEOUT_DEFAULT_SECONDS: float = 10.0
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 60.0
+    DB_STATEMENT_TIMEOUT_FROM_DEADLINE: bool = True
+
+    # Concurrent identical hot reads share one execution (@singleflight handlers)
+    SINGLEFLIGHT_ENABLED: bool = True
+
+    # Circuit breakers (PostgreSQL, Redis, Celery broker): open after N
+    # consecutive failures, half-open after the reset timeout
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS: float = 10.0
+
+    # Redis cache of upcoming appointments (one entry per days_ahead), refreshed
+    # early with XFetch (higher beta refreshes earlier) under a per-key lock
+    UPCOMING_APPOINTMENTS_CACHE_ENABLED: bool = True
+    UPCOMING_APPOINTMENTS_CACHE_TTL_SECONDS: float = 30.0
+    UPCOMING_APPOINTMENTS_CACHE_XFETCH_BETA: float = 1.0
+    UPCOMING_APPOINTMENTS_CACHE_LOCK_TIMEOUT_SECONDS: float = 5.0
+
+    # In-process caches (app/common/local_cache.py), evicted across pods with
+    # LISTEN/NOTIFY on CACHE_INVALIDATION_CHANNEL. They only serve while the
+    # worker's listener is connected; the TTL bounds staleness otherwise.
+    # Entries are only filled from primary reads, so with read replicas the
+    # appointment cache mostly serves deployments without them
+    CACHE_INVALIDATION_LISTENER_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "cache_invalidation"
+    CACHE_INVALIDATION_RECONNECT_SECONDS: float = 5.0
+    CACHE_INVALIDATION_KEEPALIVE_SECONDS: float = 15.0
+    APPOINTMENT_LOCAL_CACHE_ENABLED: bool = False
+    APPOINTMENT_LOCAL_CACHE_TTL_SECONDS: float = 30.0
+    APPOINTMENT_LOCAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # Patient/doctor history endpoints: cursor pages are capped at
+    # HISTORY_PAGE_SIZE_MAX rows; NDJSON streams read HISTORY_STREAM_BATCH_SIZE
+    # rows at a time and stop after HISTORY_STREAM_MAX_ROWS
+    HISTORY_PAGE_SIZE_DEFAULT: int = 50
+    HISTORY_PAGE_SIZE_MAX: int = 500
+    HISTORY_STREAM_BATCH_SIZE: int = 500
+    HISTORY_STREAM_MAX_ROWS: int = 50000
+    HISTORY_STREAM_TIMEOUT_SECONDS: float = 60.0
+
+    # Doctor/patient history by doctors.id / patients.id instead of name/email.
+    # Rows backfill_appointment_foreign_keys has not reached yet (NULL ids)
+    # still match by name/email; it runs in batches of FK_BACKFILL_BATCH_SIZE
+    # rows with a pause between them
+    APPOINTMENT_FK_LOOKUPS_ENABLED: bool = True
+    FK_BACKFILL_BATCH_SIZE: int = 1000
+    FK_BACKFILL_PAUSE_SECONDS: float = 0.5
+
+    # Recent-dates btree kept next to the optional appointment_date BRIN index
+    # (migration d7e2f4a9c3b6); roll_recent_appointment_date_index rebuilds it
+    # to cover the last APPOINTMENT_DATE_RECENT_INDEX_DAYS days
+    APPOINTMENT_DATE_RECENT_INDEX_DAYS: int = 30
+
+    # ListAppointmentsQuery reads the appointment_listings read model (kept in
+    # sync by the commands) instead of appointments. Enable only after
+    # rebuild_appointment_listings has completed (see migration e3b8c1f5a2d9)
+    APPOINTMENT_LISTING_READ_MODEL_ENABLED: bool = False
+    LISTING_REBUILD_BATCH_SIZE: int = 1000
+    LISTING_REBUILD_PAUSE_SECONDS: float = 0.5
+
+    # Gunicorn server (gunicorn.conf.py); workers are recycled after
+    # MAX_REQUESTS plus a random jitter so they do not restart together
+    GUNICORN_BIND: str = "0.0.0.0:8000"
+    GUNICORN_WORKERS: int = 2
+    GUNICORN_MAX_REQUESTS: int = 10000
+    GUNICORN_MAX_REQUESTS_JITTER: int = 1000
+    GUNICORN_TIMEOUT: int = 30
+    GUNICORN_GRACEFUL_TIMEOUT: int = 30
+    GUNICORN_KEEPALIVE: int = 5
 
     class Config:
         env_file = ".env"
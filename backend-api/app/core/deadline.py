@@ -0,0 +1,220 @@
+"""
+Per-request Deadlines
+
+Every HTTP request gets a deadline: the client's ``X-Request-Timeout-Ms``
+header when present, otherwise REQUEST_TIMEOUT_DEFAULT_SECONDS (a route can
+set its own default with the ``route_timeout`` dependency), capped at
+REQUEST_TIMEOUT_MAX_SECONDS. The deadline lives in a contextvar and bounds
+the work done for the request:
+
+- the request task is cancelled when the deadline passes and the client
+  gets 504 (unless the response has already started);
+- each PostgreSQL transaction begins with ``SET LOCAL statement_timeout``
+  set to the remaining time, so the server aborts a slow query and the pool
+  connection is released instead of being held by abandoned work;
+- Redis calls wrapped with ``redis_timeout()`` wait at most the remaining
+  time (and never longer than REDIS_SOCKET_TIMEOUT).
+
+DeadlineMiddleware is a plain ASGI middleware: the endpoint runs in the
+middleware's task, so cancelling it at the deadline cancels the endpoint.
+"""
+import asyncio
+import contextvars
+import logging
+import math
+from typing import Callable, Optional
+
+from prometheus_client import Counter
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.exceptions import GatewayTimeoutException
+from app.common.exceptions.handlers import app_exception_handler
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TIMEOUT_HEADER = "X-Request-Timeout-Ms"
+_TIMEOUT_HEADER_KEY = TIMEOUT_HEADER.lower().encode()
+
+# SQLSTATE query_canceled: raised by PostgreSQL when statement_timeout fires
+_QUERY_CANCELED = "57014"
+
+DEADLINE_EXCEEDED = Counter(
+    "http_request_deadline_exceeded_total",
+    "Requests cancelled because their deadline passed",
+    ["source"],
+)
+
+
+class Deadline:
+    """Absolute expiry of the current request, in event loop time."""
+
+    def __init__(self, timeout: float, client_timeout: Optional[float] = None) -> None:
+        self.started_at = asyncio.get_running_loop().time()
+        self.client_timeout = client_timeout
+        self.timeout = timeout if client_timeout is None else min(timeout, client_timeout)
+        self._scope: Optional[asyncio.Timeout] = None
+
+    @property
+    def expires_at(self) -> float:
+        return self.started_at + self.timeout
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (negative once it has passed)."""
+        return self.expires_at - asyncio.get_running_loop().time()
+
+    def set_timeout(self, timeout: float) -> None:
+        """Replace the default timeout; a shorter client timeout still wins."""
+        if self.client_timeout is not None:
+            timeout = min(timeout, self.client_timeout)
+        self.timeout = min(timeout, settings.REQUEST_TIMEOUT_MAX_SECONDS)
+        if self._scope is not None:
+            self._scope.reschedule(self.expires_at)
+
+
+_current_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Return the deadline of the current request, or None outside a request."""
+    return _current_deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, or None when there is no deadline."""
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+
+def redis_timeout() -> float:
+    """Timeout for one Redis call: REDIS_SOCKET_TIMEOUT bounded by the request deadline."""
+    left = remaining()
+    if left is None:
+        return settings.REDIS_SOCKET_TIMEOUT
+    return max(0.0, min(settings.REDIS_SOCKET_TIMEOUT, left))
+
+
+def route_timeout(seconds: float) -> Callable:
+    """
+    Build a FastAPI dependency that sets a route-specific default timeout.
+
+    The timeout is also recorded as ``request.state.route_timeout`` so outer
+    middleware can tell long-running routes apart (see ConcurrencyLimitMiddleware).
+
+    Usage:
+        @router.get("/export", dependencies=[Depends(route_timeout(30))])
+    """
+
+    async def dependency(request: Request) -> None:
+        request.state.route_timeout = seconds
+        deadline = _current_deadline.get()
+        if deadline is not None:
+            deadline.set_timeout(seconds)
+
+    return dependency
+
+
+def _client_timeout(scope: Scope) -> Optional[float]:
+    for key, value in scope["headers"]:
+        if key == _TIMEOUT_HEADER_KEY:
+            try:
+                milliseconds = float(value)
+            except ValueError:
+                return None
+            if math.isfinite(milliseconds) and milliseconds > 0:
+                return milliseconds / 1000
+            return None
+    return None
+
+
+def _is_statement_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    for error in (orig, getattr(orig, "__cause__", None)):
+        if getattr(error, "sqlstate", None) == _QUERY_CANCELED:
+            return True
+    return False
+
+
+def _apply_statement_timeout(session: Session, transaction, connection) -> None:
+    """Begin each PostgreSQL transaction with the request's remaining time."""
+    deadline = _current_deadline.get()
+    if deadline is None or connection.dialect.name != "postgresql":
+        return
+    left = deadline.remaining()
+    if left <= 0:
+        DEADLINE_EXCEEDED.labels(source="database").inc()
+        raise GatewayTimeoutException(detail="Request deadline exceeded")
+    # SET does not take bind parameters; the value is always an integer
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
+def enable_statement_timeouts() -> None:
+    """Register the statement-timeout listener for all ORM sessions (idempotent)."""
+    if not event.contains(Session, "after_begin", _apply_statement_timeout):
+        event.listen(Session, "after_begin", _apply_statement_timeout)
+
+
+def disable_statement_timeouts() -> None:
+    if event.contains(Session, "after_begin", _apply_statement_timeout):
+        event.remove(Session, "after_begin", _apply_statement_timeout)
+
+
+class DeadlineMiddleware:
+    """Attach a deadline to each HTTP request and answer 504 when it passes."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(
+            min(settings.REQUEST_TIMEOUT_DEFAULT_SECONDS, settings.REQUEST_TIMEOUT_MAX_SECONDS),
+            _client_timeout(scope),
+        )
+        token = _current_deadline.set(deadline)
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        source = None
+        try:
+            async with asyncio.timeout_at(deadline.expires_at) as timeout_scope:
+                deadline._scope = timeout_scope
+                await self.app(scope, receive, send_wrapper)
+        except TimeoutError:
+            if not timeout_scope.expired() or response_started:
+                raise
+            source = "request"
+        except DBAPIError as exc:
+            if not _is_statement_timeout(exc) or response_started:
+                raise
+            source = "database"
+        finally:
+            _current_deadline.reset(token)
+
+        if source is None:
+            return
+        DEADLINE_EXCEEDED.labels(source=source).inc()
+        logger.warning(
+            "Request deadline exceeded: path=%s timeout_ms=%.0f source=%s",
+            scope["path"],
+            deadline.timeout * 1000,
+            source,
+        )
+        response = await app_exception_handler(
+            Request(scope), GatewayTimeoutException(detail="Request deadline exceeded")
+        )
+        await response(scope, receive, send)
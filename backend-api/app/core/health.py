@@ -0,0 +1,182 @@
+"""
+Dependency Health Checker
+
+Refreshes PostgreSQL and Redis status on a fixed interval in a background task
+so the readiness endpoint only reads cached state. Kubelet probes never open
+database connections themselves, so a slow dependency cannot make probes pile
+up and drain the connection pool.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from prometheus_client import Gauge, Histogram
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.common.database.pool import pool_status
+from app.common.database.session import engine, read_engines
+from app.common.redis.client import get_redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DependencyCheck = Callable[[], Awaitable[None]]
+
+CHECK_DURATION = Histogram(
+    "readiness_check_duration_seconds",
+    "Latency of background readiness dependency checks",
+    ["dependency"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+CHECK_UP = Gauge(
+    "readiness_check_up",
+    "1 if the last background check of the dependency succeeded, 0 otherwise",
+    ["dependency"],
+    multiprocess_mode="livemin",
+)
+
+
+def database_check(target: AsyncEngine) -> DependencyCheck:
+    """Build a check that runs SELECT 1 on a pooled connection of ``target``."""
+
+    async def check() -> None:
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    return check
+
+
+def default_checks() -> dict[str, DependencyCheck]:
+    """Primary database, every read replica and Redis."""
+    checks = {"database": database_check(engine)}
+    for index, read_engine in enumerate(read_engines):
+        checks[f"database_replica_{index}"] = database_check(read_engine)
+    checks["redis"] = check_redis
+    return checks
+
+
+async def check_redis() -> None:
+    """PING Redis through the shared client."""
+    await get_redis_client().ping()
+
+
+def primary_pool_status() -> dict[str, Any]:
+    """Return saturation of the primary engine's connection pool."""
+    return pool_status(engine)
+
+
+class DependencyHealthChecker:
+    """
+    Background checker that caches dependency status for the readiness probe.
+
+    Each refresh runs all checks concurrently with a per-check timeout and
+    records their latency. ``snapshot()`` is a pure in-memory read.
+    """
+
+    def __init__(
+        self,
+        checks: Optional[dict[str, DependencyCheck]] = None,
+        interval: float = settings.READINESS_CHECK_INTERVAL_SECONDS,
+        timeout: float = settings.READINESS_CHECK_TIMEOUT_SECONDS,
+        max_staleness: float = settings.READINESS_MAX_STALENESS_SECONDS,
+        saturation_threshold: float = settings.READINESS_POOL_SATURATION_THRESHOLD,
+        pool_status_fn: Callable[[], dict[str, Any]] = primary_pool_status,
+    ) -> None:
+        self.checks = checks if checks is not None else default_checks()
+        self.interval = interval
+        self.timeout = timeout
+        self.max_staleness = max_staleness
+        self.saturation_threshold = saturation_threshold
+        self._pool_status_fn = pool_status_fn
+        self._status: dict[str, str] = {name: "pending" for name in self.checks}
+        self._latency_ms: dict[str, float] = {}
+        self._last_refresh: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run_check(self, name: str, check: DependencyCheck) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), timeout=self.timeout)
+            status = "ok"
+        except Exception as exc:
+            status = "failed"
+            # Only log transitions; a dead dependency would otherwise log every interval
+            if self._status.get(name) != "failed":
+                logger.error("Readiness check failed: dependency=%s error=%s", name, exc)
+        elapsed = time.perf_counter() - start
+
+        if status == "ok" and self._status.get(name) == "failed":
+            logger.info("Readiness check recovered: dependency=%s", name)
+
+        CHECK_DURATION.labels(dependency=name).observe(elapsed)
+        CHECK_UP.labels(dependency=name).set(1 if status == "ok" else 0)
+        self._status[name] = status
+        self._latency_ms[name] = round(elapsed * 1000, 2)
+
+    async def refresh(self) -> None:
+        """Run every dependency check once and update the cached state."""
+        await asyncio.gather(
+            *(self._run_check(name, check) for name, check in self.checks.items())
+        )
+        self._last_refresh = time.monotonic()
+
+    async def _run_forever(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_forever(), name="readiness-checker")
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def set_status(self, name: str, status: str) -> None:
+        """Set the status of a check driven from outside the refresh loop (e.g. warm-up)."""
+        self._status[name] = status
+
+    def snapshot(self) -> tuple[bool, dict[str, Any]]:
+        """
+        Return ``(ready, body)`` from cached state without any I/O.
+
+        Not ready when any check is pending or failed, when the cached results
+        are older than ``max_staleness`` (checker stuck), or when the
+        connection pool is saturated.
+        """
+        checks = dict(self._status)
+
+        if self._last_refresh is None:
+            age = None
+        else:
+            age = time.monotonic() - self._last_refresh
+            if age > self.max_staleness:
+                checks = {name: "stale" for name in checks}
+
+        pool = self._pool_status_fn()
+        checks["pool"] = (
+            "saturated" if pool["saturation"] >= self.saturation_threshold else "ok"
+        )
+
+        ready = all(v == "ok" for v in checks.values())
+        body = {
+            "status": "ready" if ready else "not_ready",
+            "checks": checks,
+            "latency_ms": dict(self._latency_ms),
+            "pool": pool,
+            "checked_seconds_ago": round(age, 3) if age is not None else None,
+        }
+        return ready, body
+
+
+# Process-wide checker used by the /ready endpoint
+health_checker = DependencyHealthChecker()
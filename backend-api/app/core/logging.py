@@ -1,50 +1,187 @@
-"""Structured JSON logging configuration with correlation IDs."""
+"""
+Structured JSON logging configuration with correlation IDs.
+
+Correlation IDs are attached by a LogRecord factory when the record is
+created. Records are handed to a bounded in-memory queue by a non-blocking
+``QueueHandler``; a ``QueueListener`` thread serializes them with orjson and
+writes to stdout, so the event loop thread never formats JSON or blocks on
+I/O. When the queue is full (stdout slower than log volume) records are
+dropped and counted in ``log_records_dropped_total`` instead of stalling
+requests.
+"""
+import atexit
+import copy
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
+
+import orjson
+from prometheus_client import Counter
+
+from app.core.middleware import get_correlation_id
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+    ["level"],
+)
 
-from pythonjsonlogger import jsonlogger
+# LogRecord attributes that are not user-supplied ``extra`` fields
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "correlation_id",
+}
 
+_listener: Optional[QueueListener] = None
+_config: Optional[tuple[str, int]] = None
 
-class CorrelationLogFilter(logging.Filter):
-    """Add correlation ID to all log records."""
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        from app.core.middleware import get_correlation_id
+def _install_correlation_record_factory() -> None:
+    """
+    Stamp every LogRecord with the current correlation ID at creation time.
 
+    Runs in the caller's context, once per record, for all loggers and handlers;
+    idempotent so repeated setup_logging() calls do not stack factories.
+    """
+    current = logging.getLogRecordFactory()
+    if getattr(current, "_adds_correlation_id", False):
+        return
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = current(*args, **kwargs)
         record.correlation_id = get_correlation_id()
-        return True
+        return record
+
+    factory._adds_correlation_id = True  # type: ignore[attr-defined]
+    logging.setLogRecordFactory(factory)
+
 
+class CustomJsonFormatter(logging.Formatter):
+    """JSON formatter with standard fields, serialized with orjson."""
 
-class CustomJsonFormatter(jsonlogger.JsonFormatter):
-    """Custom JSON formatter with standard fields."""
+    def __init__(self) -> None:
+        super().__init__()
+        # (second, "YYYY-mm-dd HH:MM:SS") of the last formatted record
+        self._time_cache: tuple[int, str] = (-1, "")
 
-    def add_fields(
-        self, log_record: dict, record: logging.LogRecord, message_dict: dict
-    ) -> None:
-        super().add_fields(log_record, record, message_dict)
-        log_record["level"] = record.levelname
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Same output as logging.Formatter.formatTime, strftime only once per second."""
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime(self.default_time_format, self.converter(record.created))
+            self._time_cache = (second, prefix)
+        return self.default_msec_format % (prefix, record.msecs)
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "name": record.name,
+            "correlation_id": getattr(record, "correlation_id", None),
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                log_record[key] = value
+        if record.exc_info:
+            log_record["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_record["exc_info"] = record.exc_text
+        if record.stack_info:
+            log_record["stack_info"] = self.formatStack(record.stack_info)
         log_record["logger"] = record.name
-        log_record["timestamp"] = self.formatTime(record)
-        if hasattr(record, "correlation_id"):
-            log_record["correlation_id"] = record.correlation_id
+        return orjson.dumps(log_record, default=str).decode()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Only the cheap, context-dependent work happens on the calling thread
+    (message interpolation, traceback rendering); JSON formatting is left to
+    the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.labels(level=record.levelname).inc()
 
-def setup_logging(log_level: str = "INFO") -> None:
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose stop() waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def setup_logging(log_level: str = "INFO", queue_size: int = 10_000) -> None:
     """Configure structured JSON logging for the application."""
+    global _listener, _config
+    stop_logging()
+    _config = (log_level, queue_size)
+
     handler = logging.StreamHandler(sys.stdout)
-    formatter = CustomJsonFormatter(
-        fmt="%(timestamp)s %(level)s %(name)s %(correlation_id)s %(message)s"
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(CustomJsonFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    _install_correlation_record_factory()
 
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
-    root_logger.addHandler(handler)
+    root_logger.addHandler(queue_handler)
     root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
-    # Add correlation filter
-    root_logger.addFilter(CorrelationLogFilter())
+    _listener = DrainingQueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
 
     # Reduce noise from third-party loggers
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def restart_logging_after_fork() -> None:
+    """
+    Re-create the queue and listener in a forked child process.
+
+    Only the forking thread survives fork(), so the inherited listener is dead
+    and its queue may have been locked mid-operation; both are abandoned
+    without stop() and replaced.
+    """
+    global _listener
+    if _listener is None or _config is None:
+        return
+    _listener = None
+    setup_logging(*_config)
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,73 @@
+"""
+Prometheus Metrics Exposure
+
+Supports prometheus_client multiprocess mode for multi-worker deployments.
+When PROMETHEUS_MULTIPROC_DIR is set in the environment *before* Python starts,
+every worker writes its metrics to mmap-backed files in that directory and
+/metrics aggregates all workers, so a scrape no longer sees whichever worker
+happened to accept the connection.
+
+Lifecycle:
+- the process manager empties the directory before workers start
+  (``prepare_multiprocess_dir``), otherwise counters from a previous run leak in;
+- each worker calls ``mark_worker_dead`` on exit so its live gauges are dropped.
+"""
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+from fastapi import FastAPI
+from prometheus_client import multiprocess
+from prometheus_fastapi_instrumentator import Instrumentator
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_ENV_VAR = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Return the multiprocess metrics directory, or None in single-process mode."""
+    return os.environ.get(MULTIPROC_ENV_VAR)
+
+
+def prepare_multiprocess_dir(path: Optional[str] = None) -> None:
+    """
+    Create the multiprocess directory and delete stale metric files.
+
+    Must run once in the parent process before any worker starts; running it
+    from a worker would wipe the live files of its siblings.
+    """
+    target = path or multiprocess_dir()
+    if not target:
+        return
+    directory = Path(target)
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.db"):
+        stale.unlink()
+
+
+def mark_worker_dead(pid: Optional[int] = None) -> None:
+    """Remove live-gauge files of a worker that is exiting (or has exited)."""
+    target = multiprocess_dir()
+    if not target:
+        return
+    multiprocess.mark_process_dead(pid or os.getpid(), target)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Instrument HTTP requests and expose /metrics (aggregated across workers if enabled)."""
+    target = multiprocess_dir()
+    if target:
+        # Creating (never wiping) is safe from any worker, e.g. under --reload
+        os.makedirs(target, exist_ok=True)
+        logger.info("Prometheus multiprocess mode enabled: dir=%s", target)
+
+    Instrumentator().instrument(app).expose(app)
+
+
+if __name__ == "__main__":
+    # Used by the container entrypoint: python -m app.core.metrics prepare
+    if sys.argv[1:] == ["prepare"]:
+        prepare_multiprocess_dir()
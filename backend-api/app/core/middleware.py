@@ -26,9 +26,7 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next) -> Response:
         # Use X-Correlation-ID header if provided, otherwise generate one
-        correlation_id = request.headers.get(
-            "X-Correlation-ID", str(uuid.uuid4())
-        )
+        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
         _correlation_id.set(correlation_id)
 
         start_time = time.time()
@@ -38,7 +36,6 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
             extra={
                 "method": request.method,
                 "path": str(request.url.path),
-                "correlation_id": correlation_id,
             },
         )
 
@@ -53,7 +50,6 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
                 "path": str(request.url.path),
                 "status_code": response.status_code,
                 "duration_ms": round(duration_ms, 2),
-                "correlation_id": correlation_id,
             },
         )
 
@@ -0,0 +1,237 @@
+"""
+On-Demand CPU Profiling
+
+Pure-Python sampling profiler for live workers: a background thread reads
+``sys._current_frames()`` every few milliseconds and counts stacks in the
+folded format (``frame;frame;frame count``) consumed by flamegraph.pl,
+speedscope and inferno.
+
+Two entry points, both only mounted when PROFILING_ENABLED is set and only
+usable by active users listed in PROFILING_ALLOWED_EMAILS:
+- ``GET /admin/profile?seconds=N``: samples the worker for N seconds;
+- ``X-Profile: 1`` header on any request: the response body is replaced by the
+  profile of that request. The event loop is shared, so concurrent requests
+  on the same worker appear in the profile as well.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.common.dependencies.auth import get_current_user
+from app.common.dependencies.database import get_read_session_factory
+from app.common.exceptions import AppException, ConflictException, ForbiddenException
+from app.core.config import settings
+from app.core.deadline import route_timeout
+from app.features.auth.models.user import User
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+
+# One session per worker: overlapping samplers would double the overhead
+_session_lock = threading.Lock()
+
+# Headroom between the sampling time and the route's request deadline
+_TIMEOUT_MARGIN_SECONDS = 5.0
+_MIN_PROFILE_SECONDS = 1.0
+
+
+def _profile_max_seconds() -> float:
+    """Longest profile that fits the deadline (route_timeout caps at REQUEST_TIMEOUT_MAX_SECONDS)."""
+    longest = min(
+        settings.PROFILING_MAX_SECONDS,
+        settings.REQUEST_TIMEOUT_MAX_SECONDS - _TIMEOUT_MARGIN_SECONDS,
+    )
+    if longest < _MIN_PROFILE_SECONDS:
+        logger.warning(
+            "Profiles limited to %.0fs: PROFILING_MAX_SECONDS=%s and "
+            "REQUEST_TIMEOUT_MAX_SECONDS=%s leave less than %.0fs after the %.0fs "
+            "deadline margin; longer profiles may hit the request deadline",
+            _MIN_PROFILE_SECONDS,
+            settings.PROFILING_MAX_SECONDS,
+            settings.REQUEST_TIMEOUT_MAX_SECONDS,
+            _MIN_PROFILE_SECONDS,
+            _TIMEOUT_MARGIN_SECONDS,
+        )
+        return _MIN_PROFILE_SECONDS
+    return longest
+
+
+PROFILE_MAX_SECONDS = _profile_max_seconds()
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    Samples thread stacks at a fixed interval from a daemon thread.
+
+    Args:
+        interval: Seconds between samples.
+        thread_ids: Threads to sample; None samples every thread except the sampler.
+    """
+
+    def __init__(self, interval: float, thread_ids: Optional[set[int]] = None) -> None:
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or (self.thread_ids and thread_id not in self.thread_ids):
+                continue
+            stack = []
+            current: Optional[FrameType] = frame
+            while current is not None:
+                stack.append(_frame_label(current))
+                current = current.f_back
+            if self.thread_ids is None:
+                stack.append(f"thread:{names.get(thread_id, thread_id)}")
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        """Return collected stacks in folded format, hottest first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+@contextmanager
+def profiling_session(interval: float, thread_ids: Optional[set[int]] = None) -> Iterator[SamplingProfiler]:
+    """
+    Run a SamplingProfiler for the duration of the block.
+
+    Raises:
+        ConflictException: If another session is already running in this worker.
+    """
+    if not _session_lock.acquire(blocking=False):
+        raise ConflictException(
+            message="Profiling session already running",
+            detail="Only one profiling session per worker is allowed at a time",
+        )
+    profiler = SamplingProfiler(interval, thread_ids)
+    start = time.perf_counter()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _session_lock.release()
+        logger.info(
+            "Profiling session finished",
+            extra={"duration_s": round(time.perf_counter() - start, 3), "samples": profiler.samples},
+        )
+
+
+def _is_allowed(email: str) -> bool:
+    return email in settings.PROFILING_ALLOWED_EMAILS
+
+
+async def require_profiling_access(current_user: User = Depends(get_current_user)) -> User:
+    """Allow only users listed in PROFILING_ALLOWED_EMAILS."""
+    if not _is_allowed(current_user.email):
+        raise ForbiddenException(detail="Profiling is restricted to administrators")
+    return current_user
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    summary="Sample CPU Profile",
+    dependencies=[
+        Depends(require_profiling_access),
+        Depends(route_timeout(PROFILE_MAX_SECONDS + _TIMEOUT_MARGIN_SECONDS)),
+    ],
+)
+async def profile(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(settings.PROFILING_INTERVAL_MS, ge=1, le=1000),
+    all_threads: bool = Query(False, description="Include thread-pool threads"),
+) -> PlainTextResponse:
+    """
+    Sample this worker for ``seconds`` and return folded stacks.
+
+    Render with e.g. ``flamegraph.pl profile.folded > profile.svg`` or speedscope.
+    """
+    thread_ids = None if all_threads else {threading.get_ident()}
+    with profiling_session(interval_ms / 1000, thread_ids) as profiler:
+        await asyncio.sleep(seconds)
+    return PlainTextResponse(profiler.folded(), headers={"X-Profile-Samples": str(profiler.samples)})
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """Profile a single request when it carries ``X-Profile: 1`` from an allowed user."""
+
+    @staticmethod
+    async def _current_user(request: Request, token: str) -> User:
+        # Same checks as the routes: verified token, existing and active user
+        async with get_read_session_factory(request)() as db:
+            return await get_current_user(token, db)
+
+    async def _authorized(self, request: Request) -> bool:
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.lower().startswith("bearer "):
+            return False
+        try:
+            await require_profiling_access(await self._current_user(request, authorization[7:]))
+        except AppException:
+            return False
+        return True
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        if request.headers.get(PROFILE_HEADER) != "1" or not await self._authorized(request):
+            return await call_next(request)
+
+        try:
+            with profiling_session(
+                settings.PROFILING_INTERVAL_MS / 1000, {threading.get_ident()}
+            ) as profiler:
+                response = await call_next(request)
+                async for _ in response.body_iterator:
+                    pass
+        except ConflictException:
+            return await call_next(request)
+
+        return PlainTextResponse(
+            profiler.folded(),
+            headers={
+                "X-Profile-Samples": str(profiler.samples),
+                "X-Profiled-Status": str(response.status_code),
+            },
+        )
@@ -0,0 +1,248 @@
+"""
+Distributed Rate Limiting
+
+Token-bucket limiter backed by Redis so limits hold across uvicorn workers and
+pods. Each decision is a single EVALSHA of an atomic Lua script that refills,
+consumes and returns the bucket state using the Redis server clock.
+
+Clearly-under-limit clients skip Redis: after a round-trip the process knows
+how many tokens were left, and while that lease is fresh and more than
+RATE_LIMIT_FAST_PATH_RATIO of the bucket would remain, requests are admitted
+locally. Locally admitted requests are charged to Redis on the next round-trip,
+or when their lease is evicted from the local LRU. Every worker leases on its
+own, so limits smaller than 2 × RATE_LIMIT_WORKERS never take the fast path.
+"""
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from app.common.exceptions import TooManyRequestsException, UnauthorizedException
+from app.common.redis.client import get_redis_client
+from app.core.circuit_breaker import CircuitOpenException, redis_breaker
+from app.core.config import settings
+from app.core.deadline import redis_timeout
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = bucket key
+# ARGV = capacity, refill rate (tokens/ms), locally admitted debt, cost (0 settles debt only)
+# Returns {allowed, tokens_left, retry_after_ms}
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local debt = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = math.max(0, tokens - debt)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  retry_after = math.ceil((cost - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) + 1000)
+return {allowed, tostring(tokens), retry_after}
+"""
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_LIMIT_RE = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Bucket definition parsed from a limit string such as ``"5/minute"``."""
+
+    capacity: int
+    period_seconds: int
+
+    @property
+    def refill_per_ms(self) -> float:
+        return self.capacity / (self.period_seconds * 1000)
+
+    def __str__(self) -> str:
+        return f"{self.capacity} per {self.period_seconds} seconds"
+
+
+def parse_limit(limit: str) -> RateLimit:
+    """
+    Parse ``"N/unit"``, ``"N/M units"`` or ``"N per unit"`` into a RateLimit.
+
+    Raises:
+        ValueError: If the string is not a supported limit expression.
+    """
+    match = _LIMIT_RE.match(limit.lower())
+    if not match:
+        raise ValueError(f"Invalid rate limit: {limit!r}")
+    amount, multiplier, unit = match.groups()
+    return RateLimit(
+        capacity=int(amount),
+        period_seconds=int(multiplier or 1) * _PERIODS[unit],
+    )
+
+
+@dataclass
+class _Lease:
+    """Last known bucket state for a key plus requests admitted locally since."""
+
+    limit: RateLimit
+    tokens: float
+    fetched_at: float
+    debt: int = 0
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    retry_after_seconds: int = 0
+
+
+class RedisRateLimiter:
+    """Token-bucket rate limiter shared across processes through Redis."""
+
+    def __init__(
+        self,
+        redis_factory: Callable[[], Any] = get_redis_client,
+        fast_path_ratio: float = settings.RATE_LIMIT_FAST_PATH_RATIO,
+        lease_seconds: float = settings.RATE_LIMIT_LOCAL_LEASE_SECONDS,
+        max_local_keys: int = 10_000,
+        workers: int = settings.RATE_LIMIT_WORKERS,
+    ) -> None:
+        self._redis_factory = redis_factory
+        self._script: Optional[Any] = None
+        self._script_client: Optional[Any] = None
+        self.fast_path_ratio = fast_path_ratio
+        self.lease_seconds = lease_seconds
+        self.max_local_keys = max_local_keys
+        self.workers = workers
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+
+    async def _eval(
+        self, key: str, limit: RateLimit, debt: int, cost: int = 1
+    ) -> tuple[bool, float, int]:
+        """Run the token bucket script; returns (allowed, tokens_left, retry_after_ms)."""
+        client = self._redis_factory()
+        if self._script is None or self._script_client is not client:
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        async with redis_breaker:
+            allowed, tokens, retry_after_ms = await asyncio.wait_for(
+                self._script(keys=[key], args=[limit.capacity, limit.refill_per_ms, debt, cost]),
+                timeout=redis_timeout(),
+            )
+        return bool(int(allowed)), float(tokens), int(retry_after_ms)
+
+    def _try_fast_path(self, key: str, limit: RateLimit) -> bool:
+        if limit.capacity < 2 * self.workers:
+            return False
+        lease = self._leases.get(key)
+        if lease is None or time.monotonic() - lease.fetched_at > self.lease_seconds:
+            return False
+        if lease.tokens - lease.debt - 1 < limit.capacity * self.fast_path_ratio:
+            return False
+        lease.debt += 1
+        return True
+
+    def _store_lease(self, key: str, limit: RateLimit, tokens: float) -> list[tuple[str, _Lease]]:
+        """Store the lease for ``key``; returns evicted leases that still owe debt."""
+        self._leases[key] = _Lease(limit=limit, tokens=tokens, fetched_at=time.monotonic())
+        self._leases.move_to_end(key)
+        evicted = []
+        while len(self._leases) > self.max_local_keys:
+            evicted_key, lease = self._leases.popitem(last=False)
+            if lease.debt:
+                evicted.append((evicted_key, lease))
+        return evicted
+
+    async def _settle(self, evicted: list[tuple[str, _Lease]]) -> None:
+        """Charge the locally admitted requests of evicted leases to Redis."""
+        for key, lease in evicted:
+            try:
+                await self._eval(key, lease.limit, lease.debt, cost=0)
+            except (RedisError, OSError, CircuitOpenException) as exc:
+                logger.warning("Could not settle rate limit debt for %s: %s", key, exc)
+
+    async def hit(self, key: str, limit: RateLimit) -> Decision:
+        """Consume one token for ``key``. Fails open when Redis is unavailable."""
+        if self._try_fast_path(key, limit):
+            return Decision(allowed=True)
+
+        lease = self._leases.pop(key, None)
+        debt = lease.debt if lease is not None else 0
+        try:
+            allowed, tokens, retry_after_ms = await self._eval(key, limit, debt)
+        except (RedisError, OSError) as exc:
+            logger.warning("Rate limiter unavailable, allowing request: %s", exc)
+            return Decision(allowed=True)
+        except CircuitOpenException:
+            # Redis known to be down: skip it without logging every request
+            return Decision(allowed=True)
+
+        evicted = self._store_lease(key, limit, tokens)
+        if evicted:
+            await self._settle(evicted)
+        if allowed:
+            return Decision(allowed=True)
+        return Decision(allowed=False, retry_after_seconds=max(1, -(-retry_after_ms // 1000)))
+
+
+def client_identity(request: Request) -> str:
+    """Key requests by authenticated user when a valid bearer token is present, else by IP."""
+    authorization = request.headers.get("Authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            return f"user:{verify_token(authorization[7:])['sub']}"
+        except UnauthorizedException:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+# Process-wide limiter shared by every route
+limiter = RedisRateLimiter()
+
+
+def rate_limit(limit: str, scope: str) -> Callable:
+    """
+    Build a FastAPI dependency enforcing ``limit`` per client for ``scope``.
+
+    Usage:
+        @router.post("/login", dependencies=[Depends(rate_limit("5/minute", "auth:login"))])
+    """
+    parsed = parse_limit(limit)
+
+    async def dependency(request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        key = f"ratelimit:{scope}:{client_identity(request)}"
+        decision = await limiter.hit(key, parsed)
+        if not decision.allowed:
+            raise TooManyRequestsException(
+                detail=f"Limit of {parsed} exceeded",
+                retry_after=decision.retry_after_seconds,
+            )
+
+    return dependency
@@ -0,0 +1,32 @@
+"""
+Pre-fork Server Support
+
+With gunicorn ``preload_app`` the application is imported once in the master
+and workers are forked from it, sharing imported modules copy-on-write.
+Anything that owns sockets or threads was created in the master and has to be
+replaced in each worker before it serves requests; see gunicorn.conf.py.
+"""
+import logging
+
+from app.common.database.session import dispose_engines_after_fork
+from app.common.redis.client import reset_redis_client_after_fork
+from app.core.logging import restart_logging_after_fork
+
+logger = logging.getLogger(__name__)
+
+
+def reinitialize_after_fork() -> None:
+    """
+    Reset process-local resources inherited from the master.
+
+    - logging: the QueueListener thread did not survive fork;
+    - database engines: pools are emptied so no connection is shared;
+    - Redis: the shared client is dropped and re-created on first use.
+
+    The tracing BatchSpanProcessor restarts its own thread after fork, and
+    prometheus_client multiprocess values switch files when the pid changes.
+    """
+    restart_logging_after_fork()
+    dispose_engines_after_fork()
+    reset_redis_client_after_fork()
+    logger.info("Worker resources re-initialized after fork")
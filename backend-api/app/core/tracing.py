@@ -3,27 +3,52 @@ OpenTelemetry Distributed Tracing Configuration
 
 Configures TracerProvider with OTLP exporter for Jaeger integration.
 Instruments FastAPI, SQLAlchemy, and Redis for end-to-end tracing.
+
+Sampling (OTEL_SAMPLER) is parent-based so a trace is kept or dropped as a
+whole; root spans are sampled by trace-id ratio or by a per-process rate
+limit. Unsampled spans are non-recording, so they are never queued for export.
+
+The OTLP gRPC exporter and the instrumentation packages are imported when
+first needed rather than with this module: grpc is loaded by the batch
+processor's export thread on the first export, off the event loop and after
+a pre-forking server has forked its workers.
 """
 import logging
-from typing import Optional
+import threading
+import time
+import weakref
+from typing import Any, Optional, Sequence, Union
 
 from fastapi import FastAPI
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.redis import RedisInstrumentor
-from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.context import Context
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.semconv.trace import SpanAttributes
+from opentelemetry.trace import Link, SpanKind, Status, StatusCode, TraceState
+from opentelemetry.util.types import Attributes
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from app.common.database.pool import CHECKOUT_WAIT_INFO_KEY
+from app.common.instrumentation import fingerprint_statement
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 # Module-level flag to prevent double instrumentation
 _tracing_initialized: bool = False
+_instrumented_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
 
 
 def _build_resource() -> Resource:
@@ -37,17 +62,124 @@ def _build_resource() -> Resource:
     )
 
 
-def _create_tracer_provider() -> TracerProvider:
-    """Create and configure the TracerProvider with OTLP exporter."""
-    resource = _build_resource()
-    provider = TracerProvider(resource=resource)
+class RateLimitedSampler(Sampler):
+    """
+    Sample at most ``max_per_second`` root traces per process.
+
+    Token bucket with a one-second burst; anything above the rate is dropped
+    regardless of traffic volume, which bounds exporter cost under load.
+    """
+
+    def __init__(self, max_per_second: float) -> None:
+        self.max_per_second = max_per_second
+        self._tokens = max_per_second
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.max_per_second,
+                self._tokens + (now - self._last) * self.max_per_second,
+            )
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[TraceState] = None,
+    ) -> SamplingResult:
+        parent_state = trace.get_current_span(parent_context).get_span_context().trace_state
+        if self._acquire():
+            return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes, parent_state)
+        return SamplingResult(Decision.DROP, None, parent_state)
+
+    def get_description(self) -> str:
+        return f"RateLimitedSampler{{{self.max_per_second}}}"
+
+
+def _build_sampler() -> Sampler:
+    """
+    Build the sampler selected by OTEL_SAMPLER.
+
+    - ``always_on``: every span (previous behaviour)
+    - ``parentbased_traceidratio``: OTEL_SAMPLER_RATIO of root traces
+    - ``parentbased_ratelimited``: at most OTEL_SAMPLER_MAX_TRACES_PER_SECOND root traces
+
+    Raises:
+        ValueError: If OTEL_SAMPLER is not one of the above.
+    """
+    name = settings.OTEL_SAMPLER.lower()
+    if name == "always_on":
+        return ALWAYS_ON
+    if name == "parentbased_traceidratio":
+        return ParentBased(root=TraceIdRatioBased(settings.OTEL_SAMPLER_RATIO))
+    if name == "parentbased_ratelimited":
+        return ParentBased(root=RateLimitedSampler(settings.OTEL_SAMPLER_MAX_TRACES_PER_SECOND))
+    raise ValueError(f"Unsupported OTEL_SAMPLER: {settings.OTEL_SAMPLER!r}")
+
 
-    otlp_exporter = OTLPSpanExporter(
-        endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
-        insecure=True,
+def _create_span_processor(exporter: SpanExporter) -> BatchSpanProcessor:
+    """Batch processor with queue/export sizes from settings."""
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=settings.OTEL_BSP_MAX_QUEUE_SIZE,
+        schedule_delay_millis=settings.OTEL_BSP_SCHEDULE_DELAY_MILLIS,
+        max_export_batch_size=settings.OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        export_timeout_millis=settings.OTEL_BSP_EXPORT_TIMEOUT_MILLIS,
     )
-    span_processor = BatchSpanProcessor(otlp_exporter)
-    provider.add_span_processor(span_processor)
+
+
+class LazyOTLPSpanExporter(SpanExporter):
+    """OTLP gRPC exporter that imports grpc and opens its channel on the first export."""
+
+    def __init__(self, endpoint: str) -> None:
+        self.endpoint = endpoint
+        self._exporter: Optional[SpanExporter] = None
+        self._lock = threading.Lock()
+
+    def _get_exporter(self) -> SpanExporter:
+        if self._exporter is None:
+            with self._lock:
+                if self._exporter is None:
+                    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                        OTLPSpanExporter,
+                    )
+
+                    self._exporter = OTLPSpanExporter(endpoint=self.endpoint, insecure=True)
+        return self._exporter
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        return self._get_exporter().export(spans)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        if self._exporter is None:
+            return True
+        return self._exporter.force_flush(timeout_millis)
+
+    def shutdown(self) -> None:
+        if self._exporter is not None:
+            self._exporter.shutdown()
+
+
+def _create_tracer_provider(exporter: Optional[SpanExporter] = None) -> TracerProvider:
+    """Create and configure the TracerProvider (OTLP exporter unless one is given)."""
+    resource = _build_resource()
+    provider = TracerProvider(resource=resource, sampler=_build_sampler())
+
+    if exporter is None:
+        exporter = LazyOTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)
+    provider.add_span_processor(_create_span_processor(exporter))
 
     return provider
 
@@ -73,33 +205,129 @@ def setup_tracing(app: FastAPI) -> None:
         logger.info("OpenTelemetry tracing is disabled (OTEL_TRACING_ENABLED=false)")
         return
 
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+
     provider = _create_tracer_provider()
     trace.set_tracer_provider(provider)
 
-    FastAPIInstrumentor.instrument_app(app)
+    FastAPIInstrumentor.instrument_app(app, excluded_urls=settings.OTEL_EXCLUDED_URLS)
 
     _tracing_initialized = True
     logger.info(
-        "OpenTelemetry tracing initialized: exporter=%s, service=%s",
+        "OpenTelemetry tracing initialized: exporter=%s, service=%s, sampler=%s",
         settings.OTEL_EXPORTER_OTLP_ENDPOINT,
         settings.OTEL_SERVICE_NAME,
+        provider.sampler.get_description(),
     )
 
 
-def instrument_sqlalchemy(engine: AsyncEngine) -> None:
+class _SqlSpanTracer:
     """
-    Instrument a SQLAlchemy async engine for distributed tracing.
+    One CLIENT span per cursor execution on an engine.
+
+    Spans carry operation and statement fingerprint; the full SQL text,
+    row counts and pool checkout wait are opt-in/opt-out via settings so
+    the per-statement cost stays low at high sample rates.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        tracer: trace.Tracer,
+        capture_statement: bool,
+        record_rows: bool,
+        record_pool_wait: bool,
+    ) -> None:
+        self.tracer = tracer
+        self.capture_statement = capture_statement
+        self.record_rows = record_rows
+        self.record_pool_wait = record_pool_wait
+        self.db_name = engine.url.database or ""
+        self.attributes: dict[str, Any] = {
+            SpanAttributes.DB_SYSTEM: engine.dialect.name,
+            "db.pool.name": engine.pool.logging_name or "default",
+        }
+        if engine.url.database:
+            self.attributes[SpanAttributes.DB_NAME] = engine.url.database
+        if engine.url.host:
+            self.attributes[SpanAttributes.NET_PEER_NAME] = engine.url.host
+        if engine.url.port:
+            self.attributes[SpanAttributes.NET_PEER_PORT] = engine.url.port
+
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        operation, fingerprint = fingerprint_statement(statement)
+        span = self.tracer.start_span(f"{operation} {self.db_name}".strip(), kind=SpanKind.CLIENT)
+        context._sql_span = span
+        wait = conn.info.pop(CHECKOUT_WAIT_INFO_KEY, None)
+        if not span.is_recording():
+            return
+
+        span.set_attributes(self.attributes)
+        span.set_attribute(SpanAttributes.DB_OPERATION, operation)
+        span.set_attribute("db.statement.fingerprint", fingerprint)
+        if self.capture_statement:
+            span.set_attribute(SpanAttributes.DB_STATEMENT, statement)
+        if self.record_pool_wait and wait is not None:
+            span.set_attribute("db.pool.wait_ms", round(wait * 1000, 3))
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        span = getattr(context, "_sql_span", None)
+        if span is None:
+            return
+        if self.record_rows and span.is_recording():
+            rowcount = getattr(cursor, "rowcount", -1)
+            if rowcount is not None and rowcount >= 0:
+                span.set_attribute("db.rowcount", rowcount)
+        span.end()
+        context._sql_span = None
+
+    def _handle_error(self, exception_context) -> None:
+        span = getattr(exception_context.execution_context, "_sql_span", None)
+        if span is None:
+            return
+        if span.is_recording():
+            span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)))
+        span.end()
+        exception_context.execution_context._sql_span = None
+
+
+def instrument_sqlalchemy(
+    engine: Union[AsyncEngine, Engine],
+    tracer_provider: Optional[TracerProvider] = None,
+) -> None:
+    """
+    Instrument a SQLAlchemy engine for distributed tracing.
+
+    Statement text is only recorded when OTEL_SQLALCHEMY_CAPTURE_STATEMENT is
+    set; every span carries the statement fingerprint (same as the
+    db_statement_* metrics) so slow queries can still be identified.
 
     Args:
-        engine: The SQLAlchemy AsyncEngine to instrument.
+        engine: The SQLAlchemy AsyncEngine (or sync Engine) to instrument.
+        tracer_provider: Provider to use instead of the global one.
     """
     if not settings.OTEL_TRACING_ENABLED:
         return
 
-    SQLAlchemyInstrumentor().instrument(
-        engine=engine.sync_engine,
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(sync_engine)
+    _SqlSpanTracer(
+        sync_engine,
+        tracer=trace.get_tracer(__name__, tracer_provider=tracer_provider),
+        capture_statement=settings.OTEL_SQLALCHEMY_CAPTURE_STATEMENT,
+        record_rows=settings.OTEL_SQLALCHEMY_RECORD_ROWS,
+        record_pool_wait=settings.OTEL_SQLALCHEMY_RECORD_POOL_WAIT,
+    )
+    logger.info(
+        "SQLAlchemy engine instrumented for tracing: pool=%s",
+        sync_engine.pool.logging_name or "default",
     )
-    logger.info("SQLAlchemy engine instrumented for tracing")
 
 
 def instrument_redis() -> None:
@@ -107,6 +335,8 @@ def instrument_redis() -> None:
     if not settings.OTEL_TRACING_ENABLED:
         return
 
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+
     RedisInstrumentor().instrument()
     logger.info("Redis client instrumented for tracing")
 
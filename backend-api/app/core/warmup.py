@@ -0,0 +1,165 @@
+"""
+Startup Warm-up
+
+Runs once per worker in the background right after startup so the first
+requests after a rollout do not pay for:
+- establishing database connections (WARMUP_DB_CONNECTIONS per engine);
+- the first Redis connection;
+- importing Celery for the lazily referenced tasks (in a thread), only with
+  WARMUP_CELERY_ENABLED since it defeats their lazy import;
+- mapper configuration and SQL compilation of the hot Query handlers
+  (statements are executed so they land in each engine's compiled cache);
+- OpenAPI schema generation (every response model's JSON schema).
+
+The readiness probe reports the ``warmup`` check as pending until this
+finishes. Failures are logged and do not block readiness; the dependency
+checks already report a database or Redis that is down.
+"""
+import asyncio
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import Iterable, Optional
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, configure_mappers
+
+from app.common.database.session import engine, read_engines
+from app.common.redis.client import get_redis_client
+from app.core.celery.lazy import resolve_all as resolve_lazy_tasks
+from app.core.config import settings
+from app.core.health import DependencyHealthChecker
+from app.common.pagination import keyset_page
+from app.features.appointments.models.appointment import Appointment
+from app.features.appointments.queries.list_appointments import (
+    HISTORY_SORT_COLUMNS,
+    GetPatientAppointmentSummaryQuery,
+    ListAppointmentsQuery,
+    doctor_history_filter,
+    patient_history_filter,
+)
+from app.features.auth.models.user import User
+from app.features.doctors.lookup import find_doctor_id
+from app.features.patients.lookup import find_patient_id
+from app.features.patients.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+WARMUP_CHECK = "warmup"
+
+
+def run_hot_queries(session: Session) -> None:
+    """
+    Execute the default-path statements of the hot Query handlers.
+
+    The statement shapes must match the handlers' so that the compiled-cache
+    entries are reused; parameters are chosen to return no rows.
+    """
+    session.query(Appointment).filter(Appointment.id == 0).first()
+    count_query, list_query = ListAppointmentsQuery(session).build_queries()
+    count_query.count()
+    list_query.offset(0).limit(20).all()
+
+    # First pages of the patient and doctor histories, as for a registered
+    # patient and a known doctor when FK lookups are enabled
+    page_size = settings.HISTORY_PAGE_SIZE_DEFAULT
+    fk_id = 0 if settings.APPOINTMENT_FK_LOOKUPS_ENABLED else None
+    find_patient_id(session, "")
+    patient_history = session.query(Appointment).filter(patient_history_filter(fk_id, ""))
+    keyset_page(patient_history, HISTORY_SORT_COLUMNS, page_size, descending=True)
+    summary = session.query(*GetPatientAppointmentSummaryQuery.SUMMARY_COLUMNS).filter(
+        patient_history_filter(fk_id, "")
+    )
+    keyset_page(summary, HISTORY_SORT_COLUMNS, page_size, descending=True)
+    find_doctor_id(session, "")
+    doctor_filter = (
+        doctor_history_filter(fk_id, "")
+        if settings.APPOINTMENT_FK_LOOKUPS_ENABLED
+        else Appointment.doctor_name == ""
+    )
+    keyset_page(
+        session.query(Appointment).filter(doctor_filter), HISTORY_SORT_COLUMNS, page_size
+    )
+
+    session.query(Patient).filter(Patient.id == 0).first()
+    patients = session.query(Patient)
+    patients.count()
+    patients.order_by(Patient.last_name.asc()).offset(0).limit(20).all()
+
+    session.query(User).filter(User.email == "").first()
+
+
+async def warm_engine(target: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pooled connections at once and compile the hot statements."""
+    async with AsyncExitStack() as stack:
+        conns = await asyncio.gather(
+            *(stack.enter_async_context(target.connect()) for _ in range(connections))
+        )
+        for conn in conns:
+            await conn.execute(text("SELECT 1"))
+        async with AsyncSession(bind=conns[0]) as session:
+            await session.run_sync(run_hot_queries)
+            await session.rollback()
+
+
+def warm_schemas(app: FastAPI) -> None:
+    """
+    Build the OpenAPI schema ahead of the first /docs or /openapi.json hit.
+
+    Pydantic v2 compiles validators and serializers when the model class is
+    created; the JSON schemas generated here are the part left lazy.
+    """
+    app.openapi()
+
+
+async def _step(name: str, coro) -> None:
+    start = time.perf_counter()
+    try:
+        await coro
+        logger.info(
+            "Warm-up step finished: step=%s duration_ms=%.1f",
+            name,
+            (time.perf_counter() - start) * 1000,
+        )
+    except Exception as exc:
+        logger.warning("Warm-up step failed: step=%s error=%s", name, exc)
+
+
+async def warm_up(
+    app: FastAPI,
+    checker: DependencyHealthChecker,
+    engines: Optional[Iterable[AsyncEngine]] = None,
+) -> None:
+    """Run every warm-up step, then mark the ``warmup`` readiness check ok."""
+    if engines is None:
+        engines = (engine, *read_engines)
+    start = time.perf_counter()
+    connections = max(1, min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE))
+
+    configure_mappers()
+    warm_schemas(app)
+    steps = [
+        _step(f"database:{db.pool.logging_name}", warm_engine(db, connections)) for db in engines
+    ]
+    steps.append(_step("redis", get_redis_client().ping()))
+    if settings.WARMUP_CELERY_ENABLED:
+        steps.append(_step("celery", asyncio.to_thread(resolve_lazy_tasks)))
+    try:
+        await asyncio.wait_for(asyncio.gather(*steps), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Warm-up timed out after %.0fs", settings.WARMUP_TIMEOUT_SECONDS)
+
+    checker.set_status(WARMUP_CHECK, "ok")
+    logger.info("Warm-up complete: duration_ms=%.1f", (time.perf_counter() - start) * 1000)
+
+
+def start_warm_up(
+    app: FastAPI,
+    checker: DependencyHealthChecker,
+    engines: Optional[Iterable[AsyncEngine]] = None,
+) -> asyncio.Task:
+    """Mark readiness pending and run ``warm_up`` as a background task."""
+    checker.set_status(WARMUP_CHECK, "pending")
+    return asyncio.create_task(warm_up(app, checker, engines), name="warm-up")
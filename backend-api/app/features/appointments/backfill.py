@@ -0,0 +1,70 @@
+"""
+Appointment Foreign Key Backfill
+Fills doctor_id / patient_id on appointments written before those columns existed
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from app.features.appointments.models.appointment import Appointment
+from app.features.doctors.lookup import ensure_doctor_ids
+from app.features.patients.models.patient import Patient
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_foreign_keys_batch(db: Session, after_id: int, batch_size: int) -> Optional[int]:
+    """
+    Link the next ``batch_size`` appointments with ``id > after_id`` and commit.
+
+    Walks the primary key, so each batch is one short transaction touching a
+    bounded id range and concurrent writes are never blocked for long. Rows
+    already linked are skipped; patient_id stays NULL for unregistered emails.
+
+    Returns:
+        The last id processed, or None when there is nothing left.
+    """
+    rows = (
+        db.query(
+            Appointment.id,
+            Appointment.doctor_name,
+            Appointment.specialty,
+            Appointment.patient_email,
+            Appointment.patient_id,
+        )
+        .filter(Appointment.id > after_id)
+        .filter(or_(Appointment.doctor_id.is_(None), Appointment.patient_id.is_(None)))
+        .order_by(Appointment.id)
+        .limit(batch_size)
+        .all()
+    )
+    if not rows:
+        return None
+
+    doctor_ids = ensure_doctor_ids(db, {row.doctor_name: row.specialty for row in rows})
+    patient_ids = dict(
+        db.query(Patient.email, Patient.id)
+        .filter(Patient.email.in_({row.patient_email for row in rows}))
+        .all()
+    )
+
+    db.execute(
+        update(Appointment),
+        [
+            {
+                "id": row.id,
+                "doctor_id": doctor_ids[row.doctor_name],
+                "patient_id": patient_ids.get(row.patient_email, row.patient_id),
+            }
+            for row in rows
+        ],
+    )
+    db.commit()
+
+    logger.info(
+        "Backfilled appointment foreign keys: ids=%s..%s rows=%s",
+        rows[0].id, rows[-1].id, len(rows),
+    )
+    return rows[-1].id
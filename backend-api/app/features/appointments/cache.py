@@ -0,0 +1,27 @@
+"""
+Appointment Read Caches
+Redis-backed materializations of hot appointment queries and in-process
+caches of single appointments, invalidated by the commands
+"""
+from app.common.local_cache import LocalCache
+from app.common.redis.cache import XFetchCache
+from app.core.config import settings
+
+# GetUpcomingAppointmentsQuery results, one entry per days_ahead value.
+# Create/Update/Cancel invalidate all of them after committing.
+upcoming_appointments_cache = XFetchCache(
+    "appointments:upcoming",
+    ttl=settings.UPCOMING_APPOINTMENTS_CACHE_TTL_SECONDS,
+    beta=settings.UPCOMING_APPOINTMENTS_CACHE_XFETCH_BETA,
+    lock_timeout=settings.UPCOMING_APPOINTMENTS_CACHE_LOCK_TIMEOUT_SECONDS,
+    enabled=settings.UPCOMING_APPOINTMENTS_CACHE_ENABLED,
+)
+
+# GetAppointmentQuery results by id, per worker. Update/Cancel evict the id on
+# every pod with notify_invalidation.
+appointment_by_id_cache = LocalCache(
+    "appointments:by_id",
+    ttl=settings.APPOINTMENT_LOCAL_CACHE_TTL_SECONDS,
+    max_entries=settings.APPOINTMENT_LOCAL_CACHE_MAX_ENTRIES,
+    enabled=settings.APPOINTMENT_LOCAL_CACHE_ENABLED,
+)
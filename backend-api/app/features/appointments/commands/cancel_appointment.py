@@ -5,7 +5,11 @@ Handles appointment cancellation - modifies system state
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.common.database.notify import notify_invalidation
+from app.common.instrumentation import instrument_handler
+from app.features.appointments.cache import appointment_by_id_cache, upcoming_appointments_cache
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.projection import project_appointment
 
 
 class CancelAppointmentCommand:
@@ -23,6 +27,7 @@ class CancelAppointmentCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, appointment_id: int) -> Appointment:
         """
         Execute the command to cancel an appointment
@@ -54,8 +59,13 @@ class CancelAppointmentCommand:
         db_appointment.status = AppointmentStatus.CANCELLED
 
         try:
+            project_appointment(self.db, db_appointment)
+            notify_invalidation(
+                self.db, appointment_by_id_cache.namespace, str(db_appointment.id)
+            )
             self.db.commit()
             self.db.refresh(db_appointment)
+            await upcoming_appointments_cache.invalidate()
             return db_appointment
 
         except Exception as e:
@@ -2,14 +2,24 @@
 Create Appointment Command (CQRS)
 Handles appointment creation - modifies system state
 """
-from app.tasks.email_tasks import send_appointment_confirmation_email
-
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from datetime import datetime
 
+from app.common.instrumentation import instrument_handler
+from app.core.celery.dispatch import dispatch
+from app.core.celery.lazy import LazyTask
+from app.features.appointments.cache import upcoming_appointments_cache
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.projection import project_appointment
 from app.features.appointments.schemas.appointment import AppointmentCreate
+from app.features.doctors.lookup import ensure_doctor_ids
+from app.features.patients.lookup import find_patient_id
+
+# Celery is imported on the first dispatch, not when the API starts
+send_appointment_confirmation_email = LazyTask(
+    "app.tasks.email_tasks:send_appointment_confirmation_email"
+)
 
 
 class CreateAppointmentCommand:
@@ -27,6 +37,7 @@ class CreateAppointmentCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, appointment_data: AppointmentCreate) -> Appointment:
         """
         Execute the command to create an appointment
@@ -58,13 +69,24 @@ class CreateAppointmentCommand:
         )
 
         try:
+            # Link the doctor (created on first use) and the registered patient, if any
+            db_appointment.doctor_id = ensure_doctor_ids(
+                self.db, {appointment_data.doctor_name: appointment_data.specialty}
+            )[appointment_data.doctor_name]
+            db_appointment.patient_id = find_patient_id(self.db, appointment_data.patient_email)
+
             # Persist to database
             self.db.add(db_appointment)
+            self.db.flush()
+            project_appointment(self.db, db_appointment)
             self.db.commit()
             self.db.refresh(db_appointment)
+            await upcoming_appointments_cache.invalidate()
 
             # 🆕 Enviar email de confirmación asíncrono
-            send_appointment_confirmation_email.delay(
+            # (best effort: the appointment is committed even if the broker is down)
+            dispatch(
+                send_appointment_confirmation_email,
                 patient_email=db_appointment.patient_email,
                 patient_name=db_appointment.patient_name,
                 doctor_name=db_appointment.doctor_name,
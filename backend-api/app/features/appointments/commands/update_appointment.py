@@ -5,8 +5,14 @@ Handles appointment updates - modifies system state
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.common.database.notify import notify_invalidation
+from app.common.instrumentation import instrument_handler
+from app.features.appointments.cache import appointment_by_id_cache, upcoming_appointments_cache
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.projection import project_appointment
 from app.features.appointments.schemas.appointment import AppointmentUpdate
+from app.features.doctors.lookup import ensure_doctor_ids
+from app.features.patients.lookup import find_patient_id
 
 
 class UpdateAppointmentCommand:
@@ -24,6 +30,7 @@ class UpdateAppointmentCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(
             self,
             appointment_id: int,
@@ -63,8 +70,20 @@ class UpdateAppointmentCommand:
             setattr(db_appointment, field, value)
 
         try:
+            if "doctor_name" in update_data:
+                db_appointment.doctor_id = ensure_doctor_ids(
+                    self.db, {db_appointment.doctor_name: db_appointment.specialty}
+                )[db_appointment.doctor_name]
+            if "patient_email" in update_data:
+                db_appointment.patient_id = find_patient_id(self.db, db_appointment.patient_email)
+            project_appointment(self.db, db_appointment)
+            notify_invalidation(
+                self.db, appointment_by_id_cache.namespace, str(db_appointment.id)
+            )
+
             self.db.commit()
             self.db.refresh(db_appointment)
+            await upcoming_appointments_cache.invalidate()
             return db_appointment
 
         except Exception as e:
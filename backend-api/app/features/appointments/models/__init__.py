@@ -2,5 +2,9 @@
 Appointments Models
 """
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.models.appointment_listing import (
+    AppointmentListing,
+    StatusBucket,
+)
 
-__all__ = ["Appointment", "AppointmentStatus"]
+__all__ = ["Appointment", "AppointmentStatus", "AppointmentListing", "StatusBucket"]
@@ -3,7 +3,7 @@ Appointment Model (SQLAlchemy)
 Domain entity for appointments
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, Text, Index, ForeignKey
 from sqlalchemy.sql import func
 import enum
 
@@ -26,21 +26,34 @@ class Appointment(Base):
     Represents a medical appointment in the system
     """
     __tablename__ = "appointments"
+    __table_args__ = (
+        # Keyset pagination of patient and doctor history (appointment_date, id)
+        Index("ix_appointments_doctor_name_date_id", "doctor_name", "appointment_date", "id"),
+        Index("ix_appointments_patient_id_date_id", "patient_id", "appointment_date", "id"),
+        Index("ix_appointments_doctor_id_date_id", "doctor_id", "appointment_date", "id"),
+        # Replaced by a BRIN + partial "recent" index when migration d7e2f4a9c3b6
+        # runs with -x appointment_date_index=brin; alembic/env.py keeps
+        # autogenerate away from both variants
+        Index("ix_appointments_appointment_date", "appointment_date"),
+    )
 
     # Primary Key
     id = Column(Integer, primary_key=True, index=True)
 
-    # Patient Information (simplified - en producción serían FK)
+    # Patient Information (names/emails are kept as entered; patient_id links
+    # registered patients and stays NULL for appointments of unregistered ones)
+    patient_id = Column(Integer, ForeignKey("patients.id", ondelete="SET NULL"), nullable=True)
     patient_name = Column(String(200), nullable=False, index=True)
     patient_email = Column(String(255), nullable=False)
     patient_phone = Column(String(20), nullable=True)
 
-    # Doctor Information (simplified - en producción serían FK)
-    doctor_name = Column(String(200), nullable=False, index=True)
+    # Doctor Information (doctor_id is set by the commands and the FK backfill)
+    doctor_id = Column(Integer, ForeignKey("doctors.id"), nullable=True)
+    doctor_name = Column(String(200), nullable=False)
     specialty = Column(String(100), nullable=False)
 
     # Appointment Details
-    appointment_date = Column(DateTime(timezone=True), nullable=False, index=True)
+    appointment_date = Column(DateTime(timezone=True), nullable=False)
     duration_minutes = Column(Integer, default=30)
     reason = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
@@ -66,4 +79,15 @@ class Appointment(Base):
     )
 
     def __repr__(self):
-        return f"<Appointment(id={self.id}, patient={self.patient_name}, date={self.appointment_date}, status={self.status})>"
\ No newline at end of file
+        return f"<Appointment(id={self.id}, patient={self.patient_name}, date={self.appointment_date}, status={self.status})>"
+
+
+# Patient-portal lookups by email: newest-first key order, and the summary
+# columns INCLUDEd so GetPatientAppointmentSummaryQuery is an index-only scan
+Index(
+    "ix_appointments_patient_email_summary",
+    Appointment.patient_email,
+    Appointment.appointment_date.desc(),
+    Appointment.id.desc(),
+    postgresql_include=["status", "doctor_name", "specialty"],
+)
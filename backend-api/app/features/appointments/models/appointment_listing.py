@@ -0,0 +1,71 @@
+"""
+Appointment Listing Model (SQLAlchemy)
+Denormalized read model behind ListAppointmentsQuery
+"""
+import enum
+
+from sqlalchemy import Column, Date, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String
+
+from app.common.database.base import Base
+from app.features.appointments.models.appointment import AppointmentStatus
+
+
+class StatusBucket(str, enum.Enum):
+    """Coarse status groups used by list views"""
+    ACTIVE = "active"
+    CLOSED = "closed"
+
+
+STATUS_BUCKETS = {
+    AppointmentStatus.SCHEDULED: StatusBucket.ACTIVE,
+    AppointmentStatus.CONFIRMED: StatusBucket.ACTIVE,
+    AppointmentStatus.CANCELLED: StatusBucket.CLOSED,
+    AppointmentStatus.COMPLETED: StatusBucket.CLOSED,
+    AppointmentStatus.NO_SHOW: StatusBucket.CLOSED,
+}
+
+
+class AppointmentListing(Base):
+    """
+    One row per appointment with the list filters precomputed
+
+    Written by the appointment commands in the same transaction as the
+    appointment (see app/features/appointments/projection.py), so list reads
+    filter, count and sort a narrow table and only fetch the page rows from
+    appointments.
+    """
+    __tablename__ = "appointment_listings"
+    __table_args__ = (
+        Index("ix_appointment_listings_date_id", "appointment_date", "appointment_id"),
+        Index("ix_appointment_listings_status_date", "status", "appointment_date"),
+        Index("ix_appointment_listings_bucket_date", "status_bucket", "appointment_date"),
+        # Doctor agenda by day
+        Index("ix_appointment_listings_doctor_day", "doctor_name_lower", "appointment_day"),
+        # Substring search (LIKE '%term%') on the lower-cased names
+        Index(
+            "ix_appointment_listings_patient_name_trgm",
+            "patient_name_lower",
+            postgresql_using="gin",
+            postgresql_ops={"patient_name_lower": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_appointment_listings_doctor_name_trgm",
+            "doctor_name_lower",
+            postgresql_using="gin",
+            postgresql_ops={"doctor_name_lower": "gin_trgm_ops"},
+        ),
+    )
+
+    appointment_id = Column(
+        Integer, ForeignKey("appointments.id", ondelete="CASCADE"), primary_key=True
+    )
+    patient_name_lower = Column(String(200), nullable=False)
+    doctor_name_lower = Column(String(200), nullable=False)
+    status = Column(SQLEnum(AppointmentStatus), nullable=False)
+    status_bucket = Column(SQLEnum(StatusBucket), nullable=False)
+    appointment_date = Column(DateTime(timezone=True), nullable=False)
+    # UTC calendar day of appointment_date
+    appointment_day = Column(Date, nullable=False)
+
+    def __repr__(self):
+        return f"<AppointmentListing(appointment_id={self.appointment_id}, status={self.status})>"
@@ -0,0 +1,82 @@
+"""
+Appointment Listing Projection
+Keeps appointment_listings (the read model of ListAppointmentsQuery) in sync
+with appointments
+"""
+import logging
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.features.appointments.models.appointment import Appointment
+from app.features.appointments.models.appointment_listing import (
+    STATUS_BUCKETS,
+    AppointmentListing,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_day(moment: datetime) -> date:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    if moment.tzinfo is None:
+        return moment.date()
+    return moment.astimezone(timezone.utc).date()
+
+
+def _listing(appointment: Appointment) -> AppointmentListing:
+    return AppointmentListing(
+        appointment_id=appointment.id,
+        patient_name_lower=appointment.patient_name.lower(),
+        doctor_name_lower=appointment.doctor_name.lower(),
+        status=appointment.status,
+        status_bucket=STATUS_BUCKETS[appointment.status],
+        appointment_date=appointment.appointment_date,
+        appointment_day=_utc_day(appointment.appointment_date),
+    )
+
+
+def project_appointment(db: Session, appointment: Appointment) -> None:
+    """
+    Insert or update the listing row of ``appointment`` in the current transaction.
+
+    Call it from commands after the appointment has an id (flush first on
+    create) and before commit, so the read model never lags the write.
+    """
+    db.merge(_listing(appointment))
+
+
+def project_appointments_batch(db: Session, after_id: int, batch_size: int) -> Optional[int]:
+    """
+    Rebuild the listing rows of the next ``batch_size`` appointments with
+    ``id > after_id`` and commit.
+
+    Used to (re)populate the read model for rows written outside the
+    commands; walks the primary key like the foreign key backfill.
+
+    Returns:
+        The last id processed, or None when there is nothing left.
+    """
+    appointments = (
+        db.query(Appointment)
+        .filter(Appointment.id > after_id)
+        .order_by(Appointment.id)
+        .limit(batch_size)
+        .all()
+    )
+    if not appointments:
+        return None
+
+    ids = [appointment.id for appointment in appointments]
+    db.query(AppointmentListing).filter(
+        AppointmentListing.appointment_id.in_(ids)
+    ).delete(synchronize_session=False)
+    db.add_all(_listing(appointment) for appointment in appointments)
+    db.commit()
+
+    logger.info(
+        "Projected appointment listings: ids=%s..%s rows=%s", ids[0], ids[-1], len(ids)
+    )
+    db.expunge_all()
+    return ids[-1]
@@ -6,6 +6,7 @@ from app.features.appointments.queries.list_appointments import (
     ListAppointmentsQuery,
     GetUpcomingAppointmentsQuery,
     GetAppointmentsByPatientQuery,
+    GetPatientAppointmentSummaryQuery,
     GetAppointmentsByDoctorQuery
 )
 
@@ -14,5 +15,6 @@ __all__ = [
     "ListAppointmentsQuery",
     "GetUpcomingAppointmentsQuery",
     "GetAppointmentsByPatientQuery",
+    "GetPatientAppointmentSummaryQuery",
     "GetAppointmentsByDoctorQuery"
 ]
\ No newline at end of file
@@ -2,10 +2,16 @@
 Get Appointment Query (CQRS)
 Retrieves single appointment - read-only operation
 """
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
+from app.common.dependencies.database import PINNED, PRIMARY, session_role
+from app.common.instrumentation import instrument_handler
+from app.features.appointments.cache import appointment_by_id_cache
 from app.features.appointments.models.appointment import Appointment
+from app.features.appointments.schemas.appointment import AppointmentResponse
 
 
 class GetAppointmentQuery:
@@ -23,27 +29,47 @@ class GetAppointmentQuery:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(self, appointment_id: int) -> Appointment:
+    @instrument_handler
+    async def execute(self, appointment_id: int) -> AppointmentResponse:
         """
         Execute the query to get an appointment
 
+        Served from this worker's local cache when possible; Update/Cancel
+        evict the id on every pod. The cache is only filled from the primary:
+        a lagging replica could put back a row a write just evicted. Clients
+        in their read-your-writes window bypass it.
+
         Args:
             appointment_id: ID of appointment to retrieve
 
         Returns:
-            Appointment object
+            Appointment data
 
         Raises:
             HTTPException: If appointment not found
         """
-        db_appointment = self.db.query(Appointment).filter(
-            Appointment.id == appointment_id
-        ).first()
+        role = session_role(self.db)
+        if role == PINNED:
+            appointment = await self._load(appointment_id)
+        else:
+            appointment = await appointment_by_id_cache.get_or_load(
+                str(appointment_id),
+                lambda: self._load(appointment_id),
+                fill=role == PRIMARY,
+            )
 
-        if not db_appointment:
+        if appointment is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Appointment with id {appointment_id} not found"
             )
 
-        return db_appointment
\ No newline at end of file
+        return appointment
+
+    async def _load(self, appointment_id: int) -> Optional[AppointmentResponse]:
+        db_appointment = self.db.query(Appointment).filter(
+            Appointment.id == appointment_id
+        ).first()
+        if db_appointment is None:
+            return None
+        return AppointmentResponse.model_validate(db_appointment)
@@ -2,13 +2,57 @@
 List Appointments Query (CQRS)
 Retrieves multiple appointments with filtering and pagination - read-only
 """
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Iterator, Optional
+from sqlalchemy.orm import Query, Session
 from sqlalchemy import or_, and_
 from datetime import datetime, timezone
 from math import ceil
 
+from app.common.instrumentation import instrument_handler
+from app.common.pagination import CursorPage, iter_keyset_batches, keyset_page
+from app.common.singleflight import singleflight
+from app.core.config import settings
+from app.features.appointments.cache import upcoming_appointments_cache
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.models.appointment_listing import (
+    STATUS_BUCKETS,
+    AppointmentListing,
+    StatusBucket,
+)
+from app.features.appointments.schemas.appointment import AppointmentResponse
+from app.features.doctors.lookup import find_doctor_id
+from app.features.patients.lookup import find_patient_id
+
+# Keyset order of the history queries; id makes it total
+HISTORY_SORT_COLUMNS = (Appointment.appointment_date, Appointment.id)
+
+
+def patient_history_filter(patient_id: Optional[int], patient_email: str):
+    """
+    Match a patient's appointments.
+
+    Registered patients are matched by patients.id; appointments of
+    unregistered patients, and rows the FK backfill has not reached yet,
+    only have the email.
+    """
+    if patient_id is None:
+        return Appointment.patient_email == patient_email
+    return or_(
+        Appointment.patient_id == patient_id,
+        and_(Appointment.patient_id.is_(None), Appointment.patient_email == patient_email),
+    )
+
+
+def doctor_history_filter(doctor_id: Optional[int], doctor_name: str):
+    """
+    Match a doctor's appointments by doctors.id.
+
+    Rows the FK backfill has not reached yet still match by name.
+    """
+    not_backfilled = and_(Appointment.doctor_id.is_(None), Appointment.doctor_name == doctor_name)
+    if doctor_id is None:
+        return not_backfilled
+    return or_(Appointment.doctor_id == doctor_id, not_backfilled)
 
 
 class ListAppointmentsQuery:
@@ -19,16 +63,20 @@ class ListAppointmentsQuery:
 
     Features:
     - Pagination (page and page_size)
-    - Filter by status
+    - Filter by status or status bucket (active / closed)
     - Filter by patient name (search)
     - Filter by doctor name (search)
     - Filter by date range
     - Sorting by appointment_date
+
+    Filters, the count and the sort run on the appointment_listings read
+    model; only the rows of the requested page are read from appointments.
     """
 
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(
             self,
             skip: int = 0,
@@ -39,7 +87,8 @@ class ListAppointmentsQuery:
             start_date: Optional[datetime] = None,
             end_date: Optional[datetime] = None,
             page: int = 1,
-            page_size: int = 20
+            page_size: int = 20,
+            status_bucket: Optional[StatusBucket] = None
     ) -> dict:
         """
         Execute the query to list appointments
@@ -54,6 +103,7 @@ class ListAppointmentsQuery:
             end_date: Filter appointments until this date
             page: Page number (starts at 1)
             page_size: Items per page
+            status_bucket: Filter by status bucket (active or closed)
 
         Returns:
             Dictionary with:
@@ -63,36 +113,12 @@ class ListAppointmentsQuery:
             - page_size: Items per page
             - total_pages: Total number of pages
         """
-        # Build base query
-        query = self.db.query(Appointment)
-
-        # Apply filters
-        filters = []
-
-        if status:
-            filters.append(Appointment.status == status)
-
-        if patient_name:
-            filters.append(Appointment.patient_name.ilike(f"%{patient_name}%"))
-
-        if doctor_name:
-            filters.append(Appointment.doctor_name.ilike(f"%{doctor_name}%"))
-
-        if start_date:
-            filters.append(Appointment.appointment_date >= start_date)
-
-        if end_date:
-            filters.append(Appointment.appointment_date <= end_date)
-
-        # Apply all filters
-        if filters:
-            query = query.filter(and_(*filters))
+        count_query, query = self.build_queries(
+            status, status_bucket, patient_name, doctor_name, start_date, end_date
+        )
 
         # Get total count before pagination
-        total = query.count()
-
-        # Apply sorting (most recent first)
-        query = query.order_by(Appointment.appointment_date.asc())
+        total = count_query.count()
 
         # Apply pagination
         # Calculate skip from page number
@@ -111,6 +137,82 @@ class ListAppointmentsQuery:
             "total_pages": total_pages
         }
 
+    def build_queries(
+            self,
+            status: Optional[AppointmentStatus] = None,
+            status_bucket: Optional[StatusBucket] = None,
+            patient_name: Optional[str] = None,
+            doctor_name: Optional[str] = None,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None
+    ) -> tuple[Query, Query]:
+        """
+        Build the filtered count query and the sorted, unpaginated page query
+
+        Also used by the startup warm-up, so its statements match the handler's.
+        """
+        filter_args = (status, status_bucket, patient_name, doctor_name, start_date, end_date)
+        if settings.APPOINTMENT_LISTING_READ_MODEL_ENABLED:
+            source = AppointmentListing
+            filters = self._listing_filters(*filter_args)
+            count_query = self.db.query(AppointmentListing)
+            query = self.db.query(Appointment).join(
+                AppointmentListing, AppointmentListing.appointment_id == Appointment.id
+            )
+        else:
+            source = Appointment
+            filters = self._table_filters(*filter_args)
+            count_query = query = self.db.query(Appointment)
+
+        # Apply all filters
+        if filters:
+            count_query = count_query.filter(and_(*filters))
+            query = query.filter(and_(*filters))
+
+        # Apply sorting (earliest first)
+        query = query.order_by(source.appointment_date.asc(), Appointment.id.asc())
+        return count_query, query
+
+    @staticmethod
+    def _listing_filters(
+            status, status_bucket, patient_name, doctor_name, start_date, end_date
+    ) -> list:
+        filters = []
+        if status:
+            filters.append(AppointmentListing.status == status)
+        if status_bucket:
+            filters.append(AppointmentListing.status_bucket == status_bucket)
+        if patient_name:
+            filters.append(AppointmentListing.patient_name_lower.like(f"%{patient_name.lower()}%"))
+        if doctor_name:
+            filters.append(AppointmentListing.doctor_name_lower.like(f"%{doctor_name.lower()}%"))
+        if start_date:
+            filters.append(AppointmentListing.appointment_date >= start_date)
+        if end_date:
+            filters.append(AppointmentListing.appointment_date <= end_date)
+        return filters
+
+    @staticmethod
+    def _table_filters(
+            status, status_bucket, patient_name, doctor_name, start_date, end_date
+    ) -> list:
+        filters = []
+        if status:
+            filters.append(Appointment.status == status)
+        if status_bucket:
+            filters.append(Appointment.status.in_(
+                [s for s, bucket in STATUS_BUCKETS.items() if bucket == status_bucket]
+            ))
+        if patient_name:
+            filters.append(Appointment.patient_name.ilike(f"%{patient_name}%"))
+        if doctor_name:
+            filters.append(Appointment.doctor_name.ilike(f"%{doctor_name}%"))
+        if start_date:
+            filters.append(Appointment.appointment_date >= start_date)
+        if end_date:
+            filters.append(Appointment.appointment_date <= end_date)
+        return filters
+
 
 class GetUpcomingAppointmentsQuery:
     """
@@ -122,16 +224,29 @@ class GetUpcomingAppointmentsQuery:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(self, days_ahead: int = 7) -> list[Appointment]:
+    @instrument_handler
+    @singleflight
+    async def execute(self, days_ahead: int = 7) -> list[AppointmentResponse]:
         """
         Get appointments scheduled in the next N days
 
+        Served from the upcoming appointments cache (one entry per
+        days_ahead, at most UPCOMING_APPOINTMENTS_CACHE_TTL_SECONDS old
+        unless a command invalidated it); the database is read on a miss.
+
         Args:
             days_ahead: Number of days to look ahead
 
         Returns:
             List of upcoming appointments
         """
+        rows = await upcoming_appointments_cache.get_or_compute(
+            str(days_ahead), lambda: self._load(days_ahead)
+        )
+        return [AppointmentResponse.model_validate(row) for row in rows]
+
+    async def _load(self, days_ahead: int) -> list[dict]:
+        """Read upcoming appointments from the database as JSON-ready dicts."""
         from datetime import timedelta
 
         now = datetime.now(timezone.utc)
@@ -148,66 +263,150 @@ class GetUpcomingAppointmentsQuery:
             )
         ).order_by(Appointment.appointment_date.asc()).all()
 
-        return appointments
+        return [
+            AppointmentResponse.model_validate(apt).model_dump(mode="json")
+            for apt in appointments
+        ]
 
 
 class GetAppointmentsByPatientQuery:
     """
     Query to get all appointments for a specific patient
 
-    Useful for patient history
+    Useful for patient history. Results are cursor-paginated (newest
+    first); ``stream`` walks the whole history in bounded batches.
     """
 
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(self, patient_email: str) -> list[Appointment]:
+    def _query(self, patient_email: str) -> Query:
+        patient_id = None
+        if settings.APPOINTMENT_FK_LOOKUPS_ENABLED:
+            patient_id = find_patient_id(self.db, patient_email)
+        return self.db.query(Appointment).filter(
+            patient_history_filter(patient_id, patient_email)
+        )
+
+    @instrument_handler
+    async def execute(
+            self,
+            patient_email: str,
+            limit: int = settings.HISTORY_PAGE_SIZE_DEFAULT,
+            cursor: Optional[str] = None
+    ) -> CursorPage[Appointment]:
         """
-        Get all appointments for a patient by email
+        Get one page of a patient's appointments by email
 
         Args:
             patient_email: Patient's email address
+            limit: Page size (capped at HISTORY_PAGE_SIZE_MAX)
+            cursor: next_cursor of the previous page
 
         Returns:
-            List of patient's appointments
+            Page of the patient's appointments, newest first
         """
-        appointments = self.db.query(Appointment).filter(
-            Appointment.patient_email == patient_email
-        ).order_by(Appointment.appointment_date.desc()).all()
+        return keyset_page(
+            self._query(patient_email),
+            HISTORY_SORT_COLUMNS,
+            min(limit, settings.HISTORY_PAGE_SIZE_MAX),
+            cursor,
+            descending=True
+        )
 
-        return appointments
+    def stream(
+            self,
+            patient_email: str,
+            cursor: Optional[str] = None
+    ) -> Iterator[CursorPage[Appointment]]:
+        """Yield a patient's appointments in batches, up to HISTORY_STREAM_MAX_ROWS"""
+        return iter_keyset_batches(
+            self._query(patient_email),
+            HISTORY_SORT_COLUMNS,
+            settings.HISTORY_STREAM_BATCH_SIZE,
+            settings.HISTORY_STREAM_MAX_ROWS,
+            cursor,
+            descending=True
+        )
 
 
-class GetAppointmentsByDoctorQuery:
+class GetPatientAppointmentSummaryQuery:
     """
-    Query to get all appointments for a specific doctor
+    Query to get a compact, newest-first list of a patient's appointments
 
-    Useful for doctor's schedule
+    Useful for the patient portal. Matches the same rows as
+    GetAppointmentsByPatientQuery. Only columns of
+    ix_appointments_patient_email_summary are selected, so PostgreSQL can
+    answer unregistered patients' summaries with an index-only scan.
     """
 
+    SUMMARY_COLUMNS = (
+        Appointment.id,
+        Appointment.appointment_date,
+        Appointment.status,
+        Appointment.doctor_name,
+        Appointment.specialty
+    )
+
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(
             self,
-            doctor_name: str,
-            start_date: Optional[datetime] = None,
-            end_date: Optional[datetime] = None
-    ) -> list[Appointment]:
+            patient_email: str,
+            limit: int = settings.HISTORY_PAGE_SIZE_DEFAULT,
+            cursor: Optional[str] = None
+    ) -> CursorPage:
         """
-        Get all appointments for a doctor
+        Get one page of a patient's appointment summaries by email
 
         Args:
-            doctor_name: Doctor's name
-            start_date: Optional start date filter
-            end_date: Optional end date filter
+            patient_email: Patient's email address
+            limit: Page size (capped at HISTORY_PAGE_SIZE_MAX)
+            cursor: next_cursor of the previous page
 
         Returns:
-            List of doctor's appointments
+            Page of summary rows (id, date, status, doctor, specialty)
         """
-        query = self.db.query(Appointment).filter(
-            Appointment.doctor_name == doctor_name
+        patient_id = None
+        if settings.APPOINTMENT_FK_LOOKUPS_ENABLED:
+            patient_id = find_patient_id(self.db, patient_email)
+        query = self.db.query(*self.SUMMARY_COLUMNS).filter(
+            patient_history_filter(patient_id, patient_email)
         )
+        return keyset_page(
+            query,
+            HISTORY_SORT_COLUMNS,
+            min(limit, settings.HISTORY_PAGE_SIZE_MAX),
+            cursor,
+            descending=True
+        )
+
+
+class GetAppointmentsByDoctorQuery:
+    """
+    Query to get all appointments for a specific doctor
+
+    Useful for doctor's schedule. Results are cursor-paginated (oldest
+    first); ``stream`` walks the whole schedule in bounded batches.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _query(
+            self,
+            doctor_name: str,
+            start_date: Optional[datetime],
+            end_date: Optional[datetime]
+    ) -> Query:
+        query = self.db.query(Appointment)
+        if settings.APPOINTMENT_FK_LOOKUPS_ENABLED:
+            doctor_id = find_doctor_id(self.db, doctor_name)
+            query = query.filter(doctor_history_filter(doctor_id, doctor_name))
+        else:
+            query = query.filter(Appointment.doctor_name == doctor_name)
 
         if start_date:
             query = query.filter(Appointment.appointment_date >= start_date)
@@ -215,8 +414,50 @@ class GetAppointmentsByDoctorQuery:
         if end_date:
             query = query.filter(Appointment.appointment_date <= end_date)
 
-        appointments = query.order_by(
-            Appointment.appointment_date.asc()
-        ).all()
+        return query
+
+    @instrument_handler
+    @singleflight
+    async def execute(
+            self,
+            doctor_name: str,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            limit: int = settings.HISTORY_PAGE_SIZE_DEFAULT,
+            cursor: Optional[str] = None
+    ) -> CursorPage[Appointment]:
+        """
+        Get one page of a doctor's appointments
+
+        Args:
+            doctor_name: Doctor's name
+            start_date: Optional start date filter
+            end_date: Optional end date filter
+            limit: Page size (capped at HISTORY_PAGE_SIZE_MAX)
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Page of the doctor's appointments, oldest first
+        """
+        return keyset_page(
+            self._query(doctor_name, start_date, end_date),
+            HISTORY_SORT_COLUMNS,
+            min(limit, settings.HISTORY_PAGE_SIZE_MAX),
+            cursor
+        )
 
-        return appointments
\ No newline at end of file
+    def stream(
+            self,
+            doctor_name: str,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            cursor: Optional[str] = None
+    ) -> Iterator[CursorPage[Appointment]]:
+        """Yield a doctor's appointments in batches, up to HISTORY_STREAM_MAX_ROWS"""
+        return iter_keyset_batches(
+            self._query(doctor_name, start_date, end_date),
+            HISTORY_SORT_COLUMNS,
+            settings.HISTORY_STREAM_BATCH_SIZE,
+            settings.HISTORY_STREAM_MAX_ROWS,
+            cursor
+        )
@@ -3,18 +3,28 @@ Appointments Router
 FastAPI endpoints that use Commands and Queries (CQRS)
 """
 from fastapi import APIRouter, Depends, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import AsyncContextManager, AsyncIterator, Callable, Iterator, Optional
 from datetime import datetime
 
-from app.common.dependencies.database import get_db
+import orjson
+
+from app.common.dependencies.database import get_db, get_read_db, get_read_session_factory
+from app.common.pagination import CursorPage
+from app.core.config import settings
+from app.core.deadline import route_timeout
 from app.features.appointments.schemas.appointment import (
     AppointmentCreate,
     AppointmentUpdate,
     AppointmentResponse,
-    AppointmentListResponse
+    AppointmentListResponse,
+    AppointmentCursorPage,
+    AppointmentSummary,
+    AppointmentSummaryPage
 )
 from app.features.appointments.models.appointment import AppointmentStatus
+from app.features.appointments.models.appointment_listing import StatusBucket
 from app.features.appointments.commands.create_appointment import CreateAppointmentCommand
 from app.features.appointments.commands.update_appointment import UpdateAppointmentCommand
 from app.features.appointments.commands.cancel_appointment import CancelAppointmentCommand
@@ -23,11 +33,16 @@ from app.features.appointments.queries.list_appointments import (
     ListAppointmentsQuery,
     GetUpcomingAppointmentsQuery,
     GetAppointmentsByPatientQuery,
+    GetPatientAppointmentSummaryQuery,
     GetAppointmentsByDoctorQuery
 )
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+SessionFactory = Callable[[], AsyncContextManager[Session]]
+
 
 @router.post(
     "/",
@@ -84,7 +99,7 @@ async def cancel_appointment(
 )
 async def get_appointment(
         appointment_id: int,
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
 ):
     """Get a single appointment by ID"""
     query = GetAppointmentQuery(db)
@@ -105,7 +120,8 @@ async def list_appointments(
         doctor_name: Optional[str] = Query(None),
         start_date: Optional[datetime] = Query(None),
         end_date: Optional[datetime] = Query(None),
-        db: Session = Depends(get_db)
+        status_bucket: Optional[StatusBucket] = Query(None),
+        db: Session = Depends(get_read_db)
 ):
     """List appointments with pagination and filtering"""
     query = ListAppointmentsQuery(db)
@@ -116,7 +132,8 @@ async def list_appointments(
         patient_name=patient_name,
         doctor_name=doctor_name,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        status_bucket=status_bucket
     )
 
     return AppointmentListResponse(
@@ -136,33 +153,78 @@ async def list_appointments(
 )
 async def get_upcoming_appointments(
         days_ahead: int = Query(7, ge=1, le=90),
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
 ):
     """Get appointments scheduled in the next N days"""
     query = GetUpcomingAppointmentsQuery(db)
-    appointments = await query.execute(days_ahead)
-    return [AppointmentResponse.model_validate(apt) for apt in appointments]
+    return await query.execute(days_ahead)
 
 
 @router.get(
     "/patient/{patient_email}",
-    response_model=list[AppointmentResponse],
+    response_model=AppointmentCursorPage,
     summary="Get Patient Appointments",
     tags=["Queries"]
 )
 async def get_patient_appointments(
         patient_email: str,
-        db: Session = Depends(get_db)
+        limit: int = Query(
+            settings.HISTORY_PAGE_SIZE_DEFAULT, ge=1, le=settings.HISTORY_PAGE_SIZE_MAX
+        ),
+        cursor: Optional[str] = Query(None),
+        db: Session = Depends(get_read_db)
 ):
-    """Get all appointments for a specific patient"""
+    """Get a page of a patient's appointments, newest first"""
     query = GetAppointmentsByPatientQuery(db)
-    appointments = await query.execute(patient_email)
-    return [AppointmentResponse.model_validate(apt) for apt in appointments]
+    page = await query.execute(patient_email, limit, cursor)
+    return _cursor_page(page)
+
+
+@router.get(
+    "/patient/{patient_email}/summary",
+    response_model=AppointmentSummaryPage,
+    summary="Get Patient Appointment Summary",
+    tags=["Queries"]
+)
+async def get_patient_appointment_summary(
+        patient_email: str,
+        limit: int = Query(
+            settings.HISTORY_PAGE_SIZE_DEFAULT, ge=1, le=settings.HISTORY_PAGE_SIZE_MAX
+        ),
+        cursor: Optional[str] = Query(None),
+        db: Session = Depends(get_read_db)
+):
+    """Get a compact page of a patient's appointments, newest first (index-only scan)"""
+    query = GetPatientAppointmentSummaryQuery(db)
+    page = await query.execute(patient_email, limit, cursor)
+    return AppointmentSummaryPage(
+        items=[AppointmentSummary.model_validate(row) for row in page.items],
+        next_cursor=page.next_cursor
+    )
+
+
+@router.get(
+    "/patient/{patient_email}/stream",
+    response_class=StreamingResponse,
+    summary="Stream Patient Appointments (NDJSON)",
+    tags=["Queries"],
+    dependencies=[Depends(route_timeout(settings.HISTORY_STREAM_TIMEOUT_SECONDS))]
+)
+async def stream_patient_appointments(
+        patient_email: str,
+        cursor: Optional[str] = Query(None),
+        open_session: SessionFactory = Depends(get_read_session_factory)
+):
+    """Stream a patient's appointments as NDJSON, newest first (see _ndjson_response)"""
+    return _ndjson_response(
+        open_session,
+        lambda db: GetAppointmentsByPatientQuery(db).stream(patient_email, cursor)
+    )
 
 
 @router.get(
     "/doctor/{doctor_name}",
-    response_model=list[AppointmentResponse],
+    response_model=AppointmentCursorPage,
     summary="Get Doctor Appointments",
     tags=["Queries"]
 )
@@ -170,9 +232,70 @@ async def get_doctor_appointments(
         doctor_name: str,
         start_date: Optional[datetime] = Query(None),
         end_date: Optional[datetime] = Query(None),
-        db: Session = Depends(get_db)
+        limit: int = Query(
+            settings.HISTORY_PAGE_SIZE_DEFAULT, ge=1, le=settings.HISTORY_PAGE_SIZE_MAX
+        ),
+        cursor: Optional[str] = Query(None),
+        db: Session = Depends(get_read_db)
 ):
-    """Get all appointments for a specific doctor"""
+    """Get a page of a doctor's appointments, oldest first"""
     query = GetAppointmentsByDoctorQuery(db)
-    appointments = await query.execute(doctor_name, start_date, end_date)
-    return [AppointmentResponse.model_validate(apt) for apt in appointments]
\ No newline at end of file
+    page = await query.execute(doctor_name, start_date, end_date, limit, cursor)
+    return _cursor_page(page)
+
+
+@router.get(
+    "/doctor/{doctor_name}/stream",
+    response_class=StreamingResponse,
+    summary="Stream Doctor Appointments (NDJSON)",
+    tags=["Queries"],
+    dependencies=[Depends(route_timeout(settings.HISTORY_STREAM_TIMEOUT_SECONDS))]
+)
+async def stream_doctor_appointments(
+        doctor_name: str,
+        start_date: Optional[datetime] = Query(None),
+        end_date: Optional[datetime] = Query(None),
+        cursor: Optional[str] = Query(None),
+        open_session: SessionFactory = Depends(get_read_session_factory)
+):
+    """Stream a doctor's appointments as NDJSON, oldest first (see _ndjson_response)"""
+    return _ndjson_response(
+        open_session,
+        lambda db: GetAppointmentsByDoctorQuery(db).stream(
+            doctor_name, start_date, end_date, cursor
+        )
+    )
+
+
+def _cursor_page(page: CursorPage) -> AppointmentCursorPage:
+    return AppointmentCursorPage(
+        items=[AppointmentResponse.model_validate(apt) for apt in page.items],
+        next_cursor=page.next_cursor
+    )
+
+
+def _ndjson_response(
+        open_session: SessionFactory,
+        pages: Callable[[Session], Iterator[CursorPage]]
+) -> StreamingResponse:
+    """
+    Stream pages as one JSON appointment per line.
+
+    The session is opened inside the body (dependency sessions are already
+    closed when it is sent) and only one batch is held in memory at a time.
+    If HISTORY_STREAM_MAX_ROWS stops the stream early, the last line is
+    ``{"next_cursor": ...}``; pass it as ?cursor= to continue.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        async with open_session() as db:
+            page = None
+            for page in pages(db):
+                yield b"".join(
+                    AppointmentResponse.model_validate(apt).model_dump_json().encode() + b"\n"
+                    for apt in page.items
+                )
+            if page is not None and page.next_cursor is not None:
+                yield orjson.dumps({"next_cursor": page.next_cursor}) + b"\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
@@ -86,4 +86,39 @@ class AppointmentListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    total_pages: int
\ No newline at end of file
+    total_pages: int
+
+
+class AppointmentCursorPage(BaseModel):
+    """
+    Schema for cursor-paginated responses (QUERY)
+    Used in: GetAppointmentsByPatientQuery, GetAppointmentsByDoctorQuery
+
+    Pass next_cursor back as ?cursor= for the next page; null on the last page.
+    """
+    items: list[AppointmentResponse]
+    next_cursor: Optional[str] = None
+
+
+class AppointmentSummary(BaseModel):
+    """
+    Schema for compact appointment rows (QUERY)
+    Used in: GetPatientAppointmentSummaryQuery (index-only columns)
+    """
+    id: int
+    appointment_date: datetime
+    status: AppointmentStatus
+    doctor_name: str
+    specialty: str
+
+    class Config:
+        from_attributes = True
+
+
+class AppointmentSummaryPage(BaseModel):
+    """
+    Schema for cursor-paginated appointment summaries (QUERY)
+    Used in: GetPatientAppointmentSummaryQuery
+    """
+    items: list[AppointmentSummary]
+    next_cursor: Optional[str] = None
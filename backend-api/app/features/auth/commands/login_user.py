@@ -5,6 +5,7 @@ Handles user authentication and JWT creation
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import UnauthorizedException
+from app.common.instrumentation import instrument_handler
 from app.core.security import create_access_token, verify_password
 from app.features.auth.models.user import User
 from app.features.auth.schemas.auth import LoginRequest, TokenResponse
@@ -24,6 +25,7 @@ class LoginUserCommand:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @instrument_handler
     async def execute(self, data: LoginRequest) -> TokenResponse:
         """
         Authenticate the user and return a JWT.
@@ -5,6 +5,7 @@ Handles user registration - modifies system state
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import ConflictException, InternalServerException
+from app.common.instrumentation import instrument_handler
 from app.core.security import hash_password
 from app.features.auth.models.user import User
 from app.features.auth.schemas.auth import RegisterRequest
@@ -24,6 +25,7 @@ class RegisterUserCommand:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @instrument_handler
     async def execute(self, data: RegisterRequest) -> User:
         """
         Execute user registration.
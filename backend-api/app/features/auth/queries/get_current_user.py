@@ -5,6 +5,7 @@ Retrieves the authenticated user from a verified JWT
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import UnauthorizedException
+from app.common.instrumentation import instrument_handler
 from app.features.auth.models.user import User
 
 
@@ -18,6 +19,7 @@ class GetCurrentUserQuery:
     def __init__(self, db: Session) -> None:
         self.db = db
 
+    @instrument_handler
     async def execute(self, email: str) -> User:
         """
         Retrieve the user identified by the JWT subject claim.
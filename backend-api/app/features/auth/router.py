@@ -2,7 +2,7 @@
 Auth Router
 FastAPI endpoints that use Commands and Queries (CQRS)
 """
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
 from app.common.dependencies.database import get_db
@@ -17,11 +17,7 @@ from app.features.auth.schemas.auth import (
 from app.features.auth.commands.register_user import RegisterUserCommand
 from app.features.auth.commands.login_user import LoginUserCommand
 from app.core.config import settings
-
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-
-limiter = Limiter(key_func=get_remote_address)
+from app.core.rate_limit import rate_limit
 
 router = APIRouter()
 
@@ -32,10 +28,9 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Register User",
     tags=["Commands"],
+    dependencies=[Depends(rate_limit(settings.RATE_LIMIT_AUTH, "auth:register"))],
 )
-@limiter.limit(settings.RATE_LIMIT_AUTH)
 async def register(
-    request: Request,
     data: RegisterRequest,
     db: Session = Depends(get_db),
 ) -> UserResponse:
@@ -50,10 +45,9 @@ async def register(
     response_model=TokenResponse,
     summary="Login",
     tags=["Commands"],
+    dependencies=[Depends(rate_limit(settings.RATE_LIMIT_AUTH, "auth:login"))],
 )
-@limiter.limit(settings.RATE_LIMIT_AUTH)
 async def login(
-    request: Request,
     data: LoginRequest,
     db: Session = Depends(get_db),
 ) -> TokenResponse:
@@ -0,0 +1,40 @@
+"""
+Doctor Lookups
+Resolve doctor names to doctors.id inside the caller's transaction
+"""
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.features.doctors.models.doctor import Doctor
+
+
+def find_doctor_id(db: Session, name: str) -> Optional[int]:
+    """Return the id of the doctor called ``name``, or None."""
+    return db.query(Doctor.id).filter(Doctor.name == name).scalar()
+
+
+def ensure_doctor_ids(db: Session, specialties: dict[str, str]) -> dict[str, int]:
+    """
+    Return ``{name: doctor id}`` for every name, creating missing doctors.
+
+    ``specialties`` maps each name to the specialty used if the doctor has
+    to be created. Each insert runs in a savepoint, so losing a race with a
+    concurrent insert of the same name re-reads the winner's row instead of
+    failing the caller's transaction.
+    """
+    ids = dict(
+        db.query(Doctor.name, Doctor.id).filter(Doctor.name.in_(list(specialties))).all()
+    )
+    for name, specialty in specialties.items():
+        if name in ids:
+            continue
+        doctor = Doctor(name=name, specialty=specialty)
+        try:
+            with db.begin_nested():
+                db.add(doctor)
+            ids[name] = doctor.id
+        except IntegrityError:
+            ids[name] = find_doctor_id(db, name)
+    return ids
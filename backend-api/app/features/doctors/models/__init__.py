@@ -0,0 +1,6 @@
+"""
+Doctors Models
+"""
+from app.features.doctors.models.doctor import Doctor
+
+__all__ = ["Doctor"]
@@ -0,0 +1,26 @@
+"""
+Doctor Model (SQLAlchemy)
+Domain entity for doctors, referenced by appointments
+"""
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from app.common.database.base import Base
+
+
+class Doctor(Base):
+    """Doctor database model"""
+    __tablename__ = "doctors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False, unique=True, index=True)
+    specialty = Column(String(100), nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self):
+        return f"<Doctor(id={self.id}, name={self.name}, specialty={self.specialty})>"
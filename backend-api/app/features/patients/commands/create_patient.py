@@ -4,6 +4,8 @@ Create Patient Command (CQRS)
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import ConflictException
+from app.common.instrumentation import instrument_handler
+from app.features.appointments.models.appointment import Appointment
 from app.features.patients.models.patient import Patient
 from app.features.patients.schemas.patient import PatientCreate
 
@@ -14,6 +16,7 @@ class CreatePatientCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, data: PatientCreate) -> Patient:
         existing = self.db.query(Patient).filter(Patient.email == data.email).first()
         if existing:
@@ -25,6 +28,12 @@ class CreatePatientCommand:
         patient = Patient(**data.model_dump())
 
         self.db.add(patient)
+        self.db.flush()
+        # Link appointments booked with this email before the patient registered
+        self.db.query(Appointment).filter(
+            Appointment.patient_email == patient.email,
+            Appointment.patient_id.is_(None),
+        ).update({Appointment.patient_id: patient.id}, synchronize_session=False)
         self.db.commit()
         self.db.refresh(patient)
         return patient
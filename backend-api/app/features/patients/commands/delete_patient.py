@@ -5,6 +5,7 @@ Soft-delete by setting is_active=False
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import BadRequestException, NotFoundException
+from app.common.instrumentation import instrument_handler
 from app.features.patients.models.patient import Patient
 
 
@@ -14,6 +15,7 @@ class DeletePatientCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, patient_id: int) -> Patient:
         patient = self.db.query(Patient).filter(Patient.id == patient_id).first()
         if not patient:
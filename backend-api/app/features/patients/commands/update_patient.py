@@ -4,6 +4,7 @@ Update Patient Command (CQRS)
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import ConflictException, NotFoundException
+from app.common.instrumentation import instrument_handler
 from app.features.patients.models.patient import Patient
 from app.features.patients.schemas.patient import PatientUpdate
 
@@ -14,6 +15,7 @@ class UpdatePatientCommand:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, patient_id: int, data: PatientUpdate) -> Patient:
         patient = self.db.query(Patient).filter(Patient.id == patient_id).first()
         if not patient:
@@ -0,0 +1,14 @@
+"""
+Patient Lookups
+Resolve patient emails to patients.id inside the caller's transaction
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.features.patients.models.patient import Patient
+
+
+def find_patient_id(db: Session, email: str) -> Optional[int]:
+    """Return the id of the registered patient with ``email``, or None."""
+    return db.query(Patient.id).filter(Patient.email == email).scalar()
@@ -4,6 +4,7 @@ Get Patient Query (CQRS)
 from sqlalchemy.orm import Session
 
 from app.common.exceptions import NotFoundException
+from app.common.instrumentation import instrument_handler
 from app.features.patients.models.patient import Patient
 
 
@@ -13,6 +14,7 @@ class GetPatientQuery:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(self, patient_id: int) -> Patient:
         patient = self.db.query(Patient).filter(Patient.id == patient_id).first()
         if not patient:
@@ -7,6 +7,7 @@ from typing import Optional
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
 
+from app.common.instrumentation import instrument_handler
 from app.features.patients.models.patient import Patient
 
 
@@ -16,6 +17,7 @@ class ListPatientsQuery:
     def __init__(self, db: Session):
         self.db = db
 
+    @instrument_handler
     async def execute(
         self,
         page: int = 1,
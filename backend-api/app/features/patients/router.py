@@ -7,7 +7,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
-from app.common.dependencies.database import get_db
+from app.common.dependencies.database import get_db, get_read_db
 from app.features.patients.commands.create_patient import CreatePatientCommand
 from app.features.patients.commands.delete_patient import DeletePatientCommand
 from app.features.patients.commands.update_patient import UpdatePatientCommand
@@ -51,7 +51,7 @@ async def list_patients(
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None),
     is_active: Optional[bool] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> PatientListResponse:
     """List patients with pagination and search."""
     query = ListPatientsQuery(db)
@@ -75,7 +75,7 @@ async def list_patients(
 )
 async def get_patient(
     patient_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> PatientResponse:
     """Get a single patient by ID."""
     query = GetPatientQuery(db)
@@ -2,26 +2,32 @@
 FastAPI Main Application
 Vertical Slice Architecture + CQRS Pattern
 """
-import logging
+import asyncio
+import contextlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-import redis.asyncio as aioredis
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from prometheus_fastapi_instrumentator import Instrumentator
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from sqlalchemy import text
 from starlette.exceptions import HTTPException
 
+from app.core.concurrency import ConcurrencyLimitMiddleware
 from app.core.config import settings
-from app.common.database.session import AsyncSessionLocal
+from app.core.deadline import DeadlineMiddleware, enable_statement_timeouts
+from app.common.redis.client import close_redis_client
+from app.core.health import health_checker
 from app.core.logging import setup_logging
+from app.core.metrics import mark_worker_dead, setup_metrics
 from app.core.middleware import CorrelationIdMiddleware
-from app.core.tracing import setup_tracing, instrument_redis, shutdown_tracing
+from app.core.profiling import ProfilingMiddleware, router as profiling_router
+from app.core.tracing import setup_tracing, instrument_redis, instrument_sqlalchemy, shutdown_tracing
+from app.core.warmup import start_warm_up
+from app.common.database.notify import invalidation_listener
+from app.common.database.session import engine, read_engines
 from app.common.exceptions import AppException
+from app.common.instrumentation import enable_handler_metrics
 from app.common.exceptions.handlers import (
     app_exception_handler,
     validation_exception_handler,
@@ -33,10 +39,39 @@ from app.features.auth.router import router as auth_router
 from app.features.patients.router import router as patients_router
 
 # Configure structured JSON logging
-setup_logging()
+setup_logging(settings.LOG_LEVEL, settings.LOG_QUEUE_MAX_SIZE)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Worker lifecycle.
+
+    Startup: instrument database engines, start the background dependency
+    health checker, the cache invalidation listener and warm-up (readiness
+    stays pending until it finishes).
+    Shutdown: stop background tasks, close Redis, shut down the tracer
+    provider and drop this worker's live metrics.
+    """
+    for db_engine in (engine, *read_engines):
+        instrument_sqlalchemy(db_engine)
+    health_checker.start()
+    if settings.CACHE_INVALIDATION_LISTENER_ENABLED:
+        invalidation_listener.start()
+    warmup_task = start_warm_up(app, health_checker) if settings.WARMUP_ENABLED else None
+
+    yield
+
+    if warmup_task is not None:
+        warmup_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warmup_task
+    await health_checker.stop()
+    await invalidation_listener.stop()
+    await close_redis_client()
+    shutdown_tracing()
+    mark_worker_dead()
 
-# Rate limiter instance
-limiter = Limiter(key_func=get_remote_address)
 
 # Create FastAPI application
 app = FastAPI(
@@ -45,25 +80,17 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
-# Rate limiter state
-app.state.limiter = limiter
-
 # OpenTelemetry distributed tracing
 setup_tracing(app)
 instrument_redis()
 
-
-def _rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
-    return JSONResponse(
-        status_code=429,
-        content={"status_code": 429, "message": "Rate limit exceeded", "detail": str(exc.detail)},
-    )
-
-
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+# Per-handler and per-SQL-statement latency histograms
+if settings.HANDLER_METRICS_ENABLED:
+    enable_handler_metrics()
 
 # CORS middleware - environment-specific (no wildcards in production)
 cors_origins = settings.BACKEND_CORS_ORIGINS
@@ -72,12 +99,25 @@ if settings.ENVIRONMENT == "production" and "*" in cors_origins:
 
 app.add_middleware(CorrelationIdMiddleware)
 
+# On-demand CPU profiling for administrators (disabled by default)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Request deadlines, propagated to PostgreSQL statement_timeout
+app.add_middleware(DeadlineMiddleware)
+if settings.DB_STATEMENT_TIMEOUT_FROM_DEADLINE:
+    enable_statement_timeouts()
+
+# Load shedding: inside CORS so rejected responses still carry CORS headers
+if settings.CONCURRENCY_LIMIT_ENABLED:
+    app.add_middleware(ConcurrencyLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "X-Request-Timeout-Ms"],
 )
 
 # Register exception handlers
@@ -86,8 +126,8 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Prometheus metrics instrumentation
-Instrumentator().instrument(app).expose(app)
+# Prometheus metrics instrumentation (multiprocess-aware)
+setup_metrics(app)
 
 # Include feature routers (Vertical Slices)
 app.include_router(
@@ -105,6 +145,8 @@ app.include_router(
     prefix=f"{settings.API_V1_PREFIX}/patients",
     tags=["Patients"]
 )
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router, prefix="/admin", tags=["Admin"])
 
 
 @app.get("/")
@@ -145,55 +187,16 @@ async def readiness_check() -> JSONResponse:
     """
     Readiness check endpoint for Kubernetes readiness probe.
 
-    Checks:
+    Returns the state cached by the background health checker:
     - Database (PostgreSQL) connectivity via SELECT 1
     - Redis connectivity via PING
+    - Connection pool saturation
+    - Startup warm-up completion
 
-    Returns 200 when all dependencies are reachable, 503 otherwise.
+    No I/O happens here. Returns 200 when all checks pass, 503 otherwise.
     """
-    logger = logging.getLogger(__name__)
-    checks: dict[str, str] = {}
-
-    # Check database connectivity
-    try:
-        async with AsyncSessionLocal() as session:
-            await session.execute(text("SELECT 1"))
-        checks["database"] = "ok"
-    except Exception as exc:
-        logger.error("Readiness probe: database check failed: %s", exc)
-        checks["database"] = "failed"
-
-    # Check Redis connectivity
-    try:
-        redis_client = aioredis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            socket_connect_timeout=2,
-        )
-        try:
-            await redis_client.ping()
-            checks["redis"] = "ok"
-        finally:
-            await redis_client.aclose()
-    except Exception as exc:
-        logger.error("Readiness probe: redis check failed: %s", exc)
-        checks["redis"] = "failed"
-
-    all_ok = all(v == "ok" for v in checks.values())
-    status_code = 200 if all_ok else 503
-    body = {
-        "status": "ready" if all_ok else "not_ready",
-        "checks": checks,
-    }
-
-    return JSONResponse(content=body, status_code=status_code)
-
-
-@app.on_event("shutdown")
-async def on_shutdown() -> None:
-    """Gracefully shut down the OpenTelemetry tracer provider."""
-    shutdown_tracing()
+    ready, body = health_checker.snapshot()
+    return JSONResponse(content=body, status_code=200 if ready else 503)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+Maintenance Tasks (Celery)
+Online data migrations and index upkeep that run next to live traffic
+"""
+import asyncio
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.celery.celery_app import celery_app
+from app.core.config import settings
+from app.features.appointments.backfill import backfill_foreign_keys_batch
+from app.features.appointments.projection import project_appointments_batch
+
+logger = logging.getLogger(__name__)
+
+BRIN_INDEX = "ix_appointments_appointment_date_brin"
+RECENT_INDEX = "ix_appointments_appointment_date_recent"
+
+
+async def _run_batch(batch, after_id: int, batch_size: int) -> int | None:
+    # One connection per batch: the worker keeps no pool between runs
+    engine = create_async_engine(settings.ASYNC_DATABASE_URL, poolclass=NullPool)
+    try:
+        async with AsyncSession(engine) as session:
+            return await session.run_sync(batch, after_id, batch_size)
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, max_retries=5, default_retry_delay=30)
+def backfill_appointment_foreign_keys(self, after_id: int = 0):
+    """
+    Set doctor_id / patient_id on existing appointments, one batch per run
+
+    Each run links FK_BACKFILL_BATCH_SIZE rows and re-enqueues itself after
+    FK_BACKFILL_PAUSE_SECONDS, so the backfill yields to live traffic and a
+    restart resumes from the last committed batch. Start it once with:
+
+        backfill_appointment_foreign_keys.delay()
+    """
+    try:
+        last_id = asyncio.run(
+            _run_batch(backfill_foreign_keys_batch, after_id, settings.FK_BACKFILL_BATCH_SIZE)
+        )
+    except Exception as exc:
+        logger.warning(f"FK backfill batch after id {after_id} failed: {exc}")
+        raise self.retry(exc=exc) from exc
+
+    if last_id is None:
+        logger.info("Appointment foreign key backfill complete")
+        return {"status": "complete", "last_id": after_id}
+
+    self.apply_async(
+        kwargs={"after_id": last_id},
+        countdown=settings.FK_BACKFILL_PAUSE_SECONDS,
+    )
+    return {"status": "running", "last_id": last_id}
+
+
+@celery_app.task(bind=True, max_retries=5, default_retry_delay=30)
+def rebuild_appointment_listings(self, after_id: int = 0):
+    """
+    Re-project appointments into the appointment_listings read model
+
+    The commands keep the read model in sync; this catches up rows written
+    outside them (before the read model was deployed, manual fixes). Runs in
+    batches of LISTING_REBUILD_BATCH_SIZE rows with
+    LISTING_REBUILD_PAUSE_SECONDS between them, like the FK backfill:
+
+        rebuild_appointment_listings.delay()
+    """
+    try:
+        last_id = asyncio.run(
+            _run_batch(project_appointments_batch, after_id, settings.LISTING_REBUILD_BATCH_SIZE)
+        )
+    except Exception as exc:
+        logger.warning(f"Listing rebuild batch after id {after_id} failed: {exc}")
+        raise self.retry(exc=exc) from exc
+
+    if last_id is None:
+        logger.info("Appointment listing rebuild complete")
+        return {"status": "complete", "last_id": after_id}
+
+    self.apply_async(
+        kwargs={"after_id": last_id},
+        countdown=settings.LISTING_REBUILD_PAUSE_SECONDS,
+    )
+    return {"status": "running", "last_id": last_id}
+
+
+async def _roll_recent_index(cutoff: date) -> bool:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with engine.connect() as conn:
+            if await conn.scalar(text("SELECT to_regclass(:name)"), {"name": BRIN_INDEX}) is None:
+                return False
+            # Build the replacement first so the recent range is never unindexed
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {RECENT_INDEX}_new"))
+            await conn.execute(
+                text(
+                    f"CREATE INDEX CONCURRENTLY {RECENT_INDEX}_new ON appointments "
+                    f"(appointment_date) WHERE appointment_date >= '{cutoff.isoformat()}'"
+                )
+            )
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {RECENT_INDEX}"))
+            await conn.execute(text(f"ALTER INDEX {RECENT_INDEX}_new RENAME TO {RECENT_INDEX}"))
+            return True
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(bind=True, max_retries=3, default_retry_delay=300)
+def roll_recent_appointment_date_index(self):
+    """
+    Move the cutoff of the recent appointment_date btree forward
+
+    Only applies when the BRIN option of migration d7e2f4a9c3b6 is in use;
+    otherwise it does nothing. Run it weekly or so (cron, scheduler) so the
+    partial index keeps covering APPOINTMENT_DATE_RECENT_INDEX_DAYS days
+    without growing with the whole table.
+    """
+    cutoff = date.today() - timedelta(days=settings.APPOINTMENT_DATE_RECENT_INDEX_DAYS)
+    try:
+        rolled = asyncio.run(_roll_recent_index(cutoff))
+    except Exception as exc:
+        logger.warning(f"Rolling {RECENT_INDEX} failed: {exc}")
+        raise self.retry(exc=exc) from exc
+
+    if not rolled:
+        return {"status": "skipped", "reason": f"{BRIN_INDEX} not present"}
+    logger.info(f"{RECENT_INDEX} now covers appointments from {cutoff}")
+    return {"status": "rolled", "cutoff": cutoff.isoformat()}
@@ -0,0 +1,110 @@
+"""
+Logging Hot-Path Microbenchmarks
+
+Per-operation cost (ns/op, best of ``--repeat``) of each step a log call
+goes through under the app's configuration, next to the implementations
+they replaced:
+
+- correlation ID: per-record filter with a function-local import (old) vs.
+  the LogRecord factory installed by ``setup_logging``;
+- timestamp: ``logging.Formatter.formatTime`` vs. the per-second cached
+  ``CustomJsonFormatter.formatTime``;
+- ``CustomJsonFormatter.format`` for a request-completed record;
+- ``NonBlockingQueueHandler.handle`` (caller-side cost of a log call);
+- ``logger.info`` end-to-end on the caller thread after ``setup_logging``.
+
+Usage (from backend-api/):
+    python -m benchmarks.logging_hotpath --number 100000
+"""
+import argparse
+import contextlib
+import io
+import logging
+import queue
+import timeit
+from typing import Callable
+
+from app.core import logging as app_logging
+from app.core.logging import CustomJsonFormatter, NonBlockingQueueHandler
+
+EXTRA = {"method": "GET", "path": "/api/v1/appointments/", "status_code": 200, "duration_ms": 12.34}
+
+
+class LegacyCorrelationLogFilter(logging.Filter):
+    """Previous implementation: imports the accessor on every record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        from app.core.middleware import get_correlation_id
+
+        record.correlation_id = get_correlation_id()
+        return True
+
+
+def _record() -> logging.LogRecord:
+    record = logging.getLogRecordFactory()(
+        "app.core.middleware", logging.INFO, __file__, 1, "Request completed", None, None
+    )
+    record.__dict__.update(EXTRA)
+    return record
+
+
+def _bench(name: str, fn: Callable[[], object], number: int, repeat: int) -> None:
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    print(f"{name:<48} {best / number * 1e9:>10.0f} ns/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    number, repeat = args.number, args.repeat
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        app_logging.setup_logging("INFO", queue_size=number * repeat + 1)
+    factory = logging.getLogRecordFactory()
+    record = _record()
+    legacy_filter = LegacyCorrelationLogFilter()
+    plain_formatter = logging.Formatter()
+    formatter = CustomJsonFormatter()
+    queue_handler = NonBlockingQueueHandler(queue.SimpleQueue())  # type: ignore[arg-type]
+    logger = logging.getLogger("app.bench")
+
+    print(f"{'operation':<48} {'cost':>16}")
+    _bench(
+        "LogRecord: default factory + legacy filter",
+        lambda: legacy_filter.filter(
+            logging.LogRecord("app", logging.INFO, __file__, 1, "msg", None, None)
+        ),
+        number,
+        repeat,
+    )
+    _bench(
+        "LogRecord: correlation factory",
+        lambda: factory("app", logging.INFO, __file__, 1, "msg", None, None),
+        number,
+        repeat,
+    )
+    _bench(
+        "formatTime: logging.Formatter", lambda: plain_formatter.formatTime(record), number, repeat
+    )
+    _bench(
+        "formatTime: CustomJsonFormatter (cached)",
+        lambda: formatter.formatTime(record),
+        number,
+        repeat,
+    )
+    _bench("CustomJsonFormatter.format", lambda: formatter.format(record), number, repeat)
+    _bench("NonBlockingQueueHandler.handle", lambda: queue_handler.handle(record), number, repeat)
+    _bench(
+        "logger.info (app configuration, caller side)",
+        lambda: logger.info("Request completed", extra=EXTRA),
+        number,
+        repeat,
+    )
+
+    app_logging.stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Logging Throughput Benchmark
+
+Measures how many request-style log calls per second (a message plus a few
+``extra`` fields) the calling thread, i.e. the event loop, can issue with:
+- a synchronous StreamHandler + CustomJsonFormatter (previous setup);
+- the NonBlockingQueueHandler + DrainingQueueListener pipeline.
+
+Both run against a fast sink (a temporary file) and a slow sink that adds a
+fixed latency per write, like stdout piped to a busy container log driver.
+For the queue pipeline the end-to-end rate (until the listener has written
+everything) and the records dropped by the bounded queue are reported too.
+
+Usage (from backend-api/):
+    python -m benchmarks.logging_throughput --records 50000 --write-latency-us 50
+"""
+import argparse
+import logging
+import queue
+import tempfile
+import time
+from typing import IO
+
+from app.core.logging import (
+    CustomJsonFormatter,
+    DrainingQueueListener,
+    NonBlockingQueueHandler,
+    _install_correlation_record_factory,
+)
+
+EXTRA = {"method": "GET", "path": "/api/v1/appointments/", "status_code": 200, "duration_ms": 12.34}
+
+
+class SlowStream:
+    """File wrapper that sleeps on every write to emulate a back-pressured pipe."""
+
+    def __init__(self, stream: IO[str], latency: float) -> None:
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.propagate = False
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _emit(logger: logging.Logger, records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.info("Request completed", extra=EXTRA)
+    return time.perf_counter() - start
+
+
+def bench_sync(records: int, stream) -> float:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(CustomJsonFormatter())
+    return _emit(_logger("sync", handler), records)
+
+
+def bench_queue(records: int, stream, queue_size: int) -> tuple[float, float, int]:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(CustomJsonFormatter())
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    listener = DrainingQueueListener(log_queue, handler)
+    listener.start()
+
+    start = time.perf_counter()
+    caller = _emit(_logger("queue", queue_handler), records)
+    listener.stop()
+    return caller, time.perf_counter() - start, queue_handler.dropped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    parser.add_argument("--write-latency-us", type=float, default=50.0)
+    args = parser.parse_args()
+    _install_correlation_record_factory()
+
+    def rate(seconds: float) -> str:
+        return f"{args.records / seconds:>10,.0f}/s"
+
+    print(f"{'pipeline':<34} {'caller':>12} {'end-to-end':>12} {'dropped':>8}")
+    with tempfile.TemporaryFile("w") as file:
+        sinks = {"fast sink": file, "slow sink": SlowStream(file, args.write_latency_us / 1e6)}
+        for sink_name, stream in sinks.items():
+            sync = bench_sync(args.records, stream)
+            print(f"{'sync, ' + sink_name:<34} {rate(sync):>12} {rate(sync):>12} {0:>8}")
+            caller, total, dropped = bench_queue(args.records, stream, args.queue_size)
+            label = f"queue({args.queue_size}), {sink_name}"
+            print(f"{label:<34} {rate(caller):>12} {rate(total):>12} {dropped:>8}")
+
+
+if __name__ == "__main__":
+    main()
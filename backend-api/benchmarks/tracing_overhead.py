@@ -0,0 +1,115 @@
+"""
+Tracing Overhead Benchmark
+
+Measures per-request latency of an in-process FastAPI route that runs two SQL
+statements (COUNT + page fetch, like ListAppointmentsQuery) with tracing off
+and with each sampler configuration. Spans go through the production
+BatchSpanProcessor into an in-memory exporter, so no collector is needed.
+
+Usage (from backend-api/):
+    python -m benchmarks.tracing_overhead --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Optional
+
+import httpx
+from fastapi import FastAPI
+from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.tracing import _create_tracer_provider, instrument_sqlalchemy
+
+SCENARIOS: list[tuple[str, Optional[dict]]] = [
+    ("tracing off", None),
+    ("always_on", {"OTEL_SAMPLER": "always_on"}),
+    ("ratio 0.1", {"OTEL_SAMPLER": "parentbased_traceidratio", "OTEL_SAMPLER_RATIO": 0.1}),
+    ("ratio 0.01", {"OTEL_SAMPLER": "parentbased_traceidratio", "OTEL_SAMPLER_RATIO": 0.01}),
+    (
+        "ratelimited 10/s",
+        {"OTEL_SAMPLER": "parentbased_ratelimited", "OTEL_SAMPLER_MAX_TRACES_PER_SECOND": 10},
+    ),
+]
+
+
+def _build_app(tracing: Optional[dict]) -> tuple[FastAPI, Optional[InMemorySpanExporter]]:
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(
+            text("INSERT INTO items (name) VALUES (:name)"),
+            [{"name": f"item-{i}"} for i in range(100)],
+        )
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def list_items() -> dict:
+        with engine.connect() as conn:
+            total = conn.execute(text("SELECT count(*) FROM items")).scalar()
+            rows = conn.execute(text("SELECT id, name FROM items LIMIT 20")).all()
+        return {"total": total, "items": [{"id": r.id, "name": r.name} for r in rows]}
+
+    if tracing is None:
+        return app, None
+
+    for key, value in tracing.items():
+        setattr(settings, key, value)
+    exporter = InMemorySpanExporter()
+    provider = _create_tracer_provider(exporter)
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider)
+    instrument_sqlalchemy(engine, tracer_provider=provider)
+    app.state.tracer_provider = provider
+    return app, exporter
+
+
+async def _measure(app: FastAPI, requests: int, warmup: int) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(warmup):
+            await client.get("/items")
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get("/items")
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+    return samples
+
+
+def run(requests: int, warmup: int) -> None:
+    baseline: Optional[float] = None
+    print(
+        f"{'scenario':<18} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'overhead':>9} {'spans':>7}"
+    )
+    for name, tracing in SCENARIOS:
+        app, exporter = _build_app(tracing)
+        samples = asyncio.run(_measure(app, requests, warmup))
+        spans = 0
+        if exporter is not None:
+            app.state.tracer_provider.shutdown()
+            spans = len(exporter.get_finished_spans())
+
+        mean = statistics.fmean(samples) * 1e6
+        p50 = statistics.median(samples) * 1e6
+        p99 = statistics.quantiles(samples, n=100)[98] * 1e6
+        baseline = baseline or mean
+        print(
+            f"{name:<18} {mean:>9.0f} {p50:>9.0f} {p99:>9.0f} "
+            f"{(mean / baseline - 1) * 100:>8.1f}% {spans:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    args = parser.parse_args()
+    run(args.requests, args.warmup)
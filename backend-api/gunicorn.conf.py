@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration for the production API server.
+
+Uvicorn workers under a gunicorn master:
+- ``preload_app``: app.main is imported once in the master, workers share the
+  imported modules copy-on-write and start faster;
+- ``post_fork``: each worker replaces sockets and threads inherited from the
+  master (app.core.server.reinitialize_after_fork);
+- ``max_requests`` + ``max_requests_jitter``: workers are recycled gracefully,
+  at staggered points so they do not all restart together;
+- a dead worker's live Prometheus gauges are removed when it exits (the
+  container entrypoint empties the multiprocess directory before start;
+  ``on_starting`` would run after the preloaded import created metric files).
+
+Values come from the GUNICORN_* settings and can be overridden on the
+command line.
+
+Usage (from backend-api/):
+    gunicorn -c gunicorn.conf.py app.main:app
+"""
+from app.core.config import settings
+
+bind = settings.GUNICORN_BIND
+workers = settings.GUNICORN_WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+max_requests = settings.GUNICORN_MAX_REQUESTS
+max_requests_jitter = settings.GUNICORN_MAX_REQUESTS_JITTER
+
+timeout = settings.GUNICORN_TIMEOUT
+graceful_timeout = settings.GUNICORN_GRACEFUL_TIMEOUT
+keepalive = settings.GUNICORN_KEEPALIVE
+
+# Worker heartbeat files on tmpfs; a disk-backed /tmp can stall heartbeats
+worker_tmp_dir = "/dev/shm"
+
+# Request logs come from the app's CorrelationIdMiddleware
+accesslog = None
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    from app.core.server import reinitialize_after_fork
+
+    reinitialize_after_fork()
+
+
+def child_exit(server, worker):
+    from app.core.metrics import mark_worker_dead
+
+    mark_worker_dead(worker.pid)
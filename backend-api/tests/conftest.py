@@ -8,7 +8,10 @@ from datetime import datetime, timedelta
 
 from app.common.database.base import Base
 from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.models.appointment_listing import AppointmentListing  # noqa: F401
+from app.features.appointments.projection import project_appointment
 from app.features.patients.models.patient import Patient  # noqa: F401 - needed for table creation
+from app.features.doctors.models.doctor import Doctor  # noqa: F401
 
 # Test database URL (usar SQLite en memoria para tests)
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -82,6 +85,9 @@ def create_test_appointment(db_session):
 
         appointment = Appointment(**default_data)
         db_session.add(appointment)
+        db_session.flush()
+        # Keep the list read model in sync, as the commands do
+        project_appointment(db_session, appointment)
         db_session.commit()
         db_session.refresh(appointment)
 
@@ -2,6 +2,8 @@
 Integration test fixtures
 Shared conftest for TestClient-based integration tests.
 """
+from contextlib import asynccontextmanager
+
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
@@ -10,9 +12,11 @@ from fastapi.testclient import TestClient
 
 from app.common.database.base import Base
 from app.features.appointments.models.appointment import Appointment  # noqa: F401
+from app.features.appointments.models.appointment_listing import AppointmentListing  # noqa: F401
 from app.features.patients.models.patient import Patient  # noqa: F401
+from app.features.doctors.models.doctor import Doctor  # noqa: F401
 from app.features.auth.models.user import User
-from app.common.dependencies.database import get_db
+from app.common.dependencies.database import get_db, get_read_db, get_read_session_factory
 from app.core.security import hash_password, create_access_token
 from app.main import app
 
@@ -45,7 +49,13 @@ def test_db():
         finally:
             pass
 
+    @asynccontextmanager
+    async def open_test_session():
+        yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: open_test_session
 
     yield session
 
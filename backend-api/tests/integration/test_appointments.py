@@ -2,11 +2,14 @@
 Integration tests for appointments feature (US-14)
 Tests the full HTTP request/response cycle via TestClient.
 """
+import json
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock
 
 import pytest
 
+from app.core.config import settings
+
 
 @pytest.fixture(autouse=True)
 def mock_celery(monkeypatch):
@@ -118,3 +121,78 @@ class TestUpdateAppointment:
 
         assert response.status_code == 200
         assert response.json()["doctor_name"] == "Dr. Updated"
+
+
+class TestAppointmentHistory:
+    def _create(self, client, count: int, **overrides) -> None:
+        for day in range(1, count + 1):
+            date = (datetime.now(timezone.utc) + timedelta(days=day)).isoformat()
+            client.post(
+                "/api/v1/appointments/",
+                json=_appointment_payload(appointment_date=date, **overrides),
+            )
+
+    def test_doctor_history_is_cursor_paginated(self, client):
+        self._create(client, 5)
+
+        first = client.get("/api/v1/appointments/doctor/Dr. Test", params={"limit": 3}).json()
+        second = client.get(
+            "/api/v1/appointments/doctor/Dr. Test",
+            params={"limit": 3, "cursor": first["next_cursor"]},
+        ).json()
+
+        assert len(first["items"]) == 3
+        assert len(second["items"]) == 2
+        assert second["next_cursor"] is None
+        ids = [item["id"] for item in first["items"] + second["items"]]
+        assert len(set(ids)) == 5
+
+    def test_patient_summary(self, client):
+        self._create(client, 2)
+
+        response = client.get("/api/v1/appointments/patient/patient@example.com/summary")
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert len(items) == 2
+        assert set(items[0]) == {"id", "appointment_date", "status", "doctor_name", "specialty"}
+
+    def test_patient_history_rejects_oversized_page(self, client):
+        response = client.get(
+            "/api/v1/appointments/patient/patient@example.com", params={"limit": 100000}
+        )
+
+        assert response.status_code == 422
+
+    def test_invalid_cursor_returns_400(self, client):
+        response = client.get(
+            "/api/v1/appointments/patient/patient@example.com", params={"cursor": "garbage"}
+        )
+
+        assert response.status_code == 400
+
+    def test_patient_history_streams_ndjson(self, client):
+        self._create(client, 3)
+
+        response = client.get("/api/v1/appointments/patient/patient@example.com/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 3
+        dates = [line["appointment_date"] for line in lines]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_stream_stops_at_row_cap_with_resume_cursor(self, client, monkeypatch):
+        self._create(client, 3)
+        monkeypatch.setattr(settings, "HISTORY_STREAM_BATCH_SIZE", 1)
+        monkeypatch.setattr(settings, "HISTORY_STREAM_MAX_ROWS", 2)
+
+        lines = client.get("/api/v1/appointments/doctor/Dr. Test/stream").text.splitlines()
+        rest = client.get(
+            "/api/v1/appointments/doctor/Dr. Test/stream",
+            params={"cursor": json.loads(lines[-1])["next_cursor"]},
+        ).text.splitlines()
+
+        assert len(lines) == 3
+        assert len(rest) == 1
@@ -0,0 +1,147 @@
+"""
+Unit tests for primary/replica session routing (CQRS read/write split).
+"""
+import time
+
+import pytest
+from fastapi import Request, Response
+
+from app.common.dependencies import database
+from app.common.dependencies.database import READ_YOUR_WRITES_COOKIE
+from app.core.circuit_breaker import CircuitOpenException, CircuitState, database_breaker
+from app.core.config import Settings
+from app.features.doctors.models.doctor import Doctor
+
+PRIMARY = object()
+REPLICA = object()
+
+
+def _request(cookie: str | None = None) -> Request:
+    headers = []
+    if cookie is not None:
+        headers.append((b"cookie", f"{READ_YOUR_WRITES_COOKIE}={cookie}".encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def with_replica(monkeypatch):
+    monkeypatch.setattr(database, "AsyncSessionLocal", PRIMARY)
+    monkeypatch.setattr(database, "ReadSessionLocals", [REPLICA])
+    monkeypatch.setattr(database, "next_read_sessionmaker", lambda: REPLICA)
+
+
+class TestReadSessionRouting:
+    """Tests for get_read_db session factory selection"""
+
+    def test_without_replicas_reads_use_primary(self, monkeypatch) -> None:
+        monkeypatch.setattr(database, "AsyncSessionLocal", PRIMARY)
+        monkeypatch.setattr(database, "ReadSessionLocals", [])
+
+        assert database._read_sessionmaker(_request()) is PRIMARY
+
+    def test_reads_use_replica(self, with_replica) -> None:
+        assert database._read_sessionmaker(_request()) is REPLICA
+
+    def test_recent_write_sticks_to_primary(self, with_replica) -> None:
+        cookie = f"{time.time() + 5:.3f}"
+
+        assert database._read_sessionmaker(_request(cookie)) is PRIMARY
+
+    def test_expired_write_window_uses_replica(self, with_replica) -> None:
+        cookie = f"{time.time() - 1:.3f}"
+
+        assert database._read_sessionmaker(_request(cookie)) is REPLICA
+
+    def test_malformed_cookie_uses_replica(self, with_replica) -> None:
+        assert database._read_sessionmaker(_request("not-a-number")) is REPLICA
+
+
+class TestWriteSession:
+    """Tests for the read-your-writes cookie set by get_db"""
+
+    @pytest.mark.asyncio
+    async def test_session_without_commit_sets_no_cookie(self, monkeypatch) -> None:
+        monkeypatch.setattr(database, "ReadSessionLocals", [REPLICA])
+        response = Response()
+
+        generator = database.get_db(response)
+        session = await generator.__anext__()
+        await generator.aclose()
+
+        assert session is not None
+        assert "set-cookie" not in response.headers
+
+    def test_committed_write_sets_primary_cookie(self, db_session) -> None:
+        response = Response()
+        database.pin_reads_after_commit(db_session, response)
+
+        db_session.add(Doctor(name="Dr. Cookie", specialty="General"))
+        db_session.commit()
+
+        assert READ_YOUR_WRITES_COOKIE in response.headers["set-cookie"]
+
+    def test_read_only_commit_sets_no_cookie(self, db_session) -> None:
+        response = Response()
+        database.pin_reads_after_commit(db_session, response)
+
+        db_session.query(Doctor).all()
+        db_session.commit()
+
+        assert "set-cookie" not in response.headers
+
+    def test_rolled_back_write_sets_no_cookie(self, db_session) -> None:
+        response = Response()
+        database.pin_reads_after_commit(db_session, response)
+
+        db_session.add(Doctor(name="Dr. Cookie", specialty="General"))
+        db_session.flush()
+        db_session.rollback()
+        db_session.commit()
+
+        assert "set-cookie" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_write_sets_no_cookie_without_replicas(self, monkeypatch) -> None:
+        monkeypatch.setattr(database, "ReadSessionLocals", [])
+        response = Response()
+
+        generator = database.get_db(response)
+        await generator.__anext__()
+        await generator.aclose()
+
+        assert "set-cookie" not in response.headers
+
+
+class TestSessionCircuitBreaker:
+    """Tests for failing fast while the database circuit is open"""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_rejects_before_opening_session(self, monkeypatch) -> None:
+        monkeypatch.setattr(database, "ReadSessionLocals", [])
+        breaker = database_breaker(database.AsyncSessionLocal.kw["bind"])
+        monkeypatch.setattr(breaker, "enabled", True)
+        breaker._transition(CircuitState.OPEN)
+
+        generator = database.get_db(Response())
+        try:
+            with pytest.raises(CircuitOpenException) as exc_info:
+                await generator.__anext__()
+        finally:
+            breaker._transition(CircuitState.CLOSED)
+
+        assert exc_info.value.status_code == 503
+
+
+class TestReadUrls:
+    """Tests for DATABASE_READ_URL parsing"""
+
+    def test_multiple_replicas_are_converted_to_asyncpg(self) -> None:
+        settings = Settings(DATABASE_READ_URL="postgresql://r1:5432/db, postgresql://r2:5432/db")
+
+        assert settings.ASYNC_DATABASE_READ_URLS == [
+            "postgresql+asyncpg://r1:5432/db",
+            "postgresql+asyncpg://r2:5432/db",
+        ]
+
+    def test_empty_read_url_means_no_replicas(self) -> None:
+        assert Settings(DATABASE_READ_URL="").ASYNC_DATABASE_READ_URLS == []
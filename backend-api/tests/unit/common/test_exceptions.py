@@ -16,6 +16,9 @@ from app.common.exceptions import (
     UnauthorizedException,
     ForbiddenException,
     ConflictException,
+    TooManyRequestsException,
+    ServiceUnavailableException,
+    GatewayTimeoutException,
     InternalServerException,
 )
 from app.common.exceptions.schemas import ErrorResponse
@@ -135,6 +138,46 @@ class TestConflictException:
         assert isinstance(ConflictException(), AppException)
 
 
+class TestTooManyRequestsException:
+    def test_default_values(self) -> None:
+        exc = TooManyRequestsException()
+        assert exc.status_code == 429
+        assert exc.message == "Rate limit exceeded"
+        assert exc.headers is None
+
+    def test_retry_after_header(self) -> None:
+        exc = TooManyRequestsException(retry_after=12)
+        assert exc.headers == {"Retry-After": "12"}
+
+    def test_inherits_app_exception(self) -> None:
+        assert isinstance(TooManyRequestsException(), AppException)
+
+
+class TestServiceUnavailableException:
+    def test_default_values(self) -> None:
+        exc = ServiceUnavailableException()
+        assert exc.status_code == 503
+        assert exc.message == "Service Unavailable"
+        assert exc.headers is None
+
+    def test_retry_after_header(self) -> None:
+        exc = ServiceUnavailableException(retry_after=1)
+        assert exc.headers == {"Retry-After": "1"}
+
+    def test_inherits_app_exception(self) -> None:
+        assert isinstance(ServiceUnavailableException(), AppException)
+
+
+class TestGatewayTimeoutException:
+    def test_default_values(self) -> None:
+        exc = GatewayTimeoutException()
+        assert exc.status_code == 504
+        assert exc.message == "Gateway Timeout"
+
+    def test_inherits_app_exception(self) -> None:
+        assert isinstance(GatewayTimeoutException(), AppException)
+
+
 class TestInternalServerException:
     def test_default_values(self) -> None:
         exc = InternalServerException()
@@ -248,6 +291,17 @@ class TestAppExceptionHandler:
         assert body["status_code"] == 500
         assert body["detail"] == "DB down"
 
+    @pytest.mark.asyncio
+    async def test_handles_too_many_requests_with_retry_after(self) -> None:
+        exc = TooManyRequestsException(detail="5 per 1 minute", retry_after=30)
+        response = await app_exception_handler(_fake_request(), exc)
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "30"
+        import json
+        body = json.loads(response.body)
+        assert body["status_code"] == 429
+        assert body["detail"] == "5 per 1 minute"
+
     @pytest.mark.asyncio
     async def test_detail_none_when_not_provided(self) -> None:
         exc = NotFoundException()
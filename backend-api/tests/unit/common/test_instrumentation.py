@@ -0,0 +1,136 @@
+"""
+Unit tests for CQRS handler and SQL statement instrumentation.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from pydantic import BaseModel
+
+from app.common import instrumentation
+from app.common.instrumentation import (
+    OTHER_FINGERPRINT,
+    disable_handler_metrics,
+    enable_handler_metrics,
+    fingerprint_statement,
+    instrument_handler,
+    normalize_statement,
+)
+from app.features.appointments.queries.list_appointments import ListAppointmentsQuery
+
+
+@pytest.fixture
+def handler_metrics():
+    enable_handler_metrics()
+    yield
+    disable_handler_metrics()
+
+
+def _handler_count(handler: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "cqrs_handler_duration_seconds_count", {"handler": handler, "kind": "query"}
+    )
+    return value or 0.0
+
+
+def _statement_count(handler: str) -> float:
+    return sum(
+        sample.value
+        for metric in REGISTRY.collect()
+        if metric.name == "db_statement_duration_seconds"
+        for sample in metric.samples
+        if sample.name.endswith("_count") and sample.labels["handler"] == handler
+    )
+
+
+class TestStatementFingerprint:
+    """Tests for SQL normalization"""
+
+    def test_literals_and_whitespace_are_normalized(self) -> None:
+        normalized = normalize_statement("SELECT *\n  FROM t WHERE a = 'x' AND b = 42")
+
+        assert normalized == "SELECT * FROM t WHERE a = ? AND b = ?"
+
+    def test_parameter_lists_collapse(self) -> None:
+        short = fingerprint_statement("SELECT * FROM t WHERE id IN ($1, $2)")
+        long = fingerprint_statement("SELECT * FROM t WHERE id IN ($1, $2, $3, $4)")
+
+        assert short == long
+        assert short[0] == "SELECT"
+
+    def test_fingerprints_above_the_cap_collapse(self, monkeypatch) -> None:
+        monkeypatch.setattr(instrumentation, "_MAX_FINGERPRINTS", 2)
+        monkeypatch.setattr(instrumentation, "_known_fingerprints", set())
+        monkeypatch.setattr(instrumentation, "_fingerprints", {})
+
+        first = fingerprint_statement("SELECT a FROM t")
+        fingerprint_statement("SELECT b FROM t")
+        over = [fingerprint_statement(f"SELECT c{i} FROM t") for i in range(3)]
+
+        assert all(fingerprint == OTHER_FINGERPRINT for _, fingerprint in over)
+        assert fingerprint_statement("SELECT a FROM t") == first
+        assert len(instrumentation._known_fingerprints) == 2
+
+
+class Item(BaseModel):
+    id: int
+
+
+class GetItemsQuery:
+    @instrument_handler
+    async def execute(self) -> list[dict]:
+        return [{"id": i} for i in range(3)]
+
+
+class TestHandlerInstrumentation:
+    """Tests for handler duration, rows and per-statement metrics"""
+
+    @pytest.mark.asyncio
+    async def test_disabled_records_nothing(self, db_session) -> None:
+        before = _handler_count("ListAppointmentsQuery")
+
+        await ListAppointmentsQuery(db_session).execute()
+
+        assert _handler_count("ListAppointmentsQuery") == before
+
+    @pytest.mark.asyncio
+    async def test_records_handler_and_statements(
+        self, db_session, create_test_appointment, handler_metrics
+    ) -> None:
+        create_test_appointment()
+        create_test_appointment()
+        handler_before = _handler_count("ListAppointmentsQuery")
+        statements_before = _statement_count("ListAppointmentsQuery")
+
+        await ListAppointmentsQuery(db_session).execute()
+
+        assert _handler_count("ListAppointmentsQuery") == handler_before + 1
+        # COUNT and page fetch are timed separately
+        assert _statement_count("ListAppointmentsQuery") - statements_before == 2
+        assert REGISTRY.get_sample_value(
+            "cqrs_handler_rows_bucket", {"handler": "ListAppointmentsQuery", "le": "1.0"}
+        ) < REGISTRY.get_sample_value(
+            "cqrs_handler_rows_bucket", {"handler": "ListAppointmentsQuery", "le": "5.0"}
+        )
+
+    def test_records_response_serialization(self, handler_metrics) -> None:
+        app = FastAPI()
+
+        @app.get("/items", response_model=list[Item])
+        async def items():
+            return await GetItemsQuery().execute()
+
+        before = (
+            REGISTRY.get_sample_value(
+                "cqrs_handler_serialization_duration_seconds_count", {"handler": "GetItemsQuery"}
+            )
+            or 0.0
+        )
+
+        assert TestClient(app).get("/items").json() == [{"id": 0}, {"id": 1}, {"id": 2}]
+        assert (
+            REGISTRY.get_sample_value(
+                "cqrs_handler_serialization_duration_seconds_count", {"handler": "GetItemsQuery"}
+            )
+            == before + 1
+        )
@@ -0,0 +1,213 @@
+"""
+Unit tests for in-process caches and LISTEN/NOTIFY invalidation.
+"""
+import asyncio
+
+import orjson
+import pytest
+
+from app.common import local_cache
+from app.common.database.notify import InvalidationListener, notify_invalidation
+from app.common.dependencies import database
+from app.common.local_cache import LocalCache
+from app.features.appointments.cache import appointment_by_id_cache
+from app.features.appointments.commands.update_appointment import UpdateAppointmentCommand
+from app.features.appointments.queries.get_appointment import GetAppointmentQuery
+from app.features.appointments.schemas.appointment import AppointmentUpdate
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Loader:
+    def __init__(self, value="row") -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.value
+
+
+@pytest.fixture
+def listening():
+    """Simulate a connected invalidation listener."""
+    local_cache.set_active(True)
+    yield
+    local_cache.set_active(False)
+
+
+@pytest.fixture
+def appointment_cache(listening, monkeypatch):
+    """Enable the appointment cache, which is off by default."""
+    monkeypatch.setattr(appointment_by_id_cache, "enabled", True)
+    yield appointment_by_id_cache
+    appointment_by_id_cache.evict()
+
+
+class TestLocalCache:
+    """Tests for hits, expiry, size bound and eviction"""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_load(self, listening) -> None:
+        cache = LocalCache("test:hit", ttl=30, max_entries=10)
+        load = Loader()
+
+        assert await cache.get_or_load("1", load) == "row"
+        assert await cache.get_or_load("1", load) == "row"
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_load_without_fill_is_not_stored(self, listening) -> None:
+        cache = LocalCache("test:nofill", ttl=30, max_entries=10)
+        load = Loader()
+
+        await cache.get_or_load("1", load, fill=False)
+        await cache.get_or_load("1", load, fill=False)
+
+        assert load.calls == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_bypassed_while_listener_is_disconnected(self) -> None:
+        cache = LocalCache("test:bypass", ttl=30, max_entries=10)
+        load = Loader()
+
+        await cache.get_or_load("1", load)
+        await cache.get_or_load("1", load)
+
+        assert load.calls == 2
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self, listening) -> None:
+        clock = Clock()
+        cache = LocalCache("test:ttl", ttl=30, max_entries=10, clock=clock)
+        load = Loader()
+        await cache.get_or_load("1", load)
+
+        clock.now = 31
+        await cache.get_or_load("1", load)
+
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_dropped(self, listening) -> None:
+        cache = LocalCache("test:lru", ttl=30, max_entries=2)
+        load = Loader()
+        await cache.get_or_load("1", load)
+        await cache.get_or_load("2", load)
+        await cache.get_or_load("1", load)
+
+        await cache.get_or_load("3", load)
+        await cache.get_or_load("1", load)
+
+        assert load.calls == 3
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_load_racing_with_eviction_is_not_stored(self, listening) -> None:
+        cache = LocalCache("test:race", ttl=30, max_entries=10)
+
+        async def load_then_evicted():
+            cache.evict("1")  # a commit lands while the old row is being read
+            return "old"
+
+        await cache.get_or_load("1", load_then_evicted)
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_disconnect_clears_entries(self, listening) -> None:
+        cache = LocalCache("test:clear", ttl=30, max_entries=10)
+        await cache.get_or_load("1", Loader())
+
+        local_cache.set_active(False)
+
+        assert len(cache) == 0
+
+
+class TestInvalidation:
+    """Tests for NOTIFY publishing and the listener callback"""
+
+    @pytest.mark.asyncio
+    async def test_notification_evicts_key(self, listening) -> None:
+        cache = LocalCache("test:notify", ttl=30, max_entries=10)
+        await cache.get_or_load("1", Loader())
+        await cache.get_or_load("2", Loader())
+        payload = orjson.dumps({"namespace": "test:notify", "key": "1"}).decode()
+
+        InvalidationListener()._on_notification(None, 1, "cache_invalidation", payload)
+
+        assert len(cache) == 1
+
+    def test_malformed_notification_is_ignored(self) -> None:
+        InvalidationListener()._on_notification(None, 1, "cache_invalidation", "not json")
+
+    @pytest.mark.asyncio
+    async def test_notify_evicts_locally_without_postgres(self, listening, db_session) -> None:
+        cache = LocalCache("test:local", ttl=30, max_entries=10)
+        await cache.get_or_load("1", Loader())
+
+        notify_invalidation(db_session, "test:local", "1")
+
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_update_evicts_cached_appointment(
+        self, appointment_cache, db_session, create_test_appointment
+    ) -> None:
+        appointment = create_test_appointment(patient_name="Before")
+        query = GetAppointmentQuery(db_session)
+        await query.execute(appointment.id)
+
+        await UpdateAppointmentCommand(db_session).execute(
+            appointment.id, AppointmentUpdate(patient_name="After")
+        )
+
+        assert (await query.execute(appointment.id)).patient_name == "After"
+
+
+class TestAppointmentCacheReadRouting:
+    """Tests that only primary reads fill the appointment cache"""
+
+    @pytest.mark.asyncio
+    async def test_primary_read_fills_cache(
+        self, appointment_cache, db_session, create_test_appointment
+    ) -> None:
+        appointment = create_test_appointment()
+
+        await GetAppointmentQuery(db_session).execute(appointment.id)
+
+        assert len(appointment_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_replica_read_does_not_fill_cache(
+        self, appointment_cache, db_session, create_test_appointment
+    ) -> None:
+        appointment = create_test_appointment()
+        db_session.info[database._ROLE_KEY] = database.REPLICA
+
+        await GetAppointmentQuery(db_session).execute(appointment.id)
+
+        assert len(appointment_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_pinned_read_bypasses_cached_entry(
+        self, appointment_cache, db_session, create_test_appointment
+    ) -> None:
+        appointment = create_test_appointment(patient_name="Before")
+        query = GetAppointmentQuery(db_session)
+        await query.execute(appointment.id)
+        # A write another pod has not evicted here yet
+        appointment.patient_name = "After"
+        db_session.commit()
+        db_session.info[database._ROLE_KEY] = database.PINNED
+
+        assert (await query.execute(appointment.id)).patient_name == "After"
@@ -0,0 +1,94 @@
+"""
+Unit tests for keyset (cursor) pagination.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.common.exceptions import BadRequestException
+from app.common.pagination import decode_cursor, encode_cursor, iter_keyset_batches, keyset_page
+from app.features.appointments.models.appointment import Appointment
+
+COLUMNS = (Appointment.appointment_date, Appointment.id)
+
+
+@pytest.fixture
+def appointments(create_test_appointment):
+    base = datetime(2030, 1, 1, 9, 0)
+    # Two appointments share each date so ordering relies on the id tiebreaker
+    return [
+        create_test_appointment(appointment_date=base + timedelta(days=i // 2)) for i in range(6)
+    ]
+
+
+class TestCursor:
+    """Tests for cursor encoding"""
+
+    def test_round_trip(self) -> None:
+        date = datetime(2030, 1, 1, 9, 30)
+
+        assert decode_cursor(encode_cursor([date, 42]), COLUMNS) == [date, 42]
+
+    @pytest.mark.parametrize("cursor", ["garbage", encode_cursor([1]), encode_cursor(["x", 1])])
+    def test_invalid_cursor_raises_bad_request(self, cursor) -> None:
+        with pytest.raises(BadRequestException):
+            decode_cursor(cursor, COLUMNS)
+
+
+class TestKeysetPage:
+    """Tests for page selection"""
+
+    def test_pages_cover_every_row_once(self, db_session, appointments) -> None:
+        query = db_session.query(Appointment)
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(query, COLUMNS, limit=4, cursor=cursor)
+            seen.extend(apt.id for apt in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == [apt.id for apt in appointments]
+
+    def test_descending_order(self, db_session, appointments) -> None:
+        page = keyset_page(db_session.query(Appointment), COLUMNS, limit=3, descending=True)
+        rest = keyset_page(
+            db_session.query(Appointment),
+            COLUMNS,
+            limit=3,
+            cursor=page.next_cursor,
+            descending=True,
+        )
+
+        ids = [apt.id for apt in page.items + rest.items]
+        assert ids == [apt.id for apt in reversed(appointments)]
+        assert rest.next_cursor is None
+
+
+class TestIterKeysetBatches:
+    """Tests for bounded batch streaming"""
+
+    def test_batches_until_exhausted(self, db_session, appointments) -> None:
+        batches = list(
+            iter_keyset_batches(db_session.query(Appointment), COLUMNS, batch_size=4, max_rows=100)
+        )
+
+        assert [len(batch.items) for batch in batches] == [4, 2]
+        assert batches[-1].next_cursor is None
+
+    def test_row_cap_leaves_resume_cursor(self, db_session, appointments) -> None:
+        batches = list(
+            iter_keyset_batches(db_session.query(Appointment), COLUMNS, batch_size=2, max_rows=3)
+        )
+
+        assert [len(batch.items) for batch in batches] == [2, 1]
+        assert batches[-1].next_cursor is not None
+
+    def test_rows_are_released_between_batches(self, db_session, appointments) -> None:
+        batches = iter_keyset_batches(
+            db_session.query(Appointment), COLUMNS, batch_size=2, max_rows=100
+        )
+        next(batches)
+        next(batches)
+
+        assert len(db_session.identity_map) == 2
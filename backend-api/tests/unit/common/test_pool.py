@@ -0,0 +1,60 @@
+"""
+Unit tests for connection pool instrumentation.
+"""
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from app.common.database.pool import (
+    InstrumentedAsyncQueuePool,
+    instrument_pool,
+    pool_status,
+)
+
+
+def _engine(name: str, pool_size: int = 2, max_overflow: int = 1):
+    """Sync SQLite engine using the instrumented pool, wrapped like an AsyncEngine."""
+    sync_engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_logging_name=name,
+    )
+    return SimpleNamespace(sync_engine=sync_engine, pool=sync_engine.pool)
+
+
+def _sample(metric: str, pool: str) -> float | None:
+    return REGISTRY.get_sample_value(metric, {"pool": pool})
+
+
+class TestPoolMetrics:
+    """Tests for pool gauges and checkout wait histogram"""
+
+    def test_checkout_wait_is_observed(self) -> None:
+        engine = _engine("test_wait")
+
+        with engine.sync_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert _sample("db_pool_checkout_wait_seconds_count", "test_wait") == 1
+
+    def test_checked_out_gauge_tracks_checkout_and_checkin(self) -> None:
+        engine = _engine("test_gauge")
+        instrument_pool(engine)
+
+        assert _sample("db_pool_capacity_connections", "test_gauge") == 3
+
+        with engine.sync_engine.connect():
+            assert _sample("db_pool_checked_out_connections", "test_gauge") == 1
+
+        assert _sample("db_pool_checked_out_connections", "test_gauge") == 0
+
+    def test_pool_status_reports_saturation(self) -> None:
+        engine = _engine("test_status", pool_size=1, max_overflow=1)
+
+        with engine.sync_engine.connect():
+            status = pool_status(engine)
+
+        assert status == {"checked_out": 1, "capacity": 2, "saturation": 0.5}
@@ -0,0 +1,186 @@
+"""
+Unit tests for the stampede-safe Redis cache.
+"""
+import asyncio
+
+import orjson
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.common.redis.cache import XFetchCache
+from app.core.circuit_breaker import CircuitBreaker
+
+
+class FakeRedis:
+    """In-memory stand-in for the commands the cache uses (expiry is not simulated)."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+        return int(self.data[key])
+
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token.encode():
+            del self.data[key]
+            return 1
+        return 0
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        async def command(*args, **kwargs):
+            raise RedisConnectionError("connection refused")
+
+        return command
+
+
+def _cache(redis, rand: float = 0.5, **overrides) -> XFetchCache:
+    options = {
+        "ttl": 30.0,
+        "lock_timeout": 0.2,
+        "redis_factory": lambda: redis,
+        "breaker": CircuitBreaker("test_cache", enabled=False),
+        **overrides,
+    }
+    return XFetchCache("test", rand=lambda: rand, **options)
+
+
+class Loader:
+    def __init__(self, value=None, delay: float = 0.0) -> None:
+        self.value = value if value is not None else [{"id": 1}]
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.value
+
+
+class TestXFetchCache:
+    """Tests for hits, early refresh, locking and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_miss_computes_then_hits(self) -> None:
+        cache = _cache(FakeRedis())
+        load = Loader()
+
+        first = await cache.get_or_compute("7", load)
+        second = await cache.get_or_compute("7", load)
+
+        assert first == second == [{"id": 1}]
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_keys_are_cached_separately(self) -> None:
+        cache = _cache(FakeRedis())
+        load = Loader()
+
+        await cache.get_or_compute("7", load)
+        await cache.get_or_compute("30", load)
+
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_recompute(self) -> None:
+        cache = _cache(FakeRedis())
+        load = Loader()
+        await cache.get_or_compute("7", load)
+
+        await cache.invalidate()
+        await cache.get_or_compute("7", load)
+
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_result_computed_before_invalidation_is_not_served(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis)
+        slow = Loader(value=[{"id": "old"}], delay=0.05)
+
+        task = asyncio.create_task(cache.get_or_compute("7", slow))
+        await asyncio.sleep(0.01)
+        await cache.invalidate()
+        await task
+
+        assert await cache.get_or_compute("7", Loader(value=[{"id": "new"}])) == [{"id": "new"}]
+
+    @pytest.mark.asyncio
+    async def test_entry_close_to_expiry_is_refreshed_early(self) -> None:
+        redis = FakeRedis()
+        # U close to 0 makes -ln(U) large: the refresh fires long before expiry
+        cache = _cache(redis, rand=1.0 - 1e-12)
+        load = Loader()
+        await cache.get_or_compute("7", load)
+        entry = orjson.loads(redis.data["cache:test:7"])
+        entry["delta"] = 10.0
+        redis.data["cache:test:7"] = orjson.dumps(entry)
+
+        await cache.get_or_compute("7", load)
+
+        assert load.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_lock_loser_serves_current_entry_during_refresh(self) -> None:
+        redis = FakeRedis()
+        cache = _cache(redis, rand=1.0 - 1e-12)
+        await cache.get_or_compute("7", Loader(value=[{"id": "current"}]))
+        entry = orjson.loads(redis.data["cache:test:7"])
+        entry["delta"] = 10.0
+        redis.data["cache:test:7"] = orjson.dumps(entry)
+        redis.data["cache:test:7:lock"] = b"other-process"
+        load = Loader()
+
+        assert await cache.get_or_compute("7", load) == [{"id": "current"}]
+        assert load.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self) -> None:
+        cache = _cache(FakeRedis())
+        load = Loader(delay=0.05)
+        cache.poll_interval = 0.01
+
+        results = await asyncio.gather(*(cache.get_or_compute("7", load) for _ in range(5)))
+
+        assert load.calls == 1
+        assert all(result == [{"id": 1}] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_lock_wait_gives_up_and_computes(self) -> None:
+        redis = FakeRedis()
+        redis.data["cache:test:7:lock"] = b"stuck"
+        cache = _cache(redis, lock_timeout=0.05)
+        cache.poll_interval = 0.01
+        load = Loader()
+
+        assert await cache.get_or_compute("7", load) == [{"id": 1}]
+        assert load.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_compute(self) -> None:
+        cache = _cache(DownRedis())
+        load = Loader()
+
+        assert await cache.get_or_compute("7", load) == [{"id": 1}]
+        await cache.invalidate()
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self) -> None:
+        cache = _cache(FakeRedis(), enabled=False)
+        load = Loader()
+
+        await cache.get_or_compute("7", load)
+        await cache.get_or_compute("7", load)
+
+        assert load.calls == 2
@@ -0,0 +1,120 @@
+"""
+Unit tests for singleflight request coalescing.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.common.singleflight import SingleFlight, singleflight
+
+
+class FakeQuery:
+    calls = 0
+
+    def __init__(self, bind: object = None, delay: float = 0.02) -> None:
+        self.db = SimpleNamespace(bind=bind)
+        self.delay = delay
+
+    @singleflight
+    async def execute(self, doctor_name: str, days_ahead: int = 7) -> dict:
+        type(self).calls += 1
+        await asyncio.sleep(self.delay)
+        return {"doctor_name": doctor_name, "days_ahead": days_ahead}
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    FakeQuery.calls = 0
+
+
+class TestSingleFlight:
+    """Tests for the in-flight call group"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self) -> None:
+        group = SingleFlight()
+        calls = 0
+
+        async def fetch() -> list:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return [1, 2]
+
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert [shared for _, shared in results].count(False) == 1
+        assert all(result is results[0][0] for result, _ in results)
+        assert len(group) == 0
+
+    @pytest.mark.asyncio
+    async def test_leader_error_is_shared(self) -> None:
+        group = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(
+            group.do("key", fail), group.do("key", fail), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_follower_runs_itself_when_leader_is_cancelled(self) -> None:
+        group = SingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.05)
+            return "rows"
+
+        leader = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("key", fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == ("rows", False)
+
+
+class TestSingleflightDecorator:
+    """Tests for handler keying"""
+
+    @pytest.mark.asyncio
+    async def test_defaults_are_normalized(self) -> None:
+        query = FakeQuery()
+
+        await asyncio.gather(
+            query.execute("Dr. Smith"),
+            FakeQuery().execute("Dr. Smith", days_ahead=7),
+            FakeQuery().execute(doctor_name="Dr. Smith"),
+        )
+
+        assert FakeQuery.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_different_arguments_are_not_coalesced(self) -> None:
+        await asyncio.gather(FakeQuery().execute("Dr. Smith"), FakeQuery().execute("Dr. Jones"))
+
+        assert FakeQuery.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_different_engines_are_not_coalesced(self) -> None:
+        primary, replica = object(), object()
+
+        await asyncio.gather(
+            FakeQuery(bind=primary).execute("Dr. Smith"),
+            FakeQuery(bind=replica).execute("Dr. Smith"),
+        )
+
+        assert FakeQuery.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self) -> None:
+        await FakeQuery().execute("Dr. Smith")
+        await FakeQuery().execute("Dr. Smith")
+
+        assert FakeQuery.calls == 2
@@ -0,0 +1,34 @@
+"""
+Unit tests for lazy Celery task references.
+"""
+import sys
+from unittest.mock import patch
+
+from app.core.celery.lazy import LazyTask
+from app.features.appointments.commands import create_appointment
+
+
+class TestLazyTask:
+    """Tests for LazyTask resolution"""
+
+    def test_resolves_on_first_attribute_access(self) -> None:
+        task = LazyTask("app.tasks.email_tasks:send_appointment_confirmation_email")
+
+        delay = task.delay
+
+        assert task.resolved is True
+        assert (
+            delay == sys.modules["app.tasks.email_tasks"].send_appointment_confirmation_email.delay
+        )
+
+    def test_private_attributes_do_not_resolve(self) -> None:
+        task = LazyTask("app.tasks.does_not_exist:task")
+
+        assert not hasattr(task, "__wrapped__")
+        assert task.resolved is False
+
+    def test_command_reference_is_patchable(self) -> None:
+        with patch.object(create_appointment, "send_appointment_confirmation_email") as mock_task:
+            create_appointment.send_appointment_confirmation_email.delay(appointment_id=1)
+
+        mock_task.delay.assert_called_once_with(appointment_id=1)
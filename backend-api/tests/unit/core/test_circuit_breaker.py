@@ -0,0 +1,183 @@
+"""
+Unit tests for dependency circuit breakers.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.celery.dispatch import dispatch
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenException,
+    CircuitState,
+    database_breaker,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock, **overrides) -> CircuitBreaker:
+    options = {
+        "failure_threshold": 3,
+        "reset_timeout": 10.0,
+        "failure_exceptions": (ConnectionError,),
+        "enabled": True,
+        "clock": clock,
+        **overrides,
+    }
+    return CircuitBreaker("test", **options)
+
+
+def _fail(breaker: CircuitBreaker) -> None:
+    with pytest.raises(ConnectionError):
+        with breaker:
+            raise ConnectionError("refused")
+
+
+class TestCircuitBreaker:
+    """Tests for the breaker state machine"""
+
+    def test_opens_after_consecutive_failures(self) -> None:
+        breaker = _breaker(FakeClock())
+        for _ in range(3):
+            _fail(breaker)
+
+        with pytest.raises(CircuitOpenException) as exc_info:
+            breaker.before_call()
+
+        assert breaker.state is CircuitState.OPEN
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "10"}
+
+    def test_success_resets_failure_count(self) -> None:
+        breaker = _breaker(FakeClock())
+        _fail(breaker)
+        _fail(breaker)
+        with breaker:
+            pass
+        _fail(breaker)
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_other_exceptions_are_not_failures(self) -> None:
+        breaker = _breaker(FakeClock(), failure_threshold=1)
+
+        with pytest.raises(ValueError):
+            with breaker:
+                raise ValueError("bad input")
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_half_open_allows_one_trial(self) -> None:
+        clock = FakeClock()
+        breaker = _breaker(clock, failure_threshold=1)
+        _fail(breaker)
+        clock.now += 10
+
+        breaker.before_call()
+        with pytest.raises(CircuitOpenException):
+            breaker.before_call()
+
+        assert breaker.state is CircuitState.HALF_OPEN
+
+    def test_trial_success_closes_and_failure_reopens(self) -> None:
+        clock = FakeClock()
+        breaker = _breaker(clock, failure_threshold=1)
+        _fail(breaker)
+        clock.now += 10
+        _fail(breaker)
+
+        assert breaker.state is CircuitState.OPEN
+
+        clock.now += 10
+        with breaker:
+            pass
+
+        assert breaker.state is CircuitState.CLOSED
+
+    def test_unreported_trial_is_replaced_after_reset_timeout(self) -> None:
+        clock = FakeClock()
+        breaker = _breaker(clock, failure_threshold=1)
+        _fail(breaker)
+        clock.now += 10
+        breaker.before_call()
+
+        clock.now += 10
+        breaker.before_call()
+
+        assert breaker.state is CircuitState.HALF_OPEN
+
+    def test_disabled_breaker_never_rejects(self) -> None:
+        breaker = _breaker(FakeClock(), failure_threshold=1, enabled=False)
+        _fail(breaker)
+
+        breaker.before_call()
+
+
+class TestDatabaseBreaker:
+    """Tests for breakers fed by engine events"""
+
+    def test_connect_failures_open_and_statements_close(self, tmp_path) -> None:
+        engine = create_engine(f"sqlite:///{tmp_path}/missing/db.sqlite")
+        breaker = database_breaker(engine)
+        breaker.enabled = True
+        for _ in range(breaker.failure_threshold):
+            with pytest.raises(OperationalError):
+                engine.connect()
+
+        assert breaker.state is CircuitState.OPEN
+
+        engine.dispose()
+        (tmp_path / "missing").mkdir()
+        breaker._transition(CircuitState.HALF_OPEN)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert breaker.state is CircuitState.CLOSED
+        assert database_breaker(engine) is breaker
+
+    def test_statement_errors_do_not_count(self) -> None:
+        engine = create_engine("sqlite://")
+        breaker = database_breaker(engine)
+        with engine.connect() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+            conn.execute(text("INSERT INTO t VALUES (1)"))
+            for _ in range(breaker.failure_threshold):
+                with pytest.raises(IntegrityError):
+                    conn.execute(text("INSERT INTO t VALUES (1)"))
+
+        assert breaker.state is CircuitState.CLOSED
+
+
+class TestDispatch:
+    """Tests for best-effort Celery dispatch"""
+
+    @pytest.fixture
+    def celery_breaker(self, monkeypatch) -> CircuitBreaker:
+        breaker = _breaker(FakeClock(), failure_threshold=2, failure_exceptions=(Exception,))
+        monkeypatch.setattr("app.core.celery.dispatch.celery_breaker", breaker)
+        return breaker
+
+    def test_publishes_task(self, celery_breaker) -> None:
+        task = MagicMock()
+
+        assert dispatch(task, appointment_id=1) is True
+        task.delay.assert_called_once_with(appointment_id=1)
+
+    def test_broker_errors_are_swallowed_then_skipped(self, celery_breaker) -> None:
+        task = MagicMock()
+        task.delay.side_effect = ConnectionError("broker down")
+
+        results = [dispatch(task, appointment_id=1) for _ in range(4)]
+
+        assert results == [False] * 4
+        assert task.delay.call_count == 2
+        assert celery_breaker.state is CircuitState.OPEN
@@ -0,0 +1,156 @@
+"""
+Unit tests for the adaptive concurrency limiter.
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from app.core.concurrency import AIMDLimiter, ConcurrencyLimitMiddleware
+from app.core.deadline import route_timeout
+
+
+def _limiter(initial: int = 10, **overrides) -> AIMDLimiter:
+    options = {
+        "initial_limit": initial,
+        "min_limit": 2,
+        "max_limit": 20,
+        "target_latency": 0.5,
+        "backoff_ratio": 0.5,
+        **overrides,
+    }
+    return AIMDLimiter(**options)
+
+
+class TestAIMDLimiter:
+    """Tests for limit adaptation"""
+
+    def test_rejects_at_limit(self) -> None:
+        limiter = _limiter(initial=2)
+
+        admitted = [limiter.try_acquire() for _ in range(3)]
+
+        assert admitted == [True, True, False]
+        assert limiter.in_flight == 2
+
+    def test_slow_response_backs_off_multiplicatively(self) -> None:
+        limiter = _limiter(initial=10)
+        limiter.try_acquire()
+
+        limiter.release(latency=1.0)
+
+        assert limiter.limit == 5
+        assert limiter.in_flight == 0
+
+    def test_backoff_stops_at_min_limit(self) -> None:
+        limiter = _limiter(initial=3)
+        for _ in range(5):
+            limiter.try_acquire()
+            limiter.release(latency=1.0)
+
+        assert limiter.limit == 2
+
+    def test_fast_responses_grow_limit_when_utilized(self) -> None:
+        limiter = _limiter(initial=4)
+
+        for _ in range(20):
+            for _ in range(limiter.limit):
+                limiter.try_acquire()
+            for _ in range(limiter.in_flight):
+                limiter.release(latency=0.01)
+
+        assert limiter.limit > 4
+
+    def test_fast_responses_do_not_grow_idle_limit(self) -> None:
+        limiter = _limiter(initial=10)
+
+        for _ in range(50):
+            limiter.try_acquire()
+            limiter.release(latency=0.01)
+
+        assert limiter.limit == 10
+
+
+class TestConcurrencyLimitMiddleware:
+    """Tests for shedding and the exempt lane"""
+
+    @pytest.mark.asyncio
+    async def test_sheds_with_retry_after_and_keeps_probes(self) -> None:
+        app = FastAPI()
+        release = asyncio.Event()
+
+        @app.get("/slow")
+        async def slow() -> dict:
+            await release.wait()
+            return {"ok": True}
+
+        @app.get("/health")
+        async def health() -> dict:
+            return {"status": "healthy"}
+
+        app.add_middleware(
+            ConcurrencyLimitMiddleware,
+            limiter=_limiter(initial=1, min_limit=1),
+            exempt_paths=["/health"],
+        )
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            in_flight = asyncio.create_task(client.get("/slow"))
+            await asyncio.sleep(0.05)
+
+            shed = await client.get("/slow")
+            probe = await client.get("/health")
+            release.set()
+            admitted = await in_flight
+
+        assert shed.status_code == 503
+        assert shed.headers["Retry-After"] == "1"
+        assert shed.json()["message"] == "Server overloaded"
+        assert probe.status_code == 200
+        assert admitted.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_holds_slot_until_body_ends(self) -> None:
+        finish = asyncio.Event()
+        sent: list[dict] = []
+        limiter = _limiter(initial=1, min_limit=1)
+
+        async def streaming_app(scope, receive, send) -> None:
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"first", "more_body": True})
+            await finish.wait()
+            await send({"type": "http.response.body", "body": b"last", "more_body": False})
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        middleware = ConcurrencyLimitMiddleware(streaming_app, limiter=limiter, exempt_paths=[])
+        scope = {"type": "http", "path": "/stream", "method": "GET", "headers": []}
+        request = asyncio.create_task(middleware(scope, None, send))
+        await asyncio.sleep(0.01)
+
+        assert len(sent) == 2
+        assert limiter.in_flight == 1
+        finish.set()
+        await request
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_route_timeout_routes_do_not_move_the_limit(self) -> None:
+        app = FastAPI()
+        limiter = _limiter(initial=10, target_latency=0.01)
+
+        @app.get("/export", dependencies=[Depends(route_timeout(30))])
+        async def export() -> dict:
+            await asyncio.sleep(0.05)
+            return {"ok": True}
+
+        app.add_middleware(ConcurrencyLimitMiddleware, limiter=limiter, exempt_paths=[])
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/export")
+
+        assert response.status_code == 200
+        assert limiter.limit == 10
+        assert limiter.in_flight == 0
@@ -0,0 +1,156 @@
+"""
+Unit tests for per-request deadlines.
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.exc import DBAPIError
+
+from app.common.exceptions import GatewayTimeoutException
+from app.core import deadline as deadline_module
+from app.core.config import settings
+from app.core.deadline import (
+    Deadline,
+    DeadlineMiddleware,
+    _apply_statement_timeout,
+    redis_timeout,
+    remaining,
+    route_timeout,
+)
+
+
+class FakeConnection:
+    def __init__(self, dialect_name: str) -> None:
+        self.dialect = type("Dialect", (), {"name": dialect_name})()
+        self.statements: list[str] = []
+
+    def exec_driver_sql(self, statement: str) -> None:
+        self.statements.append(statement)
+
+
+class QueryCanceled(Exception):
+    sqlstate = "57014"
+
+
+def _app(events: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow() -> dict:
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            events["cancelled"] = True
+            raise
+        return {}
+
+    @app.get("/remaining")
+    async def left() -> dict:
+        return {"remaining": remaining()}
+
+    @app.get("/export", dependencies=[Depends(route_timeout(0.05))])
+    async def export() -> dict:
+        await asyncio.sleep(5)
+        return {}
+
+    @app.get("/canceled-query")
+    async def canceled_query() -> dict:
+        raise DBAPIError("SELECT 1", None, QueryCanceled())
+
+    app.add_middleware(DeadlineMiddleware)
+    return app
+
+
+async def _get(app: FastAPI, path: str, **headers: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+class TestDeadlineMiddleware:
+    """Tests for deadline enforcement on requests"""
+
+    @pytest.mark.asyncio
+    async def test_client_timeout_cancels_endpoint_with_504(self) -> None:
+        events: dict = {}
+
+        response = await _get(_app(events), "/slow", **{"X-Request-Timeout-Ms": "50"})
+
+        assert response.status_code == 504
+        assert response.json()["detail"] == "Request deadline exceeded"
+        assert events["cancelled"] is True
+
+    @pytest.mark.asyncio
+    async def test_remaining_time_is_visible_to_endpoint(self) -> None:
+        response = await _get(_app({}), "/remaining", **{"X-Request-Timeout-Ms": "2000"})
+
+        assert 0 < response.json()["remaining"] <= 2.0
+
+    @pytest.mark.asyncio
+    async def test_invalid_header_falls_back_to_default(self) -> None:
+        response = await _get(_app({}), "/remaining", **{"X-Request-Timeout-Ms": "soon"})
+
+        assert response.json()["remaining"] > 2.0
+
+    @pytest.mark.asyncio
+    async def test_route_timeout_replaces_default(self) -> None:
+        response = await _get(_app({}), "/export")
+
+        assert response.status_code == 504
+
+    @pytest.mark.asyncio
+    async def test_statement_timeout_error_maps_to_504(self) -> None:
+        response = await _get(_app({}), "/canceled-query")
+
+        assert response.status_code == 504
+
+
+class TestStatementTimeout:
+    """Tests for SET LOCAL statement_timeout and Redis timeouts"""
+
+    @pytest.mark.asyncio
+    async def test_sets_remaining_time_on_postgresql(self) -> None:
+        connection = FakeConnection("postgresql")
+        token = deadline_module._current_deadline.set(Deadline(timeout=2.0))
+        try:
+            _apply_statement_timeout(None, None, connection)
+        finally:
+            deadline_module._current_deadline.reset(token)
+
+        timeout_ms = int(connection.statements[0].rsplit(" ", 1)[1])
+        assert connection.statements[0].startswith("SET LOCAL statement_timeout = ")
+        assert 1900 <= timeout_ms <= 2000
+
+    @pytest.mark.asyncio
+    async def test_skips_other_dialects_and_requests_without_deadline(self) -> None:
+        sqlite, postgres = FakeConnection("sqlite"), FakeConnection("postgresql")
+        token = deadline_module._current_deadline.set(Deadline(timeout=2.0))
+        try:
+            _apply_statement_timeout(None, None, sqlite)
+        finally:
+            deadline_module._current_deadline.reset(token)
+        _apply_statement_timeout(None, None, postgres)
+
+        assert sqlite.statements == []
+        assert postgres.statements == []
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_refuses_to_begin(self) -> None:
+        token = deadline_module._current_deadline.set(Deadline(timeout=0.0))
+        try:
+            with pytest.raises(GatewayTimeoutException):
+                _apply_statement_timeout(None, None, FakeConnection("postgresql"))
+        finally:
+            deadline_module._current_deadline.reset(token)
+
+    @pytest.mark.asyncio
+    async def test_redis_timeout_is_bounded_by_deadline(self) -> None:
+        assert redis_timeout() == settings.REDIS_SOCKET_TIMEOUT
+
+        token = deadline_module._current_deadline.set(Deadline(timeout=0.2))
+        try:
+            assert 0 < redis_timeout() <= 0.2
+        finally:
+            deadline_module._current_deadline.reset(token)
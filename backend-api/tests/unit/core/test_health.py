@@ -0,0 +1,115 @@
+"""
+Unit tests for the background dependency health checker (readiness probe).
+"""
+import asyncio
+
+import pytest
+
+from app.core.health import DependencyHealthChecker
+
+
+async def _ok() -> None:
+    return None
+
+
+async def _fail() -> None:
+    raise ConnectionError("connection refused")
+
+
+async def _hang() -> None:
+    await asyncio.sleep(10)
+
+
+def _pool(saturation: float = 0.0) -> dict:
+    return {"checked_out": int(saturation * 10), "capacity": 10, "saturation": saturation}
+
+
+def _checker(checks: dict, saturation: float = 0.0, **kwargs) -> DependencyHealthChecker:
+    return DependencyHealthChecker(
+        checks=checks,
+        interval=0.01,
+        timeout=0.05,
+        max_staleness=30.0,
+        saturation_threshold=0.9,
+        pool_status_fn=lambda: _pool(saturation),
+        **kwargs,
+    )
+
+
+class TestDependencyHealthChecker:
+    """Tests for DependencyHealthChecker"""
+
+    def test_not_ready_before_first_refresh(self) -> None:
+        checker = _checker({"database": _ok})
+
+        ready, body = checker.snapshot()
+
+        assert ready is False
+        assert body["checks"]["database"] == "pending"
+        assert body["checked_seconds_ago"] is None
+
+    @pytest.mark.asyncio
+    async def test_ready_when_all_checks_pass(self) -> None:
+        checker = _checker({"database": _ok, "redis": _ok})
+
+        await checker.refresh()
+        ready, body = checker.snapshot()
+
+        assert ready is True
+        assert body["status"] == "ready"
+        assert body["checks"] == {"database": "ok", "redis": "ok", "pool": "ok"}
+        assert set(body["latency_ms"]) == {"database", "redis"}
+
+    @pytest.mark.asyncio
+    async def test_failed_check_marks_not_ready(self) -> None:
+        checker = _checker({"database": _ok, "redis": _fail})
+
+        await checker.refresh()
+        ready, body = checker.snapshot()
+
+        assert ready is False
+        assert body["checks"]["redis"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_hanging_check_times_out(self) -> None:
+        checker = _checker({"database": _hang})
+
+        await checker.refresh()
+        ready, body = checker.snapshot()
+
+        assert ready is False
+        assert body["checks"]["database"] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_pool_saturation_marks_not_ready(self) -> None:
+        checker = _checker({"database": _ok}, saturation=0.95)
+
+        await checker.refresh()
+        ready, body = checker.snapshot()
+
+        assert ready is False
+        assert body["checks"]["pool"] == "saturated"
+        assert body["pool"]["saturation"] == 0.95
+
+    @pytest.mark.asyncio
+    async def test_stale_results_mark_not_ready(self) -> None:
+        checker = _checker({"database": _ok})
+        checker.max_staleness = 0.0
+
+        await checker.refresh()
+        await asyncio.sleep(0.01)
+        ready, body = checker.snapshot()
+
+        assert ready is False
+        assert body["checks"]["database"] == "stale"
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop_background_loop(self) -> None:
+        checker = _checker({"database": _ok})
+
+        checker.start()
+        await asyncio.sleep(0.05)
+        await checker.stop()
+
+        ready, _ = checker.snapshot()
+        assert ready is True
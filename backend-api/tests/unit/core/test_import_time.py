@@ -0,0 +1,109 @@
+"""
+Import-time budget for the API process.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+parses the per-module report (``import time: self [us] | cumulative | name``).
+Cold start of a pod is dominated by this import, so heavyweight optional
+dependencies must stay out of it and the total must stay within budget.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).resolve().parents[3]
+
+# Generous for slow CI runners; ~1 s locally
+IMPORT_BUDGET_MS = 3000
+
+# Loaded on first use only (Celery on the first task dispatch, grpc on the first span export)
+LAZY_MODULES = (
+    "celery",
+    "kombu",
+    "grpc",
+    "opentelemetry.exporter.otlp.proto.grpc",
+    "app.tasks.email_tasks",
+)
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per top-level import of ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_ROOT,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+# Runs the startup warm-up with no database engines and an in-memory Redis
+WARM_UP_SCRIPT = """
+import asyncio, sys
+from app.core import warmup
+from app.core.health import DependencyHealthChecker
+from app.main import app
+
+class Redis:
+    async def ping(self):
+        return True
+
+async def ok():
+    return None
+
+warmup.get_redis_client = lambda: Redis()
+checker = DependencyHealthChecker(
+    checks={"database": ok},
+    pool_status_fn=lambda: {"checked_out": 0, "capacity": 1, "saturation": 0.0},
+)
+asyncio.run(warmup.warm_up(app, checker, engines=()))
+print(",".join(sorted(sys.modules)))
+"""
+
+
+@pytest.fixture(scope="module")
+def import_times() -> dict[str, int]:
+    return _import_times("app.main")
+
+
+class TestImportTime:
+    """Tests for the app.main import budget"""
+
+    def test_app_main_within_budget(self, import_times) -> None:
+        total_ms = import_times["app.main"] / 1000
+
+        assert total_ms < IMPORT_BUDGET_MS, f"import app.main took {total_ms:.0f} ms"
+
+    @pytest.mark.parametrize("module", LAZY_MODULES)
+    def test_heavy_dependency_not_imported(self, import_times, module) -> None:
+        imported = [
+            name for name in import_times if name == module or name.startswith(f"{module}.")
+        ]
+
+        assert imported == []
+
+    def test_warm_up_does_not_import_celery(self) -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", WARM_UP_SCRIPT],
+            cwd=BACKEND_ROOT,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1", "WARMUP_CELERY_ENABLED": "False"},
+            capture_output=True,
+            text=True,
+            timeout=120,
+            check=True,
+        )
+        modules = result.stdout.strip().splitlines()[-1].split(",")
+
+        assert "celery" not in modules
+        assert "app.tasks.email_tasks" not in modules
@@ -0,0 +1,146 @@
+"""
+Unit tests for queue-based JSON logging.
+"""
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.logging import (
+    CustomJsonFormatter,
+    DrainingQueueListener,
+    NonBlockingQueueHandler,
+    setup_logging,
+    stop_logging,
+)
+from app.core.middleware import _correlation_id
+
+
+def _record(msg: str = "hello %s", args: tuple = ("world",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("app.test", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestCustomJsonFormatter:
+    """Tests for the orjson formatter"""
+
+    def test_standard_and_extra_fields(self) -> None:
+        output = json.loads(CustomJsonFormatter().format(_record(correlation_id="abc", path="/x")))
+
+        assert output["message"] == "hello world"
+        assert output["level"] == "INFO"
+        assert output["logger"] == "app.test"
+        assert output["correlation_id"] == "abc"
+        assert output["path"] == "/x"
+
+    def test_cached_timestamp_matches_stdlib_format(self) -> None:
+        formatter = CustomJsonFormatter()
+        first, second = _record(), _record()
+        second.created += 0.5
+        second.msecs = (second.created - int(second.created)) * 1000
+
+        for record in (first, second):
+            assert formatter.formatTime(record) == logging.Formatter().formatTime(record)
+
+    def test_exception_text_is_included(self) -> None:
+        record = _record(exc_text="Traceback: boom")
+
+        output = json.loads(CustomJsonFormatter().format(record))
+
+        assert output["exc_info"] == "Traceback: boom"
+
+
+class TestNonBlockingQueueHandler:
+    """Tests for enqueueing without blocking the caller"""
+
+    def test_drops_and_counts_when_queue_is_full(self) -> None:
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        before = REGISTRY.get_sample_value("log_records_dropped_total", {"level": "INFO"}) or 0
+
+        handler.handle(_record())
+        handler.handle(_record())
+
+        assert handler.dropped == 1
+        assert (
+            REGISTRY.get_sample_value("log_records_dropped_total", {"level": "INFO"}) == before + 1
+        )
+
+    def test_message_and_exception_resolved_on_caller_thread(self) -> None:
+        log_queue: queue.Queue = queue.Queue()
+        handler = NonBlockingQueueHandler(log_queue)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = _record()
+            record.exc_info = sys.exc_info()
+
+        handler.handle(record)
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "hello world" and queued.args is None
+        assert queued.exc_info is None
+        assert "ValueError: boom" in queued.exc_text
+
+    def test_listener_stops_with_full_queue(self) -> None:
+        log_queue: queue.Queue = queue.Queue(maxsize=2)
+        written: list[str] = []
+        sink = logging.Handler()
+        sink.emit = lambda record: written.append(record.msg)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.handle(_record())
+        handler.handle(_record())
+        listener = DrainingQueueListener(log_queue, sink)
+
+        listener.start()
+        listener.stop()
+
+        assert written == ["hello world", "hello world"]
+
+
+class TestSetupLogging:
+    """Tests for the QueueHandler/QueueListener pipeline"""
+
+    def test_record_factory_installed_once(self, restore_root_logger) -> None:
+        setup_logging("INFO")
+        factory = logging.getLogRecordFactory()
+        setup_logging("INFO")
+
+        assert logging.getLogRecordFactory() is factory
+        token = _correlation_id.set("req-456")
+        try:
+            record = logging.getLogger("app.x").makeRecord(
+                "app.x", logging.INFO, "f", 1, "m", None, None
+            )
+        finally:
+            _correlation_id.reset(token)
+        assert record.correlation_id == "req-456"
+
+    def test_child_logger_records_written_as_json_with_correlation_id(
+        self, capsys, restore_root_logger
+    ) -> None:
+        setup_logging("INFO")
+        token = _correlation_id.set("req-123")
+        try:
+            logging.getLogger("app.some.module").info("queued", extra={"status_code": 201})
+        finally:
+            _correlation_id.reset(token)
+        stop_logging()
+
+        line = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+        assert line["message"] == "queued"
+        assert line["correlation_id"] == "req-123"
+        assert line["status_code"] == 201
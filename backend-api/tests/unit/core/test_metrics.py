@@ -0,0 +1,85 @@
+"""
+Unit tests for Prometheus multiprocess support.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import CollectorRegistry, multiprocess
+
+from app.core.metrics import mark_worker_dead, prepare_multiprocess_dir
+
+BACKEND_DIR = Path(__file__).resolve().parents[3]
+
+# Simulates one API worker: records a request and publishes pool capacity
+WORKER_SCRIPT = """
+from app.common.database.pool import POOL_CAPACITY
+from app.core.health import CHECK_DURATION
+POOL_CAPACITY.labels(pool="primary").set(15)
+CHECK_DURATION.labels(dependency="database").observe(0.01)
+"""
+
+
+def _run_worker(multiproc_dir: Path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir)}
+    subprocess.run(
+        [sys.executable, "-c", WORKER_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        timeout=60,
+    )
+
+
+def _collect(multiproc_dir: Path) -> CollectorRegistry:
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(multiproc_dir))
+    return registry
+
+
+class TestMultiprocessMetrics:
+    """Tests for aggregation across worker processes"""
+
+    def test_prepare_removes_stale_metric_files(self, tmp_path) -> None:
+        (tmp_path / "counter_123.db").write_bytes(b"stale")
+        (tmp_path / "keep.txt").write_text("not a metric file")
+
+        prepare_multiprocess_dir(str(tmp_path))
+
+        assert not (tmp_path / "counter_123.db").exists()
+        assert (tmp_path / "keep.txt").exists()
+
+    def test_prepare_creates_missing_directory(self, tmp_path) -> None:
+        target = tmp_path / "multiproc"
+
+        prepare_multiprocess_dir(str(target))
+
+        assert target.is_dir()
+
+    def test_metrics_are_aggregated_across_workers(self, tmp_path) -> None:
+        _run_worker(tmp_path)
+        _run_worker(tmp_path)
+
+        registry = _collect(tmp_path)
+
+        assert registry.get_sample_value("db_pool_capacity_connections", {"pool": "primary"}) == 30
+        assert (
+            registry.get_sample_value(
+                "readiness_check_duration_seconds_count", {"dependency": "database"}
+            )
+            == 2
+        )
+
+    def test_mark_worker_dead_drops_live_gauges(self, tmp_path, monkeypatch) -> None:
+        _run_worker(tmp_path)
+        gauge_file = next(tmp_path.glob("gauge_livesum_*.db"))
+        pid = int(gauge_file.stem.rsplit("_", 1)[1])
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        mark_worker_dead(pid)
+
+        registry = _collect(tmp_path)
+        assert (
+            registry.get_sample_value("db_pool_capacity_connections", {"pool": "primary"}) is None
+        )
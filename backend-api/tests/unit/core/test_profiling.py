@@ -0,0 +1,175 @@
+"""
+Unit tests for the on-demand sampling profiler.
+"""
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.common.database.base import Base
+from app.common.dependencies.auth import get_current_user
+from app.common.exceptions import AppException, ConflictException
+from app.common.exceptions.handlers import app_exception_handler
+from app.core import profiling
+from app.core.deadline import DeadlineMiddleware
+from app.core.profiling import ProfilingMiddleware, SamplingProfiler, profiling_session
+from app.core.security import create_access_token
+from app.features.auth.models.user import User
+
+ADMIN = "admin@example.com"
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def profiling_app(monkeypatch) -> FastAPI:
+    monkeypatch.setattr(profiling.settings, "PROFILING_ALLOWED_EMAILS", [ADMIN])
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.add_exception_handler(AppException, app_exception_handler)
+    app.include_router(profiling.router, prefix="/admin")
+
+    @app.get("/work")
+    async def work() -> dict:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        return {"ok": True}
+
+    return app
+
+
+def _as_user(app: FastAPI, email: str) -> None:
+    app.dependency_overrides[get_current_user] = lambda: User(email=email)
+
+
+@pytest.fixture
+def users_db(monkeypatch):
+    """Resolve X-Profile users from a test database instead of dependency overrides."""
+    # StaticPool: TestClient runs the app in another thread, which must see the same database
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+
+    @asynccontextmanager
+    async def open_session():
+        yield session
+
+    monkeypatch.setattr(profiling, "get_read_session_factory", lambda request: open_session)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_user(db, email: str, is_active: bool = True) -> None:
+    db.add(User(email=email, hashed_password="x", full_name="Admin", is_active=is_active))
+    db.commit()
+
+
+class TestSamplingProfiler:
+    """Tests for stack sampling and folded output"""
+
+    def test_collects_folded_stacks_of_target_thread(self) -> None:
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_loop, args=(stop,))
+        worker.start()
+
+        profiler = SamplingProfiler(interval=0.001, thread_ids={worker.ident})
+        profiler.start()
+        time.sleep(0.1)
+        profiler.stop()
+        stop.set()
+        worker.join()
+
+        folded = profiler.folded()
+        assert profiler.samples > 0
+        assert "test_profiling:_busy_loop" in folded
+        stack, count = folded.splitlines()[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
+
+    def test_only_one_session_at_a_time(self) -> None:
+        with profiling_session(interval=0.01):
+            with pytest.raises(ConflictException):
+                with profiling_session(interval=0.01):
+                    pass
+
+
+class TestProfilingEndpoint:
+    """Tests for /admin/profile and the X-Profile header"""
+
+    def test_profile_endpoint_returns_folded_stacks(self, profiling_app) -> None:
+        _as_user(profiling_app, ADMIN)
+
+        response = TestClient(profiling_app).get("/admin/profile", params={"seconds": 0.1})
+
+        assert response.status_code == 200
+        assert int(response.headers["X-Profile-Samples"]) > 0
+
+    def test_profile_longer_than_default_deadline(self, profiling_app, monkeypatch) -> None:
+        monkeypatch.setattr(profiling.settings, "REQUEST_TIMEOUT_DEFAULT_SECONDS", 0.3)
+        profiling_app.add_middleware(DeadlineMiddleware)
+        _as_user(profiling_app, ADMIN)
+
+        response = TestClient(profiling_app).get("/admin/profile", params={"seconds": 0.6})
+
+        assert response.status_code == 200
+
+    def test_profile_max_seconds_is_at_least_one_second(self, monkeypatch, caplog) -> None:
+        monkeypatch.setattr(profiling.settings, "REQUEST_TIMEOUT_MAX_SECONDS", 3.0)
+
+        assert profiling._profile_max_seconds() == 1.0
+        assert "REQUEST_TIMEOUT_MAX_SECONDS=3.0" in caplog.text
+
+    def test_profile_endpoint_rejects_non_admin(self, profiling_app) -> None:
+        _as_user(profiling_app, "user@example.com")
+
+        response = TestClient(profiling_app).get("/admin/profile", params={"seconds": 0.1})
+
+        assert response.status_code == 403
+
+    def test_profile_header_profiles_single_request(self, profiling_app, users_db) -> None:
+        _add_user(users_db, ADMIN)
+        token = create_access_token({"sub": ADMIN})
+
+        response = TestClient(profiling_app).get(
+            "/work", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+        )
+
+        assert response.headers["X-Profiled-Status"] == "200"
+        assert "work" in response.text
+
+    def test_profile_header_ignored_for_other_users(self, profiling_app, users_db) -> None:
+        _add_user(users_db, "user@example.com")
+        token = create_access_token({"sub": "user@example.com"})
+
+        response = TestClient(profiling_app).get(
+            "/work", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+        )
+
+        assert response.json() == {"ok": True}
+
+    @pytest.mark.parametrize("is_active", [False, None])
+    def test_profile_header_ignored_for_inactive_or_deleted_admin(
+        self, profiling_app, users_db, is_active
+    ) -> None:
+        if is_active is not None:
+            _add_user(users_db, ADMIN, is_active=is_active)
+        token = create_access_token({"sub": ADMIN})
+
+        response = TestClient(profiling_app).get(
+            "/work", headers={"Authorization": f"Bearer {token}", "X-Profile": "1"}
+        )
+
+        assert response.json() == {"ok": True}
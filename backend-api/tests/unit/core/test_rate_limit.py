@@ -0,0 +1,158 @@
+"""
+Unit tests for the Redis token-bucket rate limiter.
+"""
+import pytest
+from fastapi import Request
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core.rate_limit import RedisRateLimiter, client_identity, parse_limit
+from app.core.security import create_access_token
+
+
+class FakeBucketLimiter(RedisRateLimiter):
+    """Limiter whose Lua round-trip is replaced by an in-memory bucket without refill."""
+
+    def __init__(self, tokens: dict[str, float] | None = None, **kwargs) -> None:
+        kwargs.setdefault("workers", 1)
+        super().__init__(redis_factory=lambda: None, **kwargs)
+        # Pass the same dict to several limiters to model workers sharing Redis
+        self.tokens: dict[str, float] = {} if tokens is None else tokens
+        self.calls: list[tuple[str, int]] = []
+
+    async def _eval(self, key, limit, debt, cost=1):
+        self.calls.append((key, debt))
+        tokens = max(0.0, self.tokens.get(key, limit.capacity) - debt)
+        if tokens >= cost:
+            self.tokens[key] = tokens - cost
+            return True, tokens - cost, 0
+        self.tokens[key] = tokens
+        return False, tokens, 2500
+
+
+class FailingLimiter(RedisRateLimiter):
+    async def _eval(self, key, limit, debt, cost=1):
+        raise RedisConnectionError("connection refused")
+
+
+def _request(headers: dict | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/",
+            "headers": raw,
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+class TestParseLimit:
+    """Tests for limit string parsing"""
+
+    def test_per_minute(self) -> None:
+        limit = parse_limit("5/minute")
+        assert limit.capacity == 5
+        assert limit.period_seconds == 60
+
+    def test_multiplier_and_per_syntax(self) -> None:
+        assert parse_limit("100/5 minutes").period_seconds == 300
+        assert parse_limit("10 per hour").period_seconds == 3600
+
+    def test_invalid_limit_raises(self) -> None:
+        with pytest.raises(ValueError):
+            parse_limit("five per minute")
+
+
+class TestRedisRateLimiter:
+    """Tests for token consumption, fast path and fail-open behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_denies_when_bucket_is_empty(self) -> None:
+        limiter = FakeBucketLimiter(fast_path_ratio=1.0)
+        limit = parse_limit("3/minute")
+
+        decisions = [await limiter.hit("k", limit) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert decisions[-1].retry_after_seconds == 3
+
+    @pytest.mark.asyncio
+    async def test_fast_path_skips_redis_and_charges_debt_later(self) -> None:
+        limiter = FakeBucketLimiter(fast_path_ratio=0.5, lease_seconds=60)
+        limit = parse_limit("10/minute")
+
+        for _ in range(6):
+            assert (await limiter.hit("k", limit)).allowed
+
+        # 1st request hits Redis (9 left); the next 4 keep >= 5 tokens and are
+        # admitted locally; the 6th flushes those 4 together with itself
+        assert limiter.calls == [("k", 0), ("k", 4)]
+        assert limiter.tokens["k"] == 4
+
+    @pytest.mark.asyncio
+    async def test_no_fast_path_near_the_limit(self) -> None:
+        limiter = FakeBucketLimiter(fast_path_ratio=0.5, lease_seconds=60)
+        limit = parse_limit("2/minute")
+
+        await limiter.hit("k", limit)
+        await limiter.hit("k", limit)
+
+        assert len(limiter.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_workers_sharing_redis_stay_within_small_limit(self) -> None:
+        shared: dict[str, float] = {}
+        workers = [
+            FakeBucketLimiter(tokens=shared, fast_path_ratio=0.1, lease_seconds=60, workers=4)
+            for _ in range(4)
+        ]
+        limit = parse_limit("5/minute")
+
+        admitted = 0
+        for _ in range(5):
+            for worker in workers:
+                admitted += (await worker.hit("k", limit)).allowed
+
+        assert admitted == 5
+        assert all(len(worker.calls) == 5 for worker in workers)
+
+    @pytest.mark.asyncio
+    async def test_evicted_lease_settles_its_debt(self) -> None:
+        limiter = FakeBucketLimiter(fast_path_ratio=0.5, lease_seconds=60, max_local_keys=1)
+        limit = parse_limit("10/minute")
+        for _ in range(3):
+            await limiter.hit("a", limit)
+
+        await limiter.hit("b", limit)
+
+        # "a" was admitted twice locally; evicting its lease charges both
+        assert limiter.calls[-1] == ("a", 2)
+        assert limiter.tokens["a"] == 7
+
+    @pytest.mark.asyncio
+    async def test_fails_open_when_redis_unavailable(self) -> None:
+        limiter = FailingLimiter(redis_factory=lambda: None)
+
+        decision = await limiter.hit("k", parse_limit("1/minute"))
+
+        assert decision.allowed is True
+
+
+class TestClientIdentity:
+    """Tests for per-user / per-IP keys"""
+
+    def test_anonymous_requests_keyed_by_ip(self) -> None:
+        assert client_identity(_request()) == "ip:10.0.0.1"
+
+    def test_authenticated_requests_keyed_by_user(self) -> None:
+        token = create_access_token({"sub": "user@example.com"})
+
+        identity = client_identity(_request({"Authorization": f"Bearer {token}"}))
+
+        assert identity == "user:user@example.com"
+
+    def test_invalid_token_falls_back_to_ip(self) -> None:
+        identity = client_identity(_request({"Authorization": "Bearer not-a-jwt"}))
+
+        assert identity == "ip:10.0.0.1"
@@ -0,0 +1,65 @@
+"""
+Unit tests for pre-fork server re-initialization.
+"""
+import logging
+import os
+import sys
+
+import pytest
+
+from app.common.database.session import engine
+from app.common.redis import client as redis_client
+from app.core import logging as app_logging
+from app.core.logging import setup_logging, stop_logging
+from app.core.server import reinitialize_after_fork
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestReinitializeAfterFork:
+    """Tests for resources replaced in a forked worker"""
+
+    def test_replaces_logging_listener(self, restore_root_logger) -> None:
+        setup_logging("WARNING", queue_size=10)
+        inherited = app_logging._listener
+
+        reinitialize_after_fork()
+
+        assert app_logging._listener is not inherited
+        assert app_logging._listener._thread.is_alive()
+        assert logging.getLogger().level == logging.WARNING
+
+    def test_drops_redis_client_and_pools(self) -> None:
+        redis_client._client = inherited = redis_client.get_redis_client()
+        pool = engine.sync_engine.pool
+
+        reinitialize_after_fork()
+
+        assert redis_client._client is None
+        assert redis_client.get_redis_client() is not inherited
+        assert engine.sync_engine.pool is not pool
+        redis_client._client = None
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+    def test_forked_child_can_log(self, restore_root_logger, capfd) -> None:
+        setup_logging("INFO", queue_size=10)
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - child process
+            reinitialize_after_fork()
+            logging.getLogger("app.child").info("child-ready")
+            stop_logging()
+            sys.stdout.flush()
+            os._exit(0)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert "child-ready" in capfd.readouterr().out
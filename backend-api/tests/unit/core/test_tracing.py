@@ -0,0 +1,121 @@
+"""
+Unit tests for tracing sampling and SQL spans.
+"""
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.sdk.trace.sampling import Decision, ParentBased
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.common.database.pool import InstrumentedAsyncQueuePool
+from app.core import tracing
+from app.core.tracing import RateLimitedSampler, _build_sampler, instrument_sqlalchemy
+
+
+def _traced_engine(monkeypatch, **options):
+    """SQLite engine with the instrumented pool, traced into an in-memory exporter."""
+    for key, value in options.items():
+        monkeypatch.setattr(tracing.settings, key, value)
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    engine = create_engine(
+        "sqlite:///:memory:", poolclass=InstrumentedAsyncQueuePool, pool_logging_name="traced"
+    )
+    instrument_sqlalchemy(engine, tracer_provider=provider)
+    return engine, exporter
+
+
+class TestRateLimitedSampler:
+    """Tests for the per-process rate-limited root sampler"""
+
+    def test_drops_traces_above_rate(self) -> None:
+        sampler = RateLimitedSampler(max_per_second=3)
+
+        decisions = [sampler.should_sample(None, trace_id, "GET").decision for trace_id in range(5)]
+
+        assert decisions.count(Decision.RECORD_AND_SAMPLE) == 3
+        assert decisions[-1] == Decision.DROP
+
+    def test_refills_over_time(self, monkeypatch) -> None:
+        clock = [100.0]
+        monkeypatch.setattr(tracing.time, "monotonic", lambda: clock[0])
+        sampler = RateLimitedSampler(max_per_second=2)
+        sampler.should_sample(None, 1, "GET")
+        sampler.should_sample(None, 2, "GET")
+
+        clock[0] += 0.5
+
+        assert sampler.should_sample(None, 3, "GET").decision == Decision.RECORD_AND_SAMPLE
+        assert sampler.should_sample(None, 4, "GET").decision == Decision.DROP
+
+
+class TestBuildSampler:
+    """Tests for OTEL_SAMPLER selection"""
+
+    def test_ratelimited_is_parent_based(self, monkeypatch) -> None:
+        monkeypatch.setattr(tracing.settings, "OTEL_SAMPLER", "parentbased_ratelimited")
+
+        sampler = _build_sampler()
+
+        assert isinstance(sampler, ParentBased)
+        assert "RateLimitedSampler" in sampler.get_description()
+
+    def test_ratio_sampler_uses_configured_ratio(self, monkeypatch) -> None:
+        monkeypatch.setattr(tracing.settings, "OTEL_SAMPLER", "parentbased_traceidratio")
+        monkeypatch.setattr(tracing.settings, "OTEL_SAMPLER_RATIO", 0.25)
+
+        assert "0.25" in _build_sampler().get_description()
+
+    def test_unknown_sampler_raises(self, monkeypatch) -> None:
+        monkeypatch.setattr(tracing.settings, "OTEL_SAMPLER", "sometimes")
+
+        with pytest.raises(ValueError):
+            _build_sampler()
+
+
+class TestSqlAlchemyTracing:
+    """Tests for per-statement SQL spans"""
+
+    def test_statement_text_dropped_by_default(self, monkeypatch) -> None:
+        engine, exporter = _traced_engine(monkeypatch, OTEL_SQLALCHEMY_CAPTURE_STATEMENT=False)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        span = exporter.get_finished_spans()[0]
+        assert span.name == "SELECT :memory:"
+        assert "db.statement" not in span.attributes
+        assert span.attributes["db.statement.fingerprint"]
+        assert span.attributes["db.pool.name"] == "traced"
+
+    def test_statement_text_captured_when_enabled(self, monkeypatch) -> None:
+        engine, exporter = _traced_engine(monkeypatch, OTEL_SQLALCHEMY_CAPTURE_STATEMENT=True)
+
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert exporter.get_finished_spans()[0].attributes["db.statement"] == "SELECT 1"
+
+    def test_rows_and_pool_wait_recorded(self, monkeypatch) -> None:
+        engine, exporter = _traced_engine(monkeypatch)
+
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (id INTEGER)"))
+            conn.execute(text("INSERT INTO t VALUES (1), (2)"))
+
+        create, insert = exporter.get_finished_spans()
+        # Pool wait belongs to the first statement of the checkout only
+        assert "db.pool.wait_ms" in create.attributes
+        assert "db.pool.wait_ms" not in insert.attributes
+        assert insert.attributes["db.rowcount"] == 2
+
+    def test_failed_statement_span_has_error_status(self, monkeypatch) -> None:
+        engine, exporter = _traced_engine(monkeypatch)
+
+        with engine.connect() as conn, pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+
+        assert not exporter.get_finished_spans()[0].status.is_ok
@@ -0,0 +1,94 @@
+"""
+Unit tests for startup warm-up.
+"""
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import event
+
+from app.core import warmup
+from app.core.config import settings
+from app.core.health import DependencyHealthChecker
+from app.core.warmup import WARMUP_CHECK, run_hot_queries, start_warm_up
+
+
+class FakeRedis:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.pings = 0
+
+    async def ping(self) -> bool:
+        await asyncio.sleep(self.delay)
+        self.pings += 1
+        return True
+
+
+async def _ok() -> None:
+    return None
+
+
+def _checker() -> DependencyHealthChecker:
+    return DependencyHealthChecker(
+        checks={"database": _ok},
+        pool_status_fn=lambda: {"checked_out": 0, "capacity": 10, "saturation": 0.0},
+    )
+
+
+class TestWarmUp:
+    """Tests for warm-up steps and readiness gating"""
+
+    def test_hot_queries_run_against_schema(self, db_session) -> None:
+        # Fails when a warmed statement drifts from the models
+        run_hot_queries(db_session)
+
+        assert db_session.in_transaction()
+
+    def test_hot_queries_use_current_handler_shapes(self, db_session, monkeypatch) -> None:
+        monkeypatch.setattr(settings, "APPOINTMENT_LISTING_READ_MODEL_ENABLED", True)
+        statements = []
+        bind = db_session.get_bind()
+
+        def capture(conn, cursor, statement, *args) -> None:
+            statements.append(statement)
+
+        event.listen(bind, "before_cursor_execute", capture)
+        try:
+            run_hot_queries(db_session)
+        finally:
+            event.remove(bind, "before_cursor_execute", capture)
+
+        # List page joins the read model; histories page by keyset with the FK fallback
+        assert any("JOIN appointment_listings" in sql for sql in statements)
+        assert any("appointments.doctor_id IS NULL" in sql for sql in statements)
+        assert any("appointments.patient_id IS NULL" in sql for sql in statements)
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_warm_up_finishes(self, monkeypatch) -> None:
+        redis = FakeRedis(delay=0.05)
+        monkeypatch.setattr(warmup, "get_redis_client", lambda: redis)
+        checker = _checker()
+        await checker.refresh()
+
+        task = start_warm_up(FastAPI(), checker, engines=())
+        ready_during, body = checker.snapshot()
+        await task
+        ready_after, _ = checker.snapshot()
+
+        assert ready_during is False
+        assert body["checks"][WARMUP_CHECK] == "pending"
+        assert ready_after is True
+        assert redis.pings == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_step_does_not_block_readiness(self, monkeypatch) -> None:
+        class DownRedis:
+            async def ping(self) -> None:
+                raise ConnectionError("connection refused")
+
+        monkeypatch.setattr(warmup, "get_redis_client", lambda: DownRedis())
+        checker = _checker()
+
+        await start_warm_up(FastAPI(), checker, engines=())
+
+        assert checker.snapshot()[1]["checks"][WARMUP_CHECK] == "ok"
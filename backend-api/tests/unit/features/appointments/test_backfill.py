@@ -0,0 +1,68 @@
+"""
+Unit tests for the appointment foreign key backfill
+"""
+from app.features.appointments.backfill import backfill_foreign_keys_batch
+from app.features.appointments.models.appointment import Appointment
+from app.features.doctors.lookup import ensure_doctor_ids
+from app.features.doctors.models.doctor import Doctor
+from app.features.patients.models.patient import Patient
+
+
+class TestEnsureDoctorIds:
+    """Tests for doctor get-or-create"""
+
+    def test_creates_missing_and_reuses_existing(self, db_session):
+        """Test existing doctors are reused and missing ones created once"""
+        # Arrange
+        existing = Doctor(name="Dr. House", specialty="Diagnostics")
+        db_session.add(existing)
+        db_session.commit()
+
+        # Act
+        ids = ensure_doctor_ids(db_session, {"Dr. House": "Other", "Dr. Grey": "Surgery"})
+        again = ensure_doctor_ids(db_session, {"Dr. Grey": "Surgery"})
+
+        # Assert
+        assert ids["Dr. House"] == existing.id
+        assert again["Dr. Grey"] == ids["Dr. Grey"]
+        assert db_session.query(Doctor).count() == 2
+
+
+class TestBackfillForeignKeysBatch:
+    """Tests for batched doctor_id / patient_id backfill"""
+
+    def test_links_doctors_and_registered_patients(self, db_session, create_test_appointment):
+        """Test a batch links doctors and patients by email"""
+        # Arrange
+        patient = Patient(first_name="Ana", last_name="Diaz", email="ana@example.com")
+        db_session.add(patient)
+        db_session.commit()
+        registered = create_test_appointment(patient_email="ana@example.com")
+        unregistered = create_test_appointment(patient_email="walk-in@example.com")
+
+        # Act
+        last_id = backfill_foreign_keys_batch(db_session, after_id=0, batch_size=10)
+
+        # Assert
+        db_session.expire_all()
+        doctor = db_session.query(Doctor).filter(Doctor.name == "Dr. Test").one()
+        assert last_id == unregistered.id
+        assert registered.patient_id == patient.id
+        assert unregistered.patient_id is None
+        assert {registered.doctor_id, unregistered.doctor_id} == {doctor.id}
+
+    def test_walks_in_batches_until_done(self, db_session, create_test_appointment):
+        """Test batches resume after the last id and stop when exhausted"""
+        # Arrange
+        for _ in range(5):
+            create_test_appointment()
+
+        # Act
+        checkpoints = []
+        after_id = 0
+        while (after_id := backfill_foreign_keys_batch(db_session, after_id, 2)) is not None:
+            checkpoints.append(after_id)
+
+        # Assert
+        assert len(checkpoints) == 3
+        assert db_session.query(Appointment).filter(Appointment.doctor_id.is_(None)).count() == 0
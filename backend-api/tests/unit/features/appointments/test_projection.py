@@ -0,0 +1,89 @@
+"""
+Unit tests for the appointment listing projection
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.features.appointments.commands.cancel_appointment import CancelAppointmentCommand
+from app.features.appointments.commands.update_appointment import UpdateAppointmentCommand
+from app.features.appointments.models.appointment import Appointment, AppointmentStatus
+from app.features.appointments.models.appointment_listing import AppointmentListing, StatusBucket
+from app.features.appointments.projection import project_appointments_batch
+from app.features.appointments.schemas.appointment import AppointmentUpdate
+
+
+def _listing(db_session, appointment_id: int) -> AppointmentListing:
+    db_session.expire_all()
+    return db_session.get(AppointmentListing, appointment_id)
+
+
+class TestProjectAppointment:
+    """Tests for keeping the read model in sync from the commands"""
+
+    def test_listing_has_precomputed_columns(self, db_session, create_test_appointment):
+        """Test search, bucket and day columns are derived from the appointment"""
+        # Arrange
+        appointment = create_test_appointment(
+            patient_name="Ana DIAZ",
+            doctor_name="Dr. House",
+            appointment_date=datetime(2030, 5, 17, 9, 30),
+        )
+
+        # Act
+        listing = _listing(db_session, appointment.id)
+
+        # Assert
+        assert listing.patient_name_lower == "ana diaz"
+        assert listing.doctor_name_lower == "dr. house"
+        assert listing.status_bucket == StatusBucket.ACTIVE
+        assert listing.appointment_day.isoformat() == "2030-05-17"
+
+    @pytest.mark.asyncio
+    async def test_update_and_cancel_reproject(self, db_session, create_test_appointment):
+        """Test commands update the listing in the same transaction"""
+        # Arrange
+        appointment = create_test_appointment()
+        new_date = datetime.now() + timedelta(days=20)
+
+        # Act
+        update = AppointmentUpdate(patient_name="Renamed Patient", appointment_date=new_date)
+        await UpdateAppointmentCommand(db_session).execute(appointment.id, update)
+        await CancelAppointmentCommand(db_session).execute(appointment.id)
+
+        # Assert
+        listing = _listing(db_session, appointment.id)
+        assert listing.patient_name_lower == "renamed patient"
+        assert listing.status == AppointmentStatus.CANCELLED
+        assert listing.status_bucket == StatusBucket.CLOSED
+        assert listing.appointment_day == new_date.date()
+
+
+class TestProjectAppointmentsBatch:
+    """Tests for rebuilding the read model in batches"""
+
+    def test_rebuild_projects_rows_written_outside_commands(self, db_session):
+        """Test a rebuild creates missing listings and walks in batches"""
+        # Arrange
+        for i in range(3):
+            db_session.add(
+                Appointment(
+                    patient_name=f"Patient {i}",
+                    patient_email=f"p{i}@example.com",
+                    doctor_name="Dr. Test",
+                    specialty="General",
+                    appointment_date=datetime.now() + timedelta(days=i + 1),
+                    status=AppointmentStatus.SCHEDULED,
+                )
+            )
+        db_session.commit()
+
+        # Act
+        checkpoints = []
+        after_id = 0
+        while (after_id := project_appointments_batch(db_session, after_id, 2)) is not None:
+            checkpoints.append(after_id)
+
+        # Assert
+        assert len(checkpoints) == 2
+        assert db_session.query(AppointmentListing).count() == 3
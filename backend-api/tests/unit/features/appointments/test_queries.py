@@ -8,9 +8,16 @@ from fastapi import HTTPException
 from app.features.appointments.queries.get_appointment import GetAppointmentQuery
 from app.features.appointments.queries.list_appointments import (
     ListAppointmentsQuery,
-    GetUpcomingAppointmentsQuery
+    GetUpcomingAppointmentsQuery,
+    GetAppointmentsByPatientQuery,
+    GetPatientAppointmentSummaryQuery,
+    GetAppointmentsByDoctorQuery
 )
 from app.features.appointments.models.appointment import AppointmentStatus
+from app.features.appointments.models.appointment_listing import StatusBucket
+from app.core.config import settings
+from app.features.appointments.backfill import backfill_foreign_keys_batch
+from app.features.patients.models.patient import Patient
 
 
 class TestGetAppointmentQuery:
@@ -143,6 +150,45 @@ class TestListAppointmentsQuery:
         assert result["total"] == 2
 
 
+    @pytest.mark.asyncio
+    async def test_list_appointments_search_is_case_insensitive(
+            self, db_session, create_test_appointment
+    ):
+        """Test name search ignores case on the read model"""
+        # Arrange
+        create_test_appointment(patient_name="John DOE", doctor_name="Dr. House")
+        create_test_appointment(patient_name="Jane Roe", doctor_name="Dr. house")
+        query = ListAppointmentsQuery(db_session)
+
+        # Act
+        by_patient = await query.execute(page=1, page_size=10, patient_name="doe")
+        by_doctor = await query.execute(page=1, page_size=10, doctor_name="HOUSE")
+
+        # Assert
+        assert by_patient["total"] == 1
+        assert by_doctor["total"] == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("read_model", [True, False])
+    async def test_list_appointments_filter_by_status_bucket(
+            self, db_session, create_test_appointment, monkeypatch, read_model
+    ):
+        """Test status buckets group statuses, with and without the read model"""
+        # Arrange
+        monkeypatch.setattr(settings, "APPOINTMENT_LISTING_READ_MODEL_ENABLED", read_model)
+        create_test_appointment(status=AppointmentStatus.SCHEDULED)
+        create_test_appointment(status=AppointmentStatus.CONFIRMED)
+        create_test_appointment(status=AppointmentStatus.CANCELLED)
+        query = ListAppointmentsQuery(db_session)
+
+        # Act
+        active = await query.execute(page=1, page_size=10, status_bucket=StatusBucket.ACTIVE)
+        closed = await query.execute(page=1, page_size=10, status_bucket=StatusBucket.CLOSED)
+
+        # Assert
+        assert active["total"] == 2
+        assert [apt.status for apt in closed["items"]] == [AppointmentStatus.CANCELLED]
+
 class TestGetUpcomingAppointmentsQuery:
     """Tests for GetUpcomingAppointmentsQuery"""
 
@@ -173,4 +219,175 @@ class TestGetUpcomingAppointmentsQuery:
         result = await query.execute(days_ahead=7)
 
         # Assert
-        assert len(result) == 2  # Only 2 within next 7 days
\ No newline at end of file
+        assert len(result) == 2  # Only 2 within next 7 days
+
+
+class TestGetAppointmentsByPatientQuery:
+    """Tests for GetAppointmentsByPatientQuery"""
+
+    @pytest.mark.asyncio
+    async def test_pages_newest_first(self, db_session, create_test_appointment):
+        """Test patient history is paginated newest first"""
+        # Arrange
+        now = datetime.now()
+        for days in (3, 1, 2):
+            create_test_appointment(
+                patient_email="ana@example.com",
+                appointment_date=now + timedelta(days=days)
+            )
+        create_test_appointment(patient_email="other@example.com")
+        query = GetAppointmentsByPatientQuery(db_session)
+
+        # Act
+        first = await query.execute("ana@example.com", limit=2)
+        second = await query.execute("ana@example.com", limit=2, cursor=first.next_cursor)
+
+        # Assert
+        dates = [apt.appointment_date for apt in first.items + second.items]
+        assert dates == sorted(dates, reverse=True)
+        assert len(dates) == 3
+        assert second.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_limit_is_capped(self, db_session, create_test_appointment, monkeypatch):
+        """Test page size never exceeds HISTORY_PAGE_SIZE_MAX"""
+        # Arrange
+        monkeypatch.setattr(settings, "HISTORY_PAGE_SIZE_MAX", 2)
+        for _ in range(3):
+            create_test_appointment()
+        query = GetAppointmentsByPatientQuery(db_session)
+
+        # Act
+        page = await query.execute("test@example.com", limit=1000)
+
+        # Assert
+        assert len(page.items) == 2
+        assert page.next_cursor is not None
+
+    @pytest.mark.asyncio
+    async def test_registered_patient_includes_rows_not_backfilled(
+        self, db_session, create_test_appointment
+    ):
+        """Test a registered patient's history keeps rows without patient_id"""
+        # Arrange
+        db_session.add(Patient(first_name="Test", last_name="Patient", email="test@example.com"))
+        db_session.commit()
+        create_test_appointment()
+        backfill_foreign_keys_batch(db_session, after_id=0, batch_size=100)
+        pending = create_test_appointment()
+        create_test_appointment(patient_email="other@example.com")
+        query = GetAppointmentsByPatientQuery(db_session)
+
+        # Act
+        page = await query.execute("test@example.com")
+
+        # Assert
+        assert pending.patient_id is None
+        assert len(page.items) == 2
+
+
+class TestGetPatientAppointmentSummaryQuery:
+    """Tests for GetPatientAppointmentSummaryQuery"""
+
+    @pytest.mark.asyncio
+    async def test_returns_summary_columns_newest_first(
+        self, db_session, create_test_appointment
+    ):
+        """Test summary rows carry only covered columns, newest first"""
+        # Arrange
+        now = datetime.now()
+        for days in (1, 3, 2):
+            create_test_appointment(appointment_date=now + timedelta(days=days))
+        create_test_appointment(patient_email="other@example.com")
+        query = GetPatientAppointmentSummaryQuery(db_session)
+
+        # Act
+        first = await query.execute("test@example.com", limit=2)
+        second = await query.execute("test@example.com", limit=2, cursor=first.next_cursor)
+
+        # Assert
+        rows = first.items + second.items
+        assert len(rows) == 3
+        assert [row.appointment_date for row in rows] == sorted(
+            (row.appointment_date for row in rows), reverse=True
+        )
+        assert set(rows[0]._fields) == {
+            "id", "appointment_date", "status", "doctor_name", "specialty"
+        }
+
+    @pytest.mark.asyncio
+    async def test_matches_patient_history_rows(self, db_session, create_test_appointment):
+        """Test summary and history agree for a patient whose email changed"""
+        # Arrange
+        patient = Patient(first_name="Ana", last_name="Lopez", email="new@example.com")
+        db_session.add(patient)
+        db_session.commit()
+        create_test_appointment(patient_email="old@example.com", patient_id=patient.id)
+        create_test_appointment(patient_email="new@example.com")
+        create_test_appointment(patient_email="old@example.com")
+
+        # Act
+        summary = await GetPatientAppointmentSummaryQuery(db_session).execute("new@example.com")
+        history = await GetAppointmentsByPatientQuery(db_session).execute("new@example.com")
+
+        # Assert
+        assert len(summary.items) == 2
+        assert [row.id for row in summary.items] == [apt.id for apt in history.items]
+
+
+class TestGetAppointmentsByDoctorQuery:
+    """Tests for GetAppointmentsByDoctorQuery"""
+
+    @pytest.mark.asyncio
+    async def test_date_filter_and_stream(self, db_session, create_test_appointment):
+        """Test doctor schedule filtering and batched streaming"""
+        # Arrange
+        now = datetime.now()
+        for days in (1, 2, 3, 20):
+            create_test_appointment(appointment_date=now + timedelta(days=days))
+        backfill_foreign_keys_batch(db_session, after_id=0, batch_size=100)
+        query = GetAppointmentsByDoctorQuery(db_session)
+        end_date = now + timedelta(days=10)
+
+        # Act
+        page = await query.execute("Dr. Test", end_date=end_date)
+        streamed = [
+            apt.id
+            for batch in query.stream("Dr. Test", end_date=end_date)
+            for apt in batch.items
+        ]
+
+        # Assert
+        assert len(page.items) == 3
+        assert streamed == [apt.id for apt in page.items]
+
+    @pytest.mark.asyncio
+    async def test_unknown_doctor_has_no_appointments(self, db_session, create_test_appointment):
+        """Test an unknown doctor does not match other doctors' rows"""
+        # Arrange
+        create_test_appointment()
+        query = GetAppointmentsByDoctorQuery(db_session)
+
+        # Act
+        page = await query.execute("Dr. Nobody")
+
+        # Assert
+        assert page.items == []
+
+    @pytest.mark.asyncio
+    async def test_includes_rows_not_backfilled(self, db_session, create_test_appointment):
+        """Test rows without doctor_id still match by name, before and after a backfill"""
+        # Arrange
+        create_test_appointment()
+        query = GetAppointmentsByDoctorQuery(db_session)
+        before = await query.execute("Dr. Test")
+        backfill_foreign_keys_batch(db_session, after_id=0, batch_size=100)
+        pending = create_test_appointment()
+
+        # Act
+        after = await query.execute("Dr. Test")
+
+        # Assert
+        assert pending.doctor_id is None
+        assert len(before.items) == 1
+        assert len(after.items) == 2
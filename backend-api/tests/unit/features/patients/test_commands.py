@@ -32,6 +32,19 @@ class TestCreatePatientCommand:
         assert patient.email == "jane@example.com"
         assert patient.is_active is True
 
+    @pytest.mark.asyncio
+    async def test_create_links_existing_appointments(
+        self, db_session, create_test_appointment
+    ) -> None:
+        appointment = create_test_appointment(patient_email="jane@example.com")
+        command = CreatePatientCommand(db_session)
+        data = PatientCreate(first_name="Jane", last_name="Doe", email="jane@example.com")
+
+        patient = await command.execute(data)
+
+        db_session.refresh(appointment)
+        assert appointment.patient_id == patient.id
+
     @pytest.mark.asyncio
     async def test_create_duplicate_email_raises(self, db_session) -> None:
         existing = Patient(
@@ -0,0 +1,59 @@
+import http from 'k6/http';
+import { check } from 'k6';
+import { Rate, Trend } from 'k6/metrics';
+import { BASE_URL, API_PREFIX } from '../config/env.js';
+
+// Custom metrics
+const poolErrors = new Rate('pool_errors');
+const listDuration = new Trend('pool_list_duration', true);
+const readyDuration = new Trend('pool_ready_duration', true);
+
+const APPOINTMENTS_URL = `${BASE_URL}${API_PREFIX}/appointments`;
+
+// Arrival-rate executor: requests keep arriving even when the API slows down,
+// which is what exposes pool queueing (closed-loop VUs would back off instead).
+const TARGET_RPS = parseInt(__ENV.TARGET_RPS || '200', 10);
+
+export const options = {
+  scenarios: {
+    db_read_ramp: {
+      executor: 'ramping-arrival-rate',
+      startRate: 10,
+      timeUnit: '1s',
+      preAllocatedVUs: 50,
+      maxVUs: 400,
+      stages: [
+        { duration: '1m', target: Math.floor(TARGET_RPS / 4) },
+        { duration: '2m', target: Math.floor(TARGET_RPS / 2) },
+        { duration: '2m', target: TARGET_RPS },
+        { duration: '2m', target: TARGET_RPS },  // hold at target
+        { duration: '30s', target: 0 },
+      ],
+    },
+  },
+  thresholds: {
+    http_req_failed: ['rate<0.01'],
+    pool_errors: ['rate<0.01'],
+    pool_list_duration: ['p(95)<500'],
+    pool_ready_duration: ['p(95)<50'],
+  },
+};
+
+export default function () {
+  const listRes = http.get(`${APPOINTMENTS_URL}/?page=1&page_size=20`, {
+    tags: { endpoint: 'list_appointments' },
+  });
+
+  const ok = check(listRes, {
+    'list: status is 200': (r) => r.status === 200,
+  });
+
+  poolErrors.add(!ok);
+  listDuration.add(listRes.timings.duration);
+
+  // /ready is served from cache and must stay fast while the pool is busy
+  if (__ITER % 10 === 0) {
+    const readyRes = http.get(`${BASE_URL}/ready`, { tags: { endpoint: 'ready' } });
+    readyDuration.add(readyRes.timings.duration);
+  }
+}